@@ -0,0 +1,548 @@
+# eval/bbox_eval.py
+"""
+NumPy COCO bbox evaluation.
+
+Drop-in alternative to pycocotools' COCOeval for iouType="bbox" that produces
+the same precision/recall arrays and the same 12 summary numbers, but:
+
+- boxes of all images and categories are held in flat NumPy arrays (no
+  per-annotation dicts), and the IoUs of every (detection, ground truth)
+  pair of the same image and category are computed in one vectorized pass;
+- the greedy matching only depends on the matching order for detections that
+  compete for the same ground truth. All other detections are matched at
+  once, for every IoU threshold; the contested ones replay the COCOeval loop
+  over their few candidate ground truths only;
+- images are split into contiguous chunks that are matched in parallel in a
+  process pool;
+- match results are kept as compact arrays (Matches: scores, ranks and
+  matched/ignored bit matrices), from which accumulate() builds the PR
+  curves with vectorized cumulative sums;
+- BBoxEvaluator.index() keeps the ground truth, the candidate IoU pairs and
+  the matches in a MatchIndex that can be saved to .npz, so score threshold,
+  category and maxDets sweeps are re-evaluated without matching again.
+
+Parameters are the COCO defaults (10 IoU thresholds, 101 recall thresholds,
+maxDets 1/10/100, area ranges all/small/medium/large).
+"""
+
+import json
+import multiprocessing as mp
+import os
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+# Same construction as pycocotools Params.setDetParams (np.arange drifts).
+IOU_THRS = np.linspace(.5, 0.95, int(np.round((0.95 - .5) / .05)) + 1, endpoint=True)
+REC_THRS = np.linspace(.0, 1.00, int(np.round((1.00 - .0) / .01)) + 1, endpoint=True)
+MAX_DETS = (1, 10, 100)
+AREA_RNGS = ((0 ** 2, 1e5 ** 2), (0 ** 2, 32 ** 2), (32 ** 2, 96 ** 2), (96 ** 2, 1e5 ** 2))
+AREA_LABELS = ("all", "small", "medium", "large")
+
+
+def _iou(dt: np.ndarray, gt: np.ndarray, crowd: np.ndarray) -> np.ndarray:
+    """Element-wise (broadcasting) IoU of xywh boxes, same arithmetic as pycocotools bbIou."""
+    w = np.minimum(dt[..., 0] + dt[..., 2], gt[..., 0] + gt[..., 2]) - np.maximum(dt[..., 0], gt[..., 0])
+    h = np.minimum(dt[..., 1] + dt[..., 3], gt[..., 1] + gt[..., 3]) - np.maximum(dt[..., 1], gt[..., 1])
+    inter = np.where((w > 0) & (h > 0), w * h, 0.0)
+    da, ga = dt[..., 2] * dt[..., 3], gt[..., 2] * gt[..., 3]
+    union = np.where(crowd, da, da + ga - inter)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.where(inter > 0, inter / union, 0.0)
+
+
+def box_iou(dt: np.ndarray, gt: np.ndarray, iscrowd: np.ndarray) -> np.ndarray:
+    """
+    IoU matrix between xywh boxes, as pycocotools.mask.iou.
+
+    For crowd ground truth the union is the detection's area only.
+
+    Returns:
+        (D, G) float64 matrix.
+    """
+    dt, gt = np.asarray(dt, np.float64).reshape(-1, 4), np.asarray(gt, np.float64).reshape(-1, 4)
+    return _iou(dt[:, None, :], gt[None, :, :], np.asarray(iscrowd, bool)[None, :])
+
+
+@dataclass
+class _GroundTruth:
+    """Flat ground-truth arrays, sorted by (image, category), original order kept."""
+    img: np.ndarray      # image index into img_ids
+    cat: np.ndarray      # category index into cat_ids
+    bbox: np.ndarray     # (N, 4) xywh float64
+    area: np.ndarray
+    crowd: np.ndarray    # bool (crowd ground truth is also "ignore")
+    ids: np.ndarray
+
+
+@dataclass
+class _Detections:
+    img: np.ndarray
+    cat: np.ndarray
+    bbox: np.ndarray
+    score: np.ndarray
+
+
+@dataclass
+class Matches:
+    """
+    Match results of one prediction set, one entry per evaluated detection.
+
+    Detections are ordered by image, category and descending score (the order
+    COCOeval concatenates them in); only the top MAX_DETS[-1] per (image,
+    category) are kept.
+    """
+    img: np.ndarray          # (N,) image index
+    cat: np.ndarray          # (N,) category index
+    score: np.ndarray        # (N,) float64
+    rank: np.ndarray         # (N,) position within its (image, category) by score
+    area: np.ndarray         # (N,) box area
+    matched: np.ndarray      # (A, T, N) bool
+    ignored: np.ndarray      # (A, T, N) bool
+    n_positive: np.ndarray   # (K, A) non-ignored ground truths
+
+    @classmethod
+    def concatenate(cls, parts: Sequence["Matches"]) -> "Matches":
+        """Join matches of consecutive image chunks."""
+        return cls(*(np.concatenate([getattr(p, f) for p in parts], axis=-1)
+                     for f in ("img", "cat", "score", "rank", "area", "matched", "ignored")),
+                   n_positive=sum(p.n_positive for p in parts))
+
+    def select(self, score_thr: Optional[float] = None,
+               cats: Optional[Sequence[int]] = None) -> "Matches":
+        """
+        Keep detections scoring at least `score_thr` and the categories `cats`.
+
+        Both filters are exact: detections are matched in descending score order,
+        so dropping the lowest scoring ones does not change the matches of the
+        others, and categories are matched independently. Ground truth of dropped
+        categories no longer counts as positive.
+
+        Args:
+            score_thr: Minimum detection score (None: keep all).
+            cats: Category indices to keep (None: all).
+        """
+        keep = np.ones(len(self.score), bool)
+        n_positive = self.n_positive
+        if score_thr is not None:
+            keep &= self.score >= score_thr
+        if cats is not None:
+            wanted = np.zeros(len(n_positive), bool)
+            wanted[list(cats)] = True
+            keep &= wanted[self.cat]
+            n_positive = np.where(wanted[:, None], n_positive, 0)
+        return Matches(self.img[keep], self.cat[keep], self.score[keep], self.rank[keep],
+                       self.area[keep], self.matched[..., keep], self.ignored[..., keep],
+                       n_positive)
+
+
+@dataclass
+class _Ranked:
+    """Detections in matching order: by image, category and descending score."""
+    img: np.ndarray
+    cat: np.ndarray
+    score: np.ndarray
+    rank: np.ndarray
+    area: np.ndarray
+
+
+@dataclass
+class _Pairs:
+    """(detection, ground truth) pairs of one image and category with IoU >= IOU_THRS[0]."""
+    d: np.ndarray        # index into the ranked detections
+    g: np.ndarray        # index into the ground truth
+    iou: np.ndarray
+
+
+def _pair_chunk(gt: _GroundTruth, dt: _Detections, n_cats: int,
+                max_det: int) -> Tuple[_Ranked, _Pairs]:
+    """Rank the detections and compute the IoUs of every pair that can match."""
+    # Detections by (image, category, -score); lexsort is stable, so ties keep input order.
+    order = np.lexsort((-dt.score, dt.cat, dt.img))
+    d_key = dt.img[order] * n_cats + dt.cat[order]
+    rank = np.arange(len(order)) - np.searchsorted(d_key, d_key, side="left")
+    keep = rank < max_det
+    order, d_key, rank = order[keep], d_key[keep], rank[keep].astype(np.int32)
+    d_box = dt.bbox[order]
+
+    # Every (detection, ground truth) pair of the same image and category.
+    g_key = gt.img * n_cats + gt.cat
+    g_start = np.searchsorted(g_key, d_key, side="left")
+    counts = np.searchsorted(g_key, d_key, side="right") - g_start
+    offsets = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+    pair_d = np.repeat(np.arange(len(order)), counts)
+    pair_g = np.repeat(g_start, counts) + offsets
+    pair_iou = _iou(d_box[pair_d], gt.bbox[pair_g], gt.crowd[pair_g])
+
+    # Pairs below the lowest threshold can never match.
+    cand = pair_iou >= np.minimum(IOU_THRS[0], 1 - 1e-10)
+    ranked = _Ranked(img=dt.img[order], cat=dt.cat[order], score=dt.score[order], rank=rank,
+                     area=d_box[:, 2] * d_box[:, 3])
+    return ranked, _Pairs(pair_d[cand], pair_g[cand], pair_iou[cand])
+
+
+def _match_pairs(gt: _GroundTruth, ranked: _Ranked, pairs: _Pairs, n_cats: int,
+                 area_rngs: Sequence[Tuple[float, float]] = AREA_RNGS) -> Matches:
+    """
+    COCOeval.evaluate from precomputed candidate pairs, all (image, category) pairs at once.
+
+    Within a pair, detections are matched in descending score order; each takes
+    the best still-free ground truth with IoU >= threshold (ties: the later one),
+    preferring non-ignored ground truth. Crowd ground truth can be matched any
+    number of times. As in pycocotools, a match with a ground truth whose id is 0
+    does not count as matched.
+    """
+    T, A = len(IOU_THRS), len(area_rngs)
+    thrs = np.minimum(IOU_THRS, 1 - 1e-10)
+    n_dt, d_area = len(ranked.score), ranked.area
+    pair_d, pair_g, pair_iou = pairs.d, pairs.g, pairs.iou
+
+    # Only detections competing for the same (non-crowd) ground truth depend on the
+    # matching order; all others are matched independently.
+    shared = (np.bincount(pair_g, minlength=len(gt.ids)) > 1) & ~gt.crowd
+    contested = np.zeros(n_dt, bool)
+    contested[pair_d[shared[pair_g]]] = True
+    free = ~contested[pair_d]
+    fd, fg, fiou = pair_d[free], pair_g[free], pair_iou[free]
+    cd, cg, ciou = pair_d[~free], pair_g[~free], pair_iou[~free]
+
+    matched = np.zeros((A, T, n_dt), bool)
+    ignored = np.zeros((A, T, n_dt), bool)
+    n_positive = np.zeros((n_cats, A), np.int64)
+    nonzero, crowd = gt.ids != 0, gt.crowd.tolist()
+    for a, (lo, hi) in enumerate(area_rngs):
+        g_ignore = gt.crowd | (gt.area < lo) | (gt.area > hi)
+        n_positive[:, a] = np.bincount(gt.cat[~g_ignore], minlength=n_cats)
+
+        for t, thr in enumerate(thrs):
+            ok = fiou >= thr
+            if not ok.any():
+                continue
+            d, g, iou = fd[ok], fg[ok], fiou[ok]
+            # Preference: non-ignored, then higher IoU, then later ground truth.
+            srt = np.lexsort((g, iou, ~g_ignore[g], d))
+            d, g = d[srt], g[srt]
+            last = np.append(d[1:] != d[:-1], True)
+            d, g = d[last], g[last]
+            matched[a, t, d] = nonzero[g]
+            ignored[a, t, d] = g_ignore[g]
+
+        # Contested detections: the COCOeval loop over their candidate ground
+        # truths, visited in COCOeval order (non-ignored first).
+        srt = np.lexsort((cg, g_ignore[cg], cd))
+        cands: Dict[int, List] = {}
+        for d, g, iou, ig in zip(cd[srt].tolist(), cg[srt].tolist(), ciou[srt].tolist(),
+                                 g_ignore[cg[srt]].tolist()):
+            cands.setdefault(d, []).append((g, iou, ig))
+        taken = [set() for _ in thrs]
+        hits = []
+        for d in sorted(cands):
+            for t, thr in enumerate(thrs.tolist()):
+                best, m, m_ig = thr, -1, False
+                for g, iou, ig in cands[d]:
+                    if g in taken[t] and not crowd[g]:
+                        continue
+                    if m > -1 and not m_ig and ig:
+                        break
+                    if iou < best:
+                        continue
+                    best, m, m_ig = iou, g, ig
+                if m > -1:
+                    taken[t].add(m)
+                    hits.append((t, d, m))
+        if hits:
+            t, d, m = np.array(hits).T
+            matched[a, t, d] = nonzero[m]
+            ignored[a, t, d] = g_ignore[m]
+
+        # Unmatched detections outside the area range are ignored too.
+        ignored[a] |= ~matched[a] & ((d_area < lo) | (d_area > hi))[None, :]
+
+    return Matches(**vars(ranked), matched=matched, ignored=ignored, n_positive=n_positive)
+
+
+def _match_chunk(gt: _GroundTruth, dt: _Detections, n_cats: int,
+                 max_det: int) -> Tuple[Matches, _Pairs]:
+    """Match one chunk of images; also returns the candidate pairs for MatchIndex."""
+    ranked, pairs = _pair_chunk(gt, dt, n_cats, max_det)
+    return _match_pairs(gt, ranked, pairs, n_cats), pairs
+
+
+def _match_chunk_args(args) -> Tuple[Matches, _Pairs]:
+    return _match_chunk(*args)
+
+
+def _take(arrays, index):
+    return type(arrays)(**{k: v[index] for k, v in vars(arrays).items()})
+
+
+@dataclass
+class BBoxEvalResult:
+    """COCOeval-compatible output: eval arrays and the 12 summary stats."""
+    precision: np.ndarray   # (T, R, K, A, M), -1 where undefined
+    recall: np.ndarray      # (T, K, A, M)
+    scores: np.ndarray      # (T, R, K, A, M)
+    stats: Optional[np.ndarray]   # (12,), None for custom area ranges
+
+    @property
+    def eval(self) -> Dict[str, Any]:
+        """Same layout as COCOeval.eval."""
+        return {"counts": list(self.precision.shape), "precision": self.precision,
+                "recall": self.recall, "scores": self.scores}
+
+
+class BBoxEvaluator:
+    """COCO bbox evaluation against one annotation set."""
+
+    def __init__(self, annotations: Union[str, Dict[str, Any]], workers: Optional[int] = None,
+                 min_chunk_images: int = 1000):
+        """
+        Args:
+            annotations: Path to a COCO annotation JSON, or the loaded dict.
+            workers: Processes used for matching (default: CPU count). Datasets with
+                fewer than 2 * min_chunk_images images are matched in-process.
+            min_chunk_images: Smallest number of images sent to one worker.
+        """
+        if not isinstance(annotations, dict):
+            with open(annotations, "r") as f:
+                annotations = json.load(f)
+        self.img_ids = sorted({img["id"] for img in annotations.get("images", [])})
+        names = {cat["id"]: cat.get("name", str(cat["id"])) for cat in annotations.get("categories", [])}
+        self.cat_ids = sorted(names)
+        self.cat_names = [names[c] for c in self.cat_ids]
+        self._img_index = {i: n for n, i in enumerate(self.img_ids)}
+        self._cat_index = {c: n for n, c in enumerate(self.cat_ids)}
+        self.workers = max(1, workers or os.cpu_count() or 1)
+        self.min_chunk_images = max(1, min_chunk_images)
+
+        anns = [a for a in annotations.get("annotations", [])
+                if a["image_id"] in self._img_index and a["category_id"] in self._cat_index]
+        bbox = np.array([a["bbox"] for a in anns], np.float64).reshape(-1, 4)
+        gt = _GroundTruth(
+            img=np.array([self._img_index[a["image_id"]] for a in anns], np.int64),
+            cat=np.array([self._cat_index[a["category_id"]] for a in anns], np.int64),
+            bbox=bbox,
+            area=np.array([a.get("area", b[2] * b[3]) for a, b in zip(anns, bbox)], np.float64),
+            crowd=np.array([bool(a.get("iscrowd", 0)) for a in anns], bool),
+            ids=np.array([a["id"] for a in anns], np.int64))
+        self.gt = _take(gt, np.lexsort((gt.cat, gt.img)))
+
+    def _detections(self, predictions: Sequence[Dict[str, Any]]) -> _Detections:
+        unknown = {p["image_id"] for p in predictions} - set(self._img_index)
+        if unknown:
+            raise ValueError(f"Results do not correspond to the annotation set "
+                             f"({len(unknown)} unknown image ids)")
+        # Detections of categories missing from the annotations are not evaluated.
+        preds = [p for p in predictions if p["category_id"] in self._cat_index]
+        return _Detections(
+            img=np.array([self._img_index[p["image_id"]] for p in preds], np.int64),
+            cat=np.array([self._cat_index[p["category_id"]] for p in preds], np.int64),
+            bbox=np.array([p["bbox"] for p in preds], np.float64).reshape(-1, 4),
+            score=np.array([p["score"] for p in preds], np.float64))
+
+    def _match(self, predictions: Sequence[Dict[str, Any]]) -> Tuple[Matches, _Pairs]:
+        dt = self._detections(predictions)
+        n_cats, max_det = len(self.cat_ids), MAX_DETS[-1]
+        n_chunks = min(self.workers, len(self.img_ids) // self.min_chunk_images)
+        if n_chunks < 2:
+            return _match_chunk(self.gt, dt, n_cats, max_det)
+
+        # Contiguous image ranges keep the concatenated result in image order.
+        dt = _take(dt, np.argsort(dt.img, kind="stable"))
+        edges = np.linspace(0, len(self.img_ids), n_chunks + 1).astype(np.int64)
+        jobs, g_offsets = [], []
+        for lo, hi in zip(edges[:-1], edges[1:]):
+            gs = slice(*np.searchsorted(self.gt.img, [lo, hi]))
+            ds = slice(*np.searchsorted(dt.img, [lo, hi]))
+            jobs.append((_take(self.gt, gs), _take(dt, ds), n_cats, max_det))
+            g_offsets.append(gs.start)
+        # "spawn" like run_batch; the workers only need NumPy.
+        with ProcessPoolExecutor(max_workers=n_chunks, mp_context=mp.get_context("spawn")) as pool:
+            parts = list(pool.map(_match_chunk_args, jobs))
+        # Chunk-local pair indices -> indices into the joined detections / ground truth.
+        d_offsets = np.cumsum([0] + [len(m.score) for m, _ in parts[:-1]])
+        pairs = _Pairs(*(np.concatenate(x) for x in zip(
+            *[(p.d + do, p.g + go, p.iou) for (_, p), do, go in zip(parts, d_offsets, g_offsets)])))
+        return Matches.concatenate([m for m, _ in parts]), pairs
+
+    def match(self, predictions: Sequence[Dict[str, Any]]) -> Matches:
+        """Match predictions (COCO result dicts) to the ground truth."""
+        return self._match(predictions)[0]
+
+    def index(self, predictions: Sequence[Dict[str, Any]]) -> "MatchIndex":
+        """Match predictions and keep everything needed to re-evaluate them (see MatchIndex)."""
+        matches, pairs = self._match(predictions)
+        return MatchIndex(np.asarray(self.img_ids, np.int64), np.asarray(self.cat_ids, np.int64),
+                          np.asarray(self.cat_names, str), self.gt, pairs, matches)
+
+    def evaluate(self, predictions: Sequence[Dict[str, Any]], verbose: bool = True) -> BBoxEvalResult:
+        """Match, accumulate and summarize (prints the COCO summary when verbose)."""
+        return accumulate(self.match(predictions), verbose=verbose)
+
+
+@dataclass
+class MatchIndex:
+    """
+    Persistable evaluation state of one prediction set.
+
+    Holds the ground-truth index, the ranked detections with their candidate
+    IoU pairs, and the matches for the COCO area ranges. Re-evaluating with a
+    score threshold, a category subset or smaller maxDets only filters the
+    matches (milliseconds); other area ranges re-run the matching from the
+    cached IoUs. Neither needs the annotation file again.
+    """
+    img_ids: np.ndarray
+    cat_ids: np.ndarray
+    cat_names: np.ndarray
+    gt: _GroundTruth
+    pairs: _Pairs
+    matches: Matches
+
+    def save(self, path) -> None:
+        """Write the index to a compressed .npz file."""
+        arrays = {"img_ids": self.img_ids, "cat_ids": self.cat_ids, "cat_names": self.cat_names}
+        for prefix, part in (("gt", self.gt), ("pairs", self.pairs), ("matches", self.matches)):
+            arrays.update({f"{prefix}.{k}": v for k, v in vars(part).items()})
+        np.savez_compressed(path, **arrays)
+
+    @classmethod
+    def load(cls, path) -> "MatchIndex":
+        """Read an index written by save()."""
+        with np.load(path) as z:
+            def part(kind, prefix):
+                return kind(**{k.split(".", 1)[1]: z[k] for k in z.files if k.startswith(prefix + ".")})
+            return cls(z["img_ids"], z["cat_ids"], z["cat_names"], part(_GroundTruth, "gt"),
+                       part(_Pairs, "pairs"), part(Matches, "matches"))
+
+    def category_indices(self, categories: Sequence[Union[int, str]]) -> List[int]:
+        """Category ids or names -> category indices."""
+        by_id = {int(c): n for n, c in enumerate(self.cat_ids)}
+        by_name = {str(c): n for n, c in enumerate(self.cat_names)}
+        indices = []
+        for c in categories:
+            index = by_name.get(c) if isinstance(c, str) else by_id.get(int(c))
+            if index is None:
+                raise ValueError(f"Unknown category {c!r}")
+            indices.append(index)
+        return indices
+
+    def select(self, score_thr: Optional[float] = None,
+               categories: Optional[Sequence[Union[int, str]]] = None,
+               area_rngs: Optional[Sequence[Tuple[float, float]]] = None) -> Matches:
+        """
+        Matches after filtering by score and category, optionally for other area ranges.
+
+        Args:
+            score_thr: Minimum detection score.
+            categories: Category ids or names to keep.
+            area_rngs: (min, max) box area ranges (default: the COCO ranges, cached).
+        """
+        matches = self.matches
+        if area_rngs is not None:
+            m = self.matches
+            ranked = _Ranked(img=m.img, cat=m.cat, score=m.score, rank=m.rank, area=m.area)
+            matches = _match_pairs(self.gt, ranked, self.pairs, len(self.cat_ids), area_rngs)
+        cats = None if categories is None else self.category_indices(categories)
+        return matches.select(score_thr, cats)
+
+    def evaluate(self, score_thr: Optional[float] = None,
+                 categories: Optional[Sequence[Union[int, str]]] = None,
+                 max_dets: Sequence[int] = MAX_DETS, verbose: bool = True,
+                 area_rngs: Optional[Sequence[Tuple[float, float]]] = None) -> BBoxEvalResult:
+        """COCO metrics of the filtered matches (see select and accumulate)."""
+        return accumulate(self.select(score_thr, categories, area_rngs), max_dets=max_dets,
+                          verbose=verbose)
+
+
+def accumulate(matches: Matches, max_dets: Sequence[int] = MAX_DETS,
+               verbose: bool = True) -> BBoxEvalResult:
+    """
+    Build precision/recall arrays from match results (COCOeval.accumulate).
+
+    Args:
+        matches: Output of BBoxEvaluator.match.
+        max_dets: Detection limits per image and category (M), at most MAX_DETS[-1].
+        verbose: Print the COCO summary.
+
+    The area axis (A) follows the matches, so matches for custom area ranges
+    (MatchIndex.select(area_rngs=...)) accumulate too; the 12 summary stats
+    assume the COCO ranges and are None otherwise.
+    """
+    n_cats = matches.n_positive.shape[0]
+    A, T = matches.matched.shape[:2]
+    R, M = len(REC_THRS), len(max_dets)
+    precision = -np.ones((T, R, n_cats, A, M))
+    recall = -np.ones((T, n_cats, A, M))
+    scores = -np.ones((T, R, n_cats, A, M))
+
+    by_cat = np.argsort(matches.cat, kind="stable")   # keeps image order within a category
+    bounds = np.searchsorted(matches.cat[by_cat], np.arange(n_cats + 1))
+    for k in range(n_cats):
+        idx_k = by_cat[bounds[k]:bounds[k + 1]]
+        for m, max_det in enumerate(max_dets):
+            keep = idx_k[matches.rank[idx_k] < max_det]
+            order = keep[np.argsort(-matches.score[keep], kind="mergesort")]
+            sorted_scores = matches.score[order]
+            nd = len(order)
+            for a in range(A):
+                n_positive = matches.n_positive[k, a]
+                if n_positive == 0:
+                    continue
+                tm, ti = matches.matched[a][:, order], matches.ignored[a][:, order]
+                tp_sum = np.cumsum(tm & ~ti, axis=1).astype(float)
+                fp_sum = np.cumsum(~tm & ~ti, axis=1).astype(float)
+                rc = tp_sum / n_positive
+                pr = tp_sum / (fp_sum + tp_sum + np.spacing(1))
+                recall[:, k, a, m] = rc[:, -1] if nd else 0
+                # Precision envelope: running maximum from the right.
+                pr = np.maximum.accumulate(pr[:, ::-1], axis=1)[:, ::-1]
+                for t in range(T):
+                    inds = np.searchsorted(rc[t], REC_THRS, side="left")
+                    valid = inds < nd
+                    q, ss = np.zeros(R), np.zeros(R)
+                    q[valid], ss[valid] = pr[t, inds[valid]], sorted_scores[inds[valid]]
+                    precision[t, :, k, a, m] = q
+                    scores[t, :, k, a, m] = ss
+    stats = summarize(precision, recall, max_dets, verbose=verbose) \
+        if A == len(AREA_RNGS) else None
+    return BBoxEvalResult(precision, recall, scores, stats)
+
+
+def summarize(precision: np.ndarray, recall: np.ndarray, max_dets: Sequence[int] = MAX_DETS,
+              verbose: bool = True) -> np.ndarray:
+    """The 12 COCO summary numbers (COCOeval.summarize, same print format)."""
+    max_dets = list(max_dets)
+
+    def _summarize(ap=1, iou_thr=None, area="all", max_det=100):
+        i_str = " {:<18} {} @[ IoU={:<9} | area={:>6s} | maxDets={:>3d} ] = {:0.3f}"
+        title = "Average Precision" if ap == 1 else "Average Recall"
+        kind = "(AP)" if ap == 1 else "(AR)"
+        iou_str = "{:0.2f}:{:0.2f}".format(IOU_THRS[0], IOU_THRS[-1]) \
+            if iou_thr is None else "{:0.2f}".format(iou_thr)
+        aind = [i for i, label in enumerate(AREA_LABELS) if label == area]
+        mind = [i for i, m in enumerate(max_dets) if m == max_det]
+        s = precision if ap == 1 else recall
+        if iou_thr is not None:
+            s = s[np.where(iou_thr == IOU_THRS)[0]]
+        s = s[:, :, :, aind, mind] if ap == 1 else s[:, :, aind, mind]
+        mean_s = -1 if len(s[s > -1]) == 0 else np.mean(s[s > -1])
+        if verbose:
+            print(i_str.format(title, kind, iou_str, area, max_det, mean_s))
+        return mean_s
+
+    stats = np.zeros((12,))
+    stats[0] = _summarize(1, max_det=max_dets[-1])
+    stats[1] = _summarize(1, iou_thr=.5, max_det=max_dets[-1])
+    stats[2] = _summarize(1, iou_thr=.75, max_det=max_dets[-1])
+    stats[3] = _summarize(1, area="small", max_det=max_dets[-1])
+    stats[4] = _summarize(1, area="medium", max_det=max_dets[-1])
+    stats[5] = _summarize(1, area="large", max_det=max_dets[-1])
+    stats[6] = _summarize(0, max_det=max_dets[0])
+    stats[7] = _summarize(0, max_det=max_dets[1])
+    stats[8] = _summarize(0, max_det=max_dets[-1])
+    stats[9] = _summarize(0, area="small", max_det=max_dets[-1])
+    stats[10] = _summarize(0, area="medium", max_det=max_dets[-1])
+    stats[11] = _summarize(0, area="large", max_det=max_dets[-1])
+    return stats
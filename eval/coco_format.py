@@ -0,0 +1,56 @@
+# eval/coco_format.py
+"""
+Conversion of rvm detections to COCO result format.
+
+COCO results are {"image_id", "category_id", "bbox": [x, y, w, h], "score"}
+dicts. Model class indices are mapped to dataset category ids by class name
+(YOLO's 80 COCO classes map onto the 91 COCO category ids this way).
+"""
+
+import re
+from typing import Any, Dict, List, Mapping, Optional, Sequence
+
+import numpy as np
+
+
+def _norm(name: str) -> str:
+    return re.sub(r"[^a-z0-9]", "", str(name).lower())
+
+
+def category_mapping(names: Mapping[int, str], categories: Sequence[Dict[str, Any]],
+                     overrides: Optional[Mapping[int, int]] = None) -> Dict[int, int]:
+    """
+    Map model class ids to dataset category ids by (normalized) class name.
+
+    Args:
+        names: Model class index -> class name (e.g. detector.names).
+        categories: COCO "categories" list of the annotation file.
+        overrides: Explicit class index -> category id entries (take precedence).
+
+    Returns:
+        dict: class index -> category id. Classes without a match are left out.
+    """
+    by_name = {_norm(c["name"]): c["id"] for c in categories}
+    mapping = {int(k): by_name[_norm(v)] for k, v in names.items() if _norm(v) in by_name}
+    mapping.update({int(k): int(v) for k, v in (overrides or {}).items()})
+    return mapping
+
+
+def to_coco_results(detections, image_id: int, class_to_category: Mapping[int, int]) -> List[Dict[str, Any]]:
+    """
+    Convert the Detections of one image to COCO result dicts.
+
+    Boxes of classes missing from `class_to_category` are dropped.
+    """
+    if not len(detections):
+        return []
+    xyxy = np.asarray(detections.xyxy, np.float64)
+    xywh = np.concatenate([xyxy[:, :2], xyxy[:, 2:] - xyxy[:, :2]], axis=1).round(3)
+    scores = np.asarray(detections.scores, np.float64).round(5)
+    results = []
+    for box, score, cls in zip(xywh.tolist(), scores.tolist(), detections.class_ids.tolist()):
+        category_id = class_to_category.get(int(cls))
+        if category_id is not None:
+            results.append({"image_id": image_id, "category_id": category_id,
+                            "bbox": box, "score": score})
+    return results
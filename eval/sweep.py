@@ -0,0 +1,164 @@
+# eval/sweep.py
+"""
+Operating-point sweeps over cached COCO bbox matches.
+
+Matching a prediction set (eval.bbox_eval.BBoxEvaluator.index) is done once
+and saved as a MatchIndex; precision/recall/F1 per score threshold are then
+read off the cached matches with cumulative sums:
+
+    python -m eval.sweep --ann annotations.json --preds preds.json --cache matches.npz
+    python -m eval.sweep --cache matches.npz --categories person car --area 0 1024
+
+A detection counts as a true positive when it is matched at the given IoU
+threshold, as a false positive when it is unmatched and not ignored; matches
+with crowd or out-of-range ground truth count as neither (COCO rules).
+"""
+
+import argparse
+import csv
+import json
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from eval.bbox_eval import AREA_LABELS, IOU_THRS, MAX_DETS, BBoxEvaluator, Matches, MatchIndex
+
+COLUMNS = ("score_thr", "tp", "fp", "fn", "precision", "recall", "f1")
+
+
+def pr_table(matches: Matches, score_thrs: Sequence[float], iou_thr: float = 0.5,
+             area: int = 0, max_det: int = MAX_DETS[-1]) -> List[Dict[str, float]]:
+    """
+    Precision, recall and F1 of the detections scoring at least each threshold.
+
+    Args:
+        matches: Matches (usually MatchIndex.select(...)).
+        score_thrs: Score thresholds, one table row each.
+        iou_thr: IoU threshold, one of IOU_THRS.
+        area: Index of the area range the matches were computed for (0: all).
+        max_det: Detections kept per image and category (at most MAX_DETS[-1]).
+
+    Returns:
+        list of dict: One row per threshold with the keys in COLUMNS.
+    """
+    hit = np.flatnonzero(np.isclose(IOU_THRS, iou_thr))
+    if not len(hit):
+        raise ValueError(f"iou_thr must be one of {np.round(IOU_THRS, 2).tolist()}, got {iou_thr}")
+    t = hit[0]
+    keep = matches.rank < max_det
+    matched, ignored = matches.matched[area, t, keep], matches.ignored[area, t, keep]
+    order = np.argsort(-matches.score[keep], kind="mergesort")
+    scores = matches.score[keep][order]
+    tp_sum = np.concatenate([[0], np.cumsum((matched & ~ignored)[order])])
+    fp_sum = np.concatenate([[0], np.cumsum((~matched & ~ignored)[order])])
+    n_positive = int(matches.n_positive[:, area].sum())
+
+    # Number of detections scoring >= each threshold (scores are descending).
+    counts = np.searchsorted(-scores, -np.asarray(score_thrs, np.float64), side="right")
+    rows = []
+    for thr, n in zip(score_thrs, counts):
+        tp, fp = int(tp_sum[n]), int(fp_sum[n])
+        precision = tp / (tp + fp) if tp + fp else 0.0
+        recall = tp / n_positive if n_positive else 0.0
+        f1 = 2 * precision * recall / (precision + recall) if precision + recall else 0.0
+        rows.append({"score_thr": float(thr), "tp": tp, "fp": fp, "fn": n_positive - tp,
+                     "precision": precision, "recall": recall, "f1": f1})
+    return rows
+
+
+def sweep(index: MatchIndex, score_thrs: Sequence[float],
+          categories: Optional[Sequence[Union[int, str]]] = None,
+          area: Union[str, Tuple[float, float]] = "all", iou_thr: float = 0.5,
+          max_det: int = MAX_DETS[-1]) -> List[Dict[str, float]]:
+    """
+    Per-threshold precision/recall/F1 table of a MatchIndex.
+
+    Args:
+        index: Cached matches of one prediction set.
+        score_thrs: Score thresholds.
+        categories: Category ids or names to evaluate (default: all).
+        area: One of AREA_LABELS, or a (min, max) box area range (re-matched from
+            the cached IoUs).
+        iou_thr: IoU threshold, one of IOU_THRS.
+        max_det: Detections kept per image and category.
+    """
+    if isinstance(area, str):
+        if area not in AREA_LABELS:
+            raise ValueError(f"Unknown area {area!r}, expected one of {AREA_LABELS} or (min, max)")
+        matches, a = index.select(categories=categories), AREA_LABELS.index(area)
+    else:
+        matches, a = index.select(categories=categories, area_rngs=[tuple(area)]), 0
+    return pr_table(matches, score_thrs, iou_thr=iou_thr, area=a, max_det=max_det)
+
+
+def best_f1(rows: Sequence[Dict[str, float]]) -> Dict[str, float]:
+    """The row with the highest F1 (the lowest threshold on ties)."""
+    return max(rows, key=lambda r: (r["f1"], -r["score_thr"]))
+
+
+def format_table(rows: Sequence[Dict[str, float]]) -> str:
+    """Fixed-width text table of pr_table rows."""
+    lines = ["{:>9} {:>8} {:>8} {:>8} {:>9} {:>8} {:>8}".format(*COLUMNS)]
+    for r in rows:
+        lines.append("{score_thr:>9.3f} {tp:>8d} {fp:>8d} {fn:>8d} {precision:>9.4f} "
+                     "{recall:>8.4f} {f1:>8.4f}".format(**r))
+    return "\n".join(lines)
+
+
+def load_index(cache: Optional[str], ann_file: Optional[str] = None,
+               pred_file: Optional[str] = None, workers: Optional[int] = None) -> MatchIndex:
+    """
+    Load a cached MatchIndex, or build it from annotations and predictions.
+
+    An existing cache is used unless predictions are given; a newly built index
+    is saved to `cache` when one is set.
+    """
+    if cache and Path(cache).exists() and not pred_file:
+        return MatchIndex.load(cache)
+    if not (ann_file and pred_file):
+        raise ValueError("Need --ann and --preds to build the match index (or an existing --cache)")
+    with open(pred_file, "r") as f:
+        predictions = json.load(f)
+    index = BBoxEvaluator(ann_file, workers=workers).index(predictions)
+    if cache:
+        index.save(cache)
+        print(f"[INFO] Match index saved to {cache}")
+    return index
+
+
+if __name__ == "__main__":
+
+    parser = argparse.ArgumentParser(description="Precision/recall/F1 per score threshold")
+    parser.add_argument("--ann", type=str, default=None, help="Path to annotation JSON")
+    parser.add_argument("--preds", type=str, default=None, help="Predictions JSON (COCO results)")
+    parser.add_argument("--cache", type=str, default=None,
+                        help="Match index .npz (written when --preds is given, read otherwise)")
+    parser.add_argument("--thresholds", type=float, nargs=3, default=(0.05, 0.95, 0.05),
+                        metavar=("START", "STOP", "STEP"), help="Score threshold range (inclusive)")
+    parser.add_argument("--categories", nargs="+", default=None, help="Category ids or names")
+    parser.add_argument("--area", nargs="+", default=["all"],
+                        help="Area label (all/small/medium/large) or MIN MAX box area")
+    parser.add_argument("--iou", type=float, default=0.5, help="IoU threshold")
+    parser.add_argument("--max-det", type=int, default=MAX_DETS[-1], help="Detections per image and category")
+    parser.add_argument("--workers", type=int, default=None, help="Matching processes")
+    parser.add_argument("--out", type=str, default=None, help="Also write the table to this CSV file")
+
+    args = parser.parse_args()
+    index = load_index(args.cache, args.ann, args.preds, args.workers)
+    start, stop, step = args.thresholds
+    thresholds = np.round(np.arange(start, stop + step / 2, step), 6)
+    categories = None if args.categories is None else \
+        [int(c) if c.isdigit() else c for c in args.categories]
+    area = args.area[0] if len(args.area) == 1 else tuple(float(x) for x in args.area[:2])
+    rows = sweep(index, thresholds, categories, area=area, iou_thr=args.iou, max_det=args.max_det)
+
+    print(format_table(rows))
+    best = best_f1(rows)
+    print(f"Best F1 {best['f1']:.4f} at score >= {best['score_thr']:.3f} "
+          f"(precision {best['precision']:.4f}, recall {best['recall']:.4f})")
+    if args.out:
+        with open(args.out, "w", newline="") as f:
+            writer = csv.DictWriter(f, fieldnames=COLUMNS)
+            writer.writeheader()
+            writer.writerows(rows)
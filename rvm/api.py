@@ -3,147 +3,520 @@
 Unified high-level API for Robora Vision Modules (RVM).
 Provides:
 - Object detection (image, video, webcam)
-- Segmentation
+- Batch processing of image collections (directory, glob, file list)
+- Segmentation (everything, or YOLO box prompts on one segmentation pass)
 - Marker detection
-- COCO evaluation
+- COCO evaluation (of a predictions file, or predict-then-evaluate)
 """
 
+import inspect
+import time
+from contextlib import closing
 from pathlib import Path
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Iterator, Optional, Tuple, Union
 
-from rvm.detect.yolo import YOLODetector
-from rvm.segment.sam_lite import SamLiteSegmenter
-from rvm.markers.aruco import ArucoDetector
-from rvm.markers.barcodes import BarCodesDetector
-from rvm.core.visualize import draw_boxes, draw_masks, draw_markers, draw_barcodes, draw_qr_codes
-from rvm.io.loader import load_image, load_video, load_webcam
-from rvm.io.writer import save_image, save_json
-from eval.coco_eval import evaluate_coco
+from rvm.batch import run_batch
+from rvm.core.cache import ResultCache, open_cache, weights_digest
+from rvm.core.frame import FrameContext
+from rvm.core.hashing import file_digest
+from rvm.core.motion import MotionGate
+from rvm.core.pipeline import run_stages
+from rvm.core.profiling import NULL_PROFILER, finish, open_profiler
+from rvm.core.registry import get_detector, get_segmenter, get_aruco_detector, get_barcode_detector
+from rvm.core.types import BarCode, Box, Detections, Marker, Mask, QRCode
+from rvm.detect.slicing import SlicedDetector
+from rvm.track.tracker import TrackingDetector
+from rvm.core.visualize import annotate, draw_boxes, draw_masks
+from rvm.io.loader import (load_image, load_video, load_webcam, iter_frame_batches,
+                           iter_timestamped_frames)
+from rvm.io.sources import is_image_collection
+from rvm.io.writer import save_image, save_json, JsonlWriter
+from rvm.predict import load_annotations, predict_coco
+from eval.coco_eval import evaluate_coco, evaluate_predictions
 
 
 # -----------------------------
 # Detection
 # -----------------------------
+def _run_detector(detector, frames, batch_size: int, prof=NULL_PROFILER) -> List[Detections]:
+    """detect_batch timed as the "infer" stage, plus the detector's own breakdown."""
+    with prof.stage("infer"):
+        detections = detector.detect_batch(frames, batch_size)
+    _add_breakdown(prof, detector)
+    return detections
+
+
+def _add_breakdown(prof, detector) -> None:
+    """Add the preprocess/inference/postprocess split of the detector's last call, if any."""
+    if prof.enabled:
+        for stage, seconds in getattr(detector, "last_timings", {}).items():
+            prof.add_time(stage, seconds)
+
+
+def _webcam_frames(detector, index: int, realtime: bool, drop_stale: bool,
+                   gate: Optional[MotionGate] = None, prof=NULL_PROFILER):
+    """Yield (frame_idx, detections, extra) for each processed webcam frame."""
+    cap = load_webcam(index, latest_only=drop_stale)
+    frames = prof.timed(iter(cap) if drop_stale else iter_timestamped_frames(cap), "decode")
+    detections = Detections.empty()
+    dropped = 0
+    try:
+        for frame_idx, capture_ts, frame in frames:
+            carried = gate is not None and not gate.should_infer(frame)
+            if not carried:
+                with prof.stage("infer"):
+                    detections = detector.detect(frame)
+                _add_breakdown(prof, detector)
+            process_ts = time.time()
+            with prof.stage("draw"):
+                annotated = annotate(frame, boxes=detections, inplace=True)
+            if drop_stale and cap.dropped != dropped:
+                prof.count("dropped_frames", cap.dropped - dropped)
+                dropped = cap.dropped
+
+            if realtime:
+                import cv2
+                cv2.imshow("RVM Detection (Press q to quit)", annotated)
+                if cv2.waitKey(1) & 0xFF == ord("q"):
+                    break
+
+            extra = {"capture_ts": capture_ts, "process_ts": process_ts}
+            if gate is not None:
+                extra["carried_over"] = carried
+            yield frame_idx, detections, extra
+    finally:
+        cap.release()
+        if drop_stale:
+            print(f"[INFO] Webcam: processed {cap.delivered} frames, "
+                  f"dropped {cap.dropped} stale frames")
+        if gate is not None:
+            print(f"[INFO] Motion gate: {gate.summary()}")
+
+
+def _video_frames(detector, source: str, out_path: Path, batch_size: int, pipelined: bool,
+                  gate: Optional[MotionGate] = None, prof=NULL_PROFILER):
+    """Yield (frame_idx, detections, extra) for each video frame, writing the annotated video."""
+    cap, writer = load_video(source, out_path)
+    previous = [Detections.empty()]
+
+    def infer(batch):
+        if gate is None:
+            return [(frame, detections, {}) for frame, detections
+                    in zip(batch, _run_detector(detector, batch, batch_size, prof))]
+        # Only frames with motion go to the model; static ones reuse the last result.
+        fresh = [gate.should_infer(frame) for frame in batch]
+        inferred = iter(_run_detector(detector, [f for f, m in zip(batch, fresh) if m],
+                                      batch_size, prof))
+        items = []
+        for frame, moved in zip(batch, fresh):
+            if moved:
+                previous[0] = next(inferred)
+            items.append((frame, previous[0], {"carried_over": not moved}))
+        return items
+
+    def draw(items):
+        # Decoded frames are not reused after this stage, so draw on them directly.
+        with prof.stage("draw"):
+            return [(annotate(frame, boxes=detections, inplace=True), detections, extra)
+                    for frame, detections, extra in items]
+
+    def encode(items):
+        with prof.stage("encode"):
+            for annotated, _, _ in items:
+                writer.write(annotated)
+        return [(detections, extra) for _, detections, extra in items]
+
+    frame_idx = 0
+    try:
+        stages = [infer, draw, encode]
+        batches = prof.timed(iter_frame_batches(cap, batch_size), "decode")
+        # closing() joins the stage threads before the capture and writer are released.
+        with closing(run_stages(batches, stages, threaded=pipelined)) as outputs:
+            for batch_items in outputs:
+                for detections, extra in batch_items:
+                    yield frame_idx, detections, extra
+                    frame_idx += 1
+    finally:
+        cap.release()
+        writer.release()
+        if gate is not None:
+            print(f"[INFO] Motion gate: {gate.summary()}")
+
+
+def _emit_records(frames, out_dir: Path, name: str, stream: bool, compress: bool,
+                  prof=NULL_PROFILER):
+    """
+    Turn per-frame detections into flat result records and persist them.
+
+    With stream=True every frame is appended to `<name>.jsonl[.gz]` as one compact
+    record as soon as it is produced; otherwise all records are collected and
+    written to `<name>.json` at the end.
+    """
+    if stream:
+        path = out_dir / (f"{name}.jsonl.gz" if compress else f"{name}.jsonl")
+        with JsonlWriter(path, compress=compress) as sink:
+            for frame_idx, detections, extra in frames:
+                prof.frame()
+                prof.count("detections", len(detections))
+                with prof.stage("json"):
+                    dets = detections.to_dicts()
+                    sink.write({"frame": frame_idx, **extra, "detections": dets})
+                for result in dets:
+                    yield {**result, "frame": frame_idx, **extra}
+        return
+
+    all_results = []
+    for frame_idx, detections, extra in frames:
+        prof.frame()
+        prof.count("detections", len(detections))
+        for result in detections.to_dicts():
+            result["frame"] = frame_idx
+            result.update(extra)
+            all_results.append(result)
+            yield result
+    with prof.stage("json"):
+        save_json(all_results, out_dir / f"{name}.json")
+
+
+def _emit_frame_records(frames, out_dir: Path, name: str, stream: bool, compress: bool,
+                        prof=NULL_PROFILER):
+    """Persist already-complete per-frame records (JSON Lines when streaming)."""
+    if stream:
+        path = out_dir / (f"{name}.jsonl.gz" if compress else f"{name}.jsonl")
+        with JsonlWriter(path, compress=compress) as sink:
+            for record in frames:
+                prof.frame()
+                with prof.stage("json"):
+                    sink.write(record)
+                yield record
+        return
+
+    all_records = []
+    for record in frames:
+        prof.frame()
+        all_records.append(record)
+        yield record
+    with prof.stage("json"):
+        save_json(all_records, out_dir / f"{name}.json")
+
+
+def _profiled(records, prof, owned: bool):
+    """Yield from `records`, then close (or flush) the profiler, also when stopped early."""
+    try:
+        yield from records
+    finally:
+        finish(prof, owned)
+
+
+def _build_detector(model: str = "yolov8n.pt", backend: str = "torch",
+                    tile_size: Optional[int] = None, tile_overlap: float = 0.2,
+                    tile_merge: str = "nms", tile_full_pass: bool = True):
+    """Return the cached detector, wrapped for tiled inference when tile_size is set."""
+    detector = get_detector(model, backend=backend)
+    if tile_size:
+        return SlicedDetector(detector, tile_size=tile_size, overlap=tile_overlap,
+                              full_pass=tile_full_pass, merge=tile_merge)
+    return detector
+
+
+def _cached(cache, task: str, image_path: Optional[str], model: Optional[str],
+            params: Dict[str, Any], compute, keep=None):
+    """
+    Return the results for one image, from the result cache when possible.
+
+    On a hit `compute` is not called, so no model is loaded and no inference runs.
+    On a miss the results are stored unless `keep()` returns False (e.g. when
+    the model could not run and `compute` produced a placeholder).
+    """
+    cache = open_cache(cache)
+    if cache is None or image_path is None:
+        return compute()
+    key = cache.key(file_digest(image_path), task, weights_digest(model) if model else "", params)
+    results = cache.get(key)
+    if results is None:
+        results = compute()
+        if keep is None or keep():
+            cache.put(key, results)
+    return results
+
+
+def _detect_array(img, model: str = "yolov8n.pt", image_path: Optional[str] = None,
+                  cache=None, prof=NULL_PROFILER, **detector_options):
+    """Detect objects in one decoded image. Returns (annotated image, result dicts)."""
+    # Key on the full option set so omitted defaults and explicit ones share entries.
+    params = inspect.signature(_build_detector).bind(model, **detector_options)
+    params.apply_defaults()
+    params = {k: v for k, v in params.arguments.items() if k != "model"}
+    def find():
+        detector = _build_detector(model, **detector_options)
+        with prof.stage("infer"):
+            detections = detector.detect(img)
+        _add_breakdown(prof, detector)
+        return detections.to_dicts()
+
+    results = _cached(cache, "detect", image_path, model, params, find)
+    prof.count("detections", len(results))
+    with prof.stage("draw"):
+        return draw_boxes(img, [Box(**r) for r in results]), results
+
+
 def detect(
-    source: str,
+    source: Union[str, List[str]],
     model: str = "yolov8n.pt",
     out_dir: str = "results",
-    realtime: bool = False
-) -> List[Dict[str, Any]]:
+    realtime: bool = False,
+    batch_size: int = 1,
+    pipelined: bool = False,
+    drop_stale: bool = True,
+    stream: bool = False,
+    compress: bool = False,
+    lazy: bool = False,
+    workers: Optional[int] = None,
+    backend: str = "torch",
+    tile_size: Optional[int] = None,
+    tile_overlap: float = 0.2,
+    tile_merge: str = "nms",
+    tile_full_pass: bool = True,
+    cache: Union[None, str, ResultCache] = None,
+    motion_threshold: Optional[float] = None,
+    motion_roi: Optional[Tuple[int, int, int, int]] = None,
+    track: bool = False,
+    detect_every: int = 1,
+    profile=None
+) -> Union[List[Dict[str, Any]], Iterator[Dict[str, Any]]]:
     """
-    Run object detection on an image, video, or webcam.
+    Run object detection on an image, video, webcam, or a collection of images.
 
     Args:
-        source (str): Path to image/video or webcam index (e.g., "0").
+        source (str or list): Path to image/video, webcam index (e.g., "0"), or an image
+            collection (directory, glob pattern, .txt file list, or list of paths).
         model (str): YOLO model weights.
         out_dir (str): Directory to save results.
         realtime (bool): If True and source is webcam, display results in real-time.
+        batch_size (int): Number of video frames sent to the model per forward pass.
+        pipelined (bool): For video, run decode, inference, annotation and encoding
+            as concurrent stages (output order is preserved).
+        drop_stale (bool): For webcam, always process the newest frame and drop frames
+            that arrived while the detector was busy.
+        stream (bool): For video/webcam, append one JSON Lines record per frame while
+            running instead of writing one JSON file at the end.
+        compress (bool): Gzip the JSON Lines output (stream=True only).
+        lazy (bool): Return an iterator that processes frames as it is consumed
+            instead of a list. Combine with stream=True for unbounded runs.
+        workers (int): Worker processes for image collections (default: CPU count).
+        backend (str): Detector backend, "torch" or "onnx" (ONNX Runtime on CPU).
+        tile_size (int): If set, run sliced inference on tiles of this size (for
+            high-resolution inputs where small objects get lost when downscaled).
+        tile_overlap (float): Fraction of overlap between neighbouring tiles.
+        tile_merge (str): Merge across tile borders with "nms" or "fuse".
+        tile_full_pass (bool): Also detect on the whole image when tiling.
+        cache (str or ResultCache): For images, a result cache (or its directory);
+            images already processed with the same model and settings are read
+            from it without loading the model.
+        motion_threshold (float): For video/webcam, skip inference while less than this
+            fraction of pixels changed since the last inferred frame; the previous
+            detections are reused and their records marked "carried_over".
+        motion_roi (tuple): Optional (x1, y1, x2, y2) region watched by the motion gate.
+        track (bool): For video/webcam, track objects across frames and add a stable
+            "track_id" to every record (boxes are colored by track).
+        detect_every (int): With tracking, run the detector only every N frames and use
+            the tracker's predictions in between (implies track=True when > 1).
+        profile (str, callable or Profiler): Record per-stage timings (decode, infer,
+            preprocess/inference/postprocess, draw, encode, json) and counters for
+            single images, video and webcam: a directory (profile.jsonl and a
+            Prometheus metrics.prom), a callable receiving each snapshot dict, or
+            a Profiler from rvm.core.profiling.
 
     Returns:
-        list of dict: Detection results (boxes, scores, labels).
+        list of dict: Detection results (boxes, scores, labels), or an iterator over
+        them when lazy=True.
     """
-    detector = YOLODetector(model)
+    detector_options = {"backend": backend, "tile_size": tile_size, "tile_overlap": tile_overlap,
+                        "tile_merge": tile_merge, "tile_full_pass": tile_full_pass}
+
+    # Image collection (directory, glob, file list)
+    if is_image_collection(source):
+        results = run_batch("detect", source, out_dir, workers=workers, model=model,
+                            cache=cache, **detector_options)
+        return iter(results) if lazy else results
+
     out_dir = Path(out_dir)
     out_dir.mkdir(parents=True, exist_ok=True)
+    gate = MotionGate(motion_threshold, roi=motion_roi) if motion_threshold is not None else None
+    prof, owned = open_profiler(profile)
 
     # Webcam
     if source.isdigit():
-        cap = load_webcam(int(source))
-        all_results = []
-        frame_idx = 0
-        while True:
-            ret, frame = cap.read()
-            if not ret:
-                break
-            detections = detector.detect(frame)
-            annotated = draw_boxes(frame, detections)
-
-            if realtime:
-                import cv2
-                cv2.imshow("RVM Detection (Press q to quit)", annotated)
-                if cv2.waitKey(1) & 0xFF == ord("q"):
-                    break
-
-            for d in detections:
-                result = d.to_dict()
-                result["frame"] = frame_idx
-                all_results.append(result)
-            frame_idx += 1
-
-        cap.release()
-        save_json(all_results, out_dir / "detect_webcam.json")
-        return all_results
+        detector = _build_detector(model, **detector_options)
+        if track or detect_every > 1:
+            detector = TrackingDetector(detector, detect_every=detect_every)
+        frames = _webcam_frames(detector, int(source), realtime, drop_stale, gate, prof)
+        records = _emit_records(frames, out_dir, "detect_webcam", stream, compress, prof)
 
     # Image
     elif source.lower().endswith((".jpg", ".jpeg", ".png")):
-        img = load_image(source)
-        detections = detector.detect(img)
-        annotated = draw_boxes(img, detections)
-        save_image(annotated, out_dir, "detect_result.jpg")
-        save_json([d.to_dict() for d in detections], out_dir / "detect_result.json")
-        return [d.to_dict() for d in detections]
+        try:
+            with prof.stage("decode"):
+                img = load_image(source)
+            annotated, results = _detect_array(img, model, image_path=source, cache=cache,
+                                               prof=prof, **detector_options)
+            with prof.stage("encode"):
+                save_image(annotated, out_dir, "detect_result.jpg")
+            with prof.stage("json"):
+                save_json(results, out_dir / "detect_result.json")
+            prof.frame()
+        finally:
+            finish(prof, owned)
+        return iter(results) if lazy else results
 
     # Video
     elif source.lower().endswith((".mp4", ".mov", ".avi")):
-        cap, writer = load_video(source, out_dir / "detect_result.mp4")
-        all_results = []
-        frame_idx = 0
-        while True:
-            ret, frame = cap.read()
-            if not ret:
-                break
-            detections = detector.detect(frame)
-            annotated = draw_boxes(frame, detections)
-            writer.write(annotated)
-
-            for d in detections:
-                result = d.to_dict()
-                result["frame"] = frame_idx
-                all_results.append(result)
-            frame_idx += 1
-
-        cap.release()
-        writer.release()
-        save_json(all_results, out_dir / "detect_result.json")
-        return all_results
+        detector = _build_detector(model, **detector_options)
+        if track or detect_every > 1:
+            detector = TrackingDetector(detector, detect_every=detect_every)
+        frames = _video_frames(detector, source, out_dir / "detect_result.mp4",
+                               batch_size, pipelined, gate, prof)
+        records = _emit_records(frames, out_dir, "detect_result", stream, compress, prof)
 
     else:
+        finish(prof, owned)
         raise ValueError(f"Unsupported source type: {source}")
 
+    records = _profiled(records, prof, owned)
+    return records if lazy else list(records)
+
 
 # -----------------------------
 # Segmentation
 # -----------------------------
-def segment_image(image_path: str, out_dir: str = "results") -> List[Dict[str, Any]]:
+_SEGMENT_MODEL = "FastSAM-s.pt"
+
+
+def _segment_array(img, image_path: Optional[str] = None, cache=None,
+                   mask_format: str = "polygon", prof=NULL_PROFILER):
+    """Segment one decoded image. Returns (annotated image, result dicts)."""
+    ok = [True]
+
+    def segment():
+        with prof.stage("segment"):
+            masks, ok[0] = get_segmenter(_SEGMENT_MODEL).try_segment(img, mask_format)
+        return [m.to_dict() for m in masks]
+
+    # The fallback rectangle is never cached: it would outlive a later working FastSAM.
+    results = _cached(cache, "segment", image_path, _SEGMENT_MODEL,
+                      {"mask_format": mask_format}, segment, keep=lambda: ok[0])
+    prof.count("masks", len(results))
+    with prof.stage("draw"):
+        return draw_masks(img, [Mask(**r) for r in results]), results
+
+
+def segment_image(image_path: Union[str, List[str]], out_dir: str = "results",
+                  workers: Optional[int] = None,
+                  cache: Union[None, str, ResultCache] = None,
+                  mask_format: str = "polygon", profile=None) -> List[Dict[str, Any]]:
+    """
+    Segment an image or an image collection with FastSAM.
+
+    Args:
+        image_path: Image path, or an image collection (directory, glob, .txt list).
+        out_dir (str): Directory to save results.
+        workers (int): Worker processes for image collections (default: CPU count).
+        cache (str or ResultCache): Optional result cache (or its directory).
+        mask_format (str): "polygon" or "rle" (COCO-compatible run-length encoding,
+            much smaller for images with many masks).
+        profile (str, callable or Profiler): Record decode/segment/draw/encode/json
+            timings for a single image (see detect()).
+
+    Returns:
+        list of dict: One dict per mask.
+    """
+    if is_image_collection(image_path):
+        return run_batch("segment", image_path, out_dir, workers=workers, cache=cache,
+                         mask_format=mask_format)
+
+    prof, owned = open_profiler(profile)
+    try:
+        with prof.stage("decode"):
+            img = load_image(image_path)
+        annotated, results = _segment_array(img, image_path, cache, mask_format, prof)
+        out_dir = Path(out_dir)
+        out_dir.mkdir(parents=True, exist_ok=True)
+        with prof.stage("encode"):
+            save_image(annotated, out_dir, "segment_result.jpg")
+        with prof.stage("json"):
+            save_json(results, out_dir / "segment_result.json")
+        prof.frame()
+    finally:
+        finish(prof, owned)
+    return results
+
+
+def segment_objects(image_path: str, model: str = "yolov8n.pt", out_dir: str = "results",
+                    mask_format: str = "polygon", backend: str = "torch") -> List[Dict[str, Any]]:
+    """
+    Detect objects with YOLO and segment each of them with box prompts.
+
+    FastSAM runs once on the image; every detection box then selects its mask
+    from that single pass instead of running segmentation once per object.
+
+    Args:
+        image_path (str): Path to the image.
+        model (str): YOLO model weights.
+        out_dir (str): Directory to save results.
+        mask_format (str): "polygon" or "rle".
+        backend (str): Detector backend, "torch" or "onnx".
+
+    Returns:
+        list of dict: One detection dict per object with its "mask".
+    """
     img = load_image(image_path)
-    segmenter = SamLiteSegmenter()
-    masks = segmenter.segment(img)
+    detections = _build_detector(model, backend=backend).detect(img)
+    session = get_segmenter(_SEGMENT_MODEL).session(img)
+    masks = session.in_boxes(detections, mask_format)
 
-    annotated = draw_masks(img, masks)
+    annotated = annotate(img, boxes=detections, masks=masks)
+    results = [{**box, "mask": mask.to_dict()} for box, mask in zip(detections.to_dicts(), masks)]
     out_dir = Path(out_dir)
     out_dir.mkdir(parents=True, exist_ok=True)
-    save_image(annotated, out_dir, "segment_result.jpg")
-    save_json([m.to_dict() for m in masks], out_dir / "segment_result.json")
-    return [m.to_dict() for m in masks]
+    save_image(annotated, out_dir, "segment_objects_result.jpg")
+    save_json(results, out_dir / "segment_objects_result.json")
+    return results
 
 
 # -----------------------------
 # Marker detection
 # -----------------------------
-def detect_markers(image_path: str, out_dir: str = "results") -> List[Dict[str, Any]]:
-    img = load_image(image_path)
-    detector_aruco = ArucoDetector()
-    markers = detector_aruco.detect(img)
-    detector_codes = BarCodesDetector()
-    qr_codes, bar_codes = detector_codes.detect(img)
+def _markers_array(img, image_path: str, cache=None, localize: bool = False,
+                   cascade: bool = False, expected_codes: Optional[int] = None,
+                   prof=NULL_PROFILER):
+    """Detect markers and codes in one decoded image. Returns (annotated image, results)."""
+    # Cascade timings describe this decode only: they are not cached, and a cache
+    # hit reports none.
+    steps = []
 
-    annotated = draw_markers(img, markers)
-    annotated = draw_qr_codes(annotated, qr_codes)
-    annotated = draw_barcodes(annotated, bar_codes)
+    def find():
+        frame = FrameContext(img)  # gray/equalized views shared by both detectors
+        detector_aruco = get_aruco_detector()
+        with prof.stage("aruco"):
+            markers = detector_aruco.detect(frame)
+        detector_codes = get_barcode_detector(localize, cascade)
+        with prof.stage("codes"):
+            qr_codes, bar_codes, report = detector_codes.detect_with_report(
+                frame, expected=expected_codes)
+        steps.extend(report)
+        return {"markers": [m.to_dict() for m in markers],
+                "qr_codes": [q.to_dict() for q in qr_codes],
+                "barcodes": [b.to_dict() for b in bar_codes]}
 
-    out_dir = Path(out_dir)
-    out_dir.mkdir(parents=True, exist_ok=True)
-    save_image(annotated, out_dir, "markers_result.jpg")
+    params = {"localize": localize, "cascade": cascade, "expected_codes": expected_codes}
+    found = _cached(cache, "markers", image_path, None, params, find)
+    markers = [Marker(**d) for d in found["markers"]]
+    qr_codes = [QRCode(**d) for d in found["qr_codes"]]
+    bar_codes = [BarCode(**d) for d in found["barcodes"]]
+
+    prof.count("detections", len(markers) + len(qr_codes) + len(bar_codes))
+    with prof.stage("draw"):
+        annotated = annotate(img, markers=markers, qr_codes=qr_codes, barcodes=bar_codes)
 
     # Comprehensive results summary for qrcode, barcode as well
     results = {
@@ -152,7 +525,8 @@ def detect_markers(image_path: str, out_dir: str = "results") -> List[Dict[str,
             "total_aruco_markers": len(markers),
             "total_qr_codes": len(qr_codes),
             "total_barcodes": len(bar_codes),
-            "total_detections": len(markers) + len(qr_codes) + len(bar_codes)
+            "total_detections": len(markers) + len(qr_codes) + len(bar_codes),
+            **({"cascade_steps": steps} if steps else {})
         },
         "aruco_markers": [
             {
@@ -181,19 +555,150 @@ def detect_markers(image_path: str, out_dir: str = "results") -> List[Dict[str,
             } for barcode in bar_codes
         ]
     }
+    return annotated, results
+
+
+def _marker_stream_frames(source: str, out_dir: Path, realtime: bool, drop_stale: bool,
+                          localize: bool, scan_every: int, min_confidence: float,
+                          prof=NULL_PROFILER):
+    """Yield one record per video/webcam frame, tracking codes between frames."""
+    from rvm.markers.stream import StreamingMarkerDetector
+
+    webcam = source.isdigit()
+    if webcam:
+        cap, writer = load_webcam(int(source), latest_only=drop_stale), None
+        frames = iter(cap) if drop_stale else iter_timestamped_frames(cap)
+    else:
+        cap, writer = load_video(source, out_dir / "markers_result.mp4")
+        frames = ((i, None, frame) for i, _, frame in iter_timestamped_frames(cap))
+    tracker = StreamingMarkerDetector(codes=get_barcode_detector(localize),
+                                      scan_every=scan_every, min_confidence=min_confidence)
+    dropped = 0
+    try:
+        for frame_idx, capture_ts, frame in prof.timed(frames, "decode"):
+            with prof.stage("markers"):
+                markers, qr_codes, bar_codes = tracker.detect(frame)
+            prof.count("detections", len(markers) + len(qr_codes) + len(bar_codes))
+            with prof.stage("draw"):
+                annotated = annotate(frame, markers=markers, qr_codes=qr_codes,
+                                     barcodes=bar_codes, inplace=True)
+            if writer is not None:
+                with prof.stage("encode"):
+                    writer.write(annotated)
+            elif drop_stale and cap.dropped != dropped:
+                prof.count("dropped_frames", cap.dropped - dropped)
+                dropped = cap.dropped
+            if realtime:
+                import cv2
+                cv2.imshow("RVM Markers (Press q to quit)", annotated)
+                if cv2.waitKey(1) & 0xFF == ord("q"):
+                    break
+
+            record = {"frame": frame_idx}
+            if capture_ts is not None:
+                record.update(capture_ts=capture_ts, process_ts=time.time())
+            record["markers"] = [m.to_dict() for m in markers]
+            record["qr_codes"] = [t.to_dict() for t in tracker.tracks if t.kind == "qr_code"]
+            record["barcodes"] = [t.to_dict() for t in tracker.tracks if t.kind == "barcode"]
+            yield record
+    finally:
+        cap.release()
+        if writer is not None:
+            writer.release()
+        print(f"[INFO] Code tracking: {tracker.summary()}")
+
+
+def detect_markers(image_path: Union[str, List[str]], out_dir: str = "results",
+                   workers: Optional[int] = None,
+                   cache: Union[None, str, ResultCache] = None,
+                   localize: bool = False, cascade: bool = False,
+                   expected_codes: Optional[int] = None,
+                   realtime: bool = False, drop_stale: bool = True,
+                   stream: bool = False, compress: bool = False, lazy: bool = False,
+                   scan_every: int = 5,
+                   min_confidence: float = 0.6,
+                   profile=None) -> Union[Dict[str, Any], List[Dict[str, Any]],
+                                          Iterator[Dict[str, Any]]]:
+    """
+    Detect ArUco markers, QR codes and barcodes in an image, image collection,
+    video or webcam stream.
+
+    On video/webcam, QR codes and barcodes are decoded once and then tracked between
+    frames by their corner positions (optical flow); payloads are reused while the
+    tracking confidence stays above `min_confidence` and decoded again when it drops.
+
+    Args:
+        image_path: Image path, image collection (directory, glob, .txt list), video
+            path or webcam index (e.g. "0").
+        out_dir (str): Directory to save results.
+        workers (int): Worker processes for image collections (default: CPU count).
+        cache (str or ResultCache): Optional result cache (or its directory).
+        localize (bool): Locate candidate code regions on a downscaled copy and decode
+            only those crops (faster on large images).
+        cascade (bool): Decode the plain grayscale image first and escalate through
+            equalization, CLAHE, binarization and upscaling only while codes are
+            missing; per-step timings are reported in detection_summary.
+        expected_codes (int): Number of QR/barcodes after which the cascade stops.
+        realtime (bool): For webcam, display the annotated frames.
+        drop_stale (bool): For webcam, always process the newest frame.
+        stream (bool): For video/webcam, append one JSON Lines record per frame while
+            running instead of writing one JSON file at the end.
+        compress (bool): Gzip the JSON Lines output (stream=True only).
+        lazy (bool): For video/webcam, return an iterator over the per-frame records.
+        scan_every (int): For video/webcam, look for new codes every N frames.
+        min_confidence (float): Tracking confidence (fraction of inlier feature points)
+            below which a tracked code is decoded again.
+        profile (str, callable or Profiler): Record per-stage timings (decode, aruco,
+            codes or markers, draw, encode, json) for single images, video and
+            webcam (see detect()).
+
+    Returns:
+        dict: Detection summary and per-type results (a list of records for collections,
+        one record per frame for video/webcam).
+    """
+    if is_image_collection(image_path):
+        return run_batch("markers", image_path, out_dir, workers=workers, cache=cache,
+                         localize=localize, cascade=cascade, expected_codes=expected_codes)
 
+    if image_path.isdigit() or image_path.lower().endswith((".mp4", ".mov", ".avi")):
+        out_dir = Path(out_dir)
+        out_dir.mkdir(parents=True, exist_ok=True)
+        name = "markers_webcam" if image_path.isdigit() else "markers_result"
+        prof, owned = open_profiler(profile)
+        frames = _marker_stream_frames(image_path, out_dir, realtime, drop_stale, localize,
+                                       scan_every, min_confidence, prof)
+        records = _emit_frame_records(frames, out_dir, name, stream, compress, prof)
+        records = _profiled(records, prof, owned)
+        return records if lazy else list(records)
 
-    # save_json([m.to_dict() for m in markers], out_dir / "markers_result.json")
-    # return [m.to_dict() for m in markers]
-    save_json(results, out_dir / "markers_result.json")
+    prof, owned = open_profiler(profile)
+    try:
+        with prof.stage("decode"):
+            img = load_image(image_path)
+        annotated, results = _markers_array(img, image_path, cache, localize, cascade,
+                                            expected_codes, prof)
+
+        out_dir = Path(out_dir)
+        out_dir.mkdir(parents=True, exist_ok=True)
+        with prof.stage("encode"):
+            save_image(annotated, out_dir, "markers_result.jpg")
+
+        # save_json([m.to_dict() for m in markers], out_dir / "markers_result.json")
+        # return [m.to_dict() for m in markers]
+        with prof.stage("json"):
+            save_json(results, out_dir / "markers_result.json")
+        prof.frame()
+    finally:
+        finish(prof, owned)
     return results
-    
+
 
 
 # -----------------------------
 # COCO Evaluation
 # -----------------------------
-def coco_eval(pred_file: str, ann_file: str, out_dir: str = "reports") -> Dict[str, float]:
+def coco_eval(pred_file: str, ann_file: str, out_dir: str = "reports",
+              backend: str = "pycocotools", workers: Optional[int] = None) -> Dict[str, float]:
     """
     Run COCO-style evaluation on predictions.
 
@@ -201,8 +706,50 @@ def coco_eval(pred_file: str, ann_file: str, out_dir: str = "reports") -> Dict[s
         pred_file (str): Path to predictions JSON file.
         ann_file (str): Path to COCO annotation JSON file.
         out_dir (str): Directory to save reports.
+        backend (str): "pycocotools" or "numpy" (same numbers, faster on large sets).
+        workers (int): Matching processes for the numpy backend.
+
+    Returns:
+        dict: {"precision": float, "recall": float}
+    """
+    return evaluate_coco(pred_file, ann_file, out_dir, backend=backend, workers=workers)
+
+
+def evaluate_model(ann_file: str, images_dir: str, model: str = "yolov8n.pt",
+                   out_dir: str = "reports", workers: Optional[int] = None,
+                   batch_size: int = 8, eval_backend: str = "numpy",
+                   save_predictions: bool = False,
+                   category_map: Optional[Dict[int, int]] = None,
+                   **detector_options) -> Dict[str, float]:
+    """
+    Run a detector over the images of a COCO annotation file and evaluate it.
+
+    Predictions go straight from the worker processes into the evaluator in COCO
+    format (class ids mapped to category ids by name); no predictions file is
+    written unless `save_predictions` is set.
+
+    Args:
+        ann_file (str): Path to COCO annotation JSON file.
+        images_dir (str): Directory the annotation `file_name`s are relative to.
+        model (str): YOLO weights.
+        out_dir (str): Directory to save reports.
+        workers (int): Worker processes for detection and numpy matching.
+        batch_size (int): Images per forward pass.
+        eval_backend (str): "numpy" or "pycocotools".
+        save_predictions (bool): Also write the predictions to `out_dir/preds.json`.
+        category_map (dict): Explicit model class id -> category id entries.
+        **detector_options: Forwarded to the detector (backend="onnx", tile_size=...).
 
     Returns:
         dict: {"precision": float, "recall": float}
     """
-    return evaluate_coco(pred_file, ann_file, out_dir)
+    dataset = load_annotations(ann_file)
+    predictions = list(predict_coco(dataset, images_dir, model=model, workers=workers,
+                                    batch_size=batch_size, category_map=category_map,
+                                    **detector_options))
+    print(f"[INFO] {len(predictions)} predictions on {len(dataset['images'])} images")
+    if save_predictions:
+        Path(out_dir).mkdir(parents=True, exist_ok=True)
+        save_json(predictions, Path(out_dir) / "preds.json")
+    return evaluate_predictions(predictions, dataset, out_dir, backend=eval_backend,
+                                workers=workers)
@@ -0,0 +1,233 @@
+# rvm/batch.py
+"""
+Parallel batch processing of image collections.
+
+run_batch(task, source, out_dir, workers) shards the images of a directory,
+glob pattern or file list across a process pool. Each worker keeps one model
+instance (through the per-process model registry) and decodes the next images
+on a background thread while the current one is processed.
+
+Every finished image is appended to `<task>_batch.jsonl` as soon as its chunk
+completes, so an interrupted run can be resumed: images already present in
+that file are skipped. The file starts with a header record holding a digest
+of the task and its options; a run with different options (another model,
+backend, threshold, tiling, ...) starts the file afresh instead of reusing
+results computed under the old settings. At the end the records are merged,
+in input order, into `<task>_batch.json`.
+"""
+
+import hashlib
+import json
+import multiprocessing as mp
+import os
+from collections import Counter, deque
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from rvm.core.cache import open_cache
+from rvm.io.sources import Source, resolve_images
+from rvm.io.writer import JsonlWriter, read_jsonl, save_image, save_json
+
+TASKS = ("detect", "segment", "markers")
+
+# Per-process worker settings, filled in by _init_worker.
+_WORKER: Dict[str, Any] = {}
+
+
+def _limit_threads(threads: int, torch: bool) -> None:
+    """Split the cores between workers (read by torch and ONNX Runtime at load time)."""
+    import cv2
+
+    if threads < (os.cpu_count() or 1):
+        os.environ["OMP_NUM_THREADS"] = str(threads)
+        cv2.setNumThreads(threads)
+        if torch:
+            import torch as _torch
+
+            _torch.set_num_threads(threads)
+
+
+def _init_worker(task: str, task_options: Dict[str, Any], out_dir: str, save_images: bool,
+                 threads: int) -> None:
+    torch = task == "segment" or (task == "detect" and task_options.get("backend", "torch") == "torch")
+    _limit_threads(threads, torch)
+    _WORKER.update(task=task, task_options=task_options, out_dir=out_dir,
+                   save_images=save_images)
+
+
+def _run_task(task: str, img, image_path: str, task_options: Dict[str, Any]):
+    from rvm import api
+
+    if task == "detect":
+        return api._detect_array(img, image_path=image_path, **task_options)
+    if task == "segment":
+        return api._segment_array(img, image_path, **task_options)
+    return api._markers_array(img, image_path, **task_options)
+
+
+def _read(path: str):
+    from rvm.io.loader import load_image
+
+    try:
+        return load_image(path), None
+    except Exception as e:
+        return None, e
+
+
+def _prefetch(paths: Iterable[str], ahead: int = 1) -> Iterator[Tuple[Any, Optional[Exception]]]:
+    """
+    Yield _read(path) for each path, decoding on a helper thread.
+
+    At most `ahead` reads are in flight or waiting beyond the image being
+    processed, so memory holds a couple of decoded images, not a whole chunk.
+    """
+    paths = iter(paths)
+    with ThreadPoolExecutor(max_workers=1) as pool:
+        pending = deque(pool.submit(_read, path) for _, path in zip(range(ahead), paths))
+        while pending:
+            result = pending.popleft().result()
+            for path in paths:
+                pending.append(pool.submit(_read, path))
+                break
+            yield result
+
+
+def _process_chunk(paths: List[str]) -> Tuple[List[Dict[str, Any]], Dict[str, int]]:
+    """
+    Process a chunk of images in a worker, decoding ahead on a helper thread.
+
+    Returns the records and the result-cache hits/misses of this chunk.
+    """
+    task = _WORKER["task"]
+    cache = open_cache(_WORKER["task_options"].get("cache"))
+    before = cache.stats() if cache else {}
+    records = []
+    for path, (img, error) in zip(paths, _prefetch(paths)):
+        if error is not None:
+            records.append({"image_path": path, "error": str(error)})
+            continue
+        try:
+            annotated, results = _run_task(task, img, path, _WORKER["task_options"])
+        except Exception as e:
+            records.append({"image_path": path, "error": f"{type(e).__name__}: {e}"})
+            continue
+        if _WORKER["save_images"]:
+            digest = hashlib.md5(path.encode()).hexdigest()[:8]
+            save_image(annotated, os.path.join(_WORKER["out_dir"], "images"),
+                       f"{Path(path).stem}_{digest}.jpg")
+        records.append({"image_path": path, "results": results})
+    stats = {k: v - before[k] for k, v in cache.stats().items()} if cache else {}
+    return records, stats
+
+
+def _options_digest(task: str, task_options: Dict[str, Any]) -> str:
+    """Digest of everything that changes the results (the result cache location does not)."""
+    options = {k: v for k, v in task_options.items() if k != "cache"}
+    blob = json.dumps([task, options], sort_keys=True, default=str)
+    return hashlib.sha1(blob.encode()).hexdigest()[:16]
+
+
+def _load_done(results_path: Path, digest: str) -> Optional[set]:
+    """
+    Return images finished by a previous run with the same options, dropping a
+    half-written last line. None means there is nothing to resume from.
+    """
+    if not results_path.exists():
+        return None
+    data = results_path.read_bytes()
+    if data and not data.endswith(b"\n"):
+        with open(results_path, "r+b") as f:
+            f.truncate(data.rfind(b"\n") + 1)
+    records = list(read_jsonl(results_path))
+    if not records:
+        return None
+    if records[0].get("options_digest") != digest:
+        print(f"[WARN] {results_path} was written with different task options; starting over")
+        return None
+    return {r["image_path"] for r in records[1:] if "error" not in r}
+
+
+def run_batch(
+    task: str,
+    source: Source,
+    out_dir: str = "results",
+    workers: Optional[int] = None,
+    chunk_size: int = 16,
+    save_images: bool = False,
+    resume: bool = True,
+    **task_options: Any,
+) -> List[Dict[str, Any]]:
+    """
+    Run one task over an image collection using a pool of worker processes.
+
+    Args:
+        task (str): "detect", "segment" or "markers".
+        source: Directory, glob pattern, .txt file list, or list of image paths.
+        out_dir (str): Directory for the merged results (and annotated images).
+        workers (int): Number of worker processes (default: CPU count). 1 runs in-process.
+        chunk_size (int): Images handed to a worker at a time.
+        save_images (bool): Also write annotated images to `out_dir/images/`.
+        resume (bool): Skip images already recorded in `<task>_batch.jsonl`.
+        **task_options: Forwarded to the per-image task (e.g. model="yolov8s.pt",
+            backend="onnx" for detect, cache="~/.cache/rvm/results" for any task).
+
+    Returns:
+        list of dict: One {"image_path", "results"} (or {"image_path", "error"}) record
+        per image, in input order.
+    """
+    if task not in TASKS:
+        raise ValueError(f"Unknown task {task!r}, expected one of {TASKS}")
+    if chunk_size < 1:
+        raise ValueError(f"chunk_size must be >= 1, got {chunk_size}")
+
+    paths = resolve_images(source)
+    out_dir = Path(out_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    results_path = out_dir / f"{task}_batch.jsonl"
+
+    digest = _options_digest(task, task_options)
+    done = _load_done(results_path, digest) if resume else None
+    todo = [p for p in paths if p not in (done or ())]
+
+    workers = max(1, workers or os.cpu_count() or 1)
+    # Small collections get smaller chunks so every worker has something to do.
+    chunk_size = max(1, min(chunk_size, -(-len(todo) // workers)))
+    chunks = [todo[i:i + chunk_size] for i in range(0, len(todo), chunk_size)]
+    workers = min(workers, max(1, len(chunks)))
+    threads = max(1, (os.cpu_count() or 1) // workers)
+    init_args = (task, task_options, str(out_dir), save_images, threads)
+
+    if todo:
+        print(f"[INFO] {task}: {len(todo)} images to process "
+              f"({len(paths) - len(todo)} already done), {workers} worker(s)")
+    cache_stats = Counter()
+    with JsonlWriter(results_path, append=done is not None) as sink:
+        if done is None:
+            sink.write({"options_digest": digest})
+        if workers == 1:
+            _init_worker(*init_args)
+            for chunk in chunks:
+                records, stats = _process_chunk(chunk)
+                cache_stats.update(stats)
+                for record in records:
+                    sink.write(record)
+        else:
+            # "spawn" keeps torch/OpenCV thread pools out of forked children.
+            ctx = mp.get_context("spawn")
+            with ProcessPoolExecutor(max_workers=workers, mp_context=ctx,
+                                     initializer=_init_worker, initargs=init_args) as pool:
+                futures = [pool.submit(_process_chunk, chunk) for chunk in chunks]
+                for future in as_completed(futures):
+                    records, stats = future.result()
+                    cache_stats.update(stats)
+                    for record in records:
+                        sink.write(record)
+    if cache_stats:
+        print(f"[INFO] Result cache: {cache_stats['hits']} hits, {cache_stats['misses']} misses")
+
+    # Merge: last record per image wins (a retried error is replaced by its result).
+    latest = {r["image_path"]: r for r in read_jsonl(results_path) if "image_path" in r}
+    merged = [latest[p] for p in paths if p in latest]
+    save_json(merged, out_dir / f"{task}_batch.json")
+    return merged
@@ -0,0 +1,364 @@
+# rvm/bench.py
+"""
+Per-stage latency and throughput benchmarks.
+
+run_benchmark(stages) times each stage (decode, encode, draw, json, aruco,
+barcode, detect, segment) on synthetic frames of the given resolutions, or on
+the images/video of a `source`, and reports per case:
+
+- p50/p95/p99 and mean latency of one call (one batch of frames),
+- throughput in frames per second,
+- peak RSS of the process running the case.
+
+Every case (stage, resolution, batch size) runs in its own spawned process by
+default: the peak RSS of a process never goes down, so sharing one would make
+each case report the high-water mark of the cases before it. With
+isolate=False the peak RSS is that cumulative process value, which the JSON
+records as meta["rss_scope"] == "process". Only "detect" is run per batch
+size; the other stages process one frame per call.
+
+Results are plain JSON ({"meta": ..., "results": [...]}); compare() matches
+cases of two runs and flags regressions beyond a relative tolerance.
+"""
+
+import json
+import multiprocessing as mp
+import os
+import platform
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+STAGES = ("decode", "encode", "draw", "json", "aruco", "barcode", "detect", "segment")
+BATCHED_STAGES = ("detect",)
+# Metrics checked by compare(); for fps lower is worse, for the others higher.
+COMPARED = ("p50_ms", "p95_ms", "fps", "peak_rss_mb")
+
+
+def parse_resolution(value: str) -> Tuple[int, int]:
+    """'1280x720' -> (1280, 720)."""
+    try:
+        w, h = (int(v) for v in value.lower().split("x"))
+    except ValueError:
+        raise ValueError(f"Resolution must look like 1280x720, got {value!r}") from None
+    return w, h
+
+
+def synthetic_frame(width: int, height: int, seed: int = 0) -> np.ndarray:
+    """
+    Textured BGR frame with one ArUco marker and one QR code, so the marker
+    and code stages have something to find.
+    """
+    import cv2
+
+    rng = np.random.default_rng(seed)
+    ramp = np.linspace(40, 200, width, dtype=np.float32)[None, :].repeat(height, axis=0)
+    noise = rng.normal(0, 12, (height, width)).astype(np.float32)
+    frame = cv2.cvtColor(np.clip(ramp + noise, 0, 255).astype(np.uint8), cv2.COLOR_GRAY2BGR)
+
+    side = max(24, min(width, height) // 3)
+    marker = cv2.aruco.generateImageMarker(
+        cv2.aruco.getPredefinedDictionary(cv2.aruco.DICT_6X6_250), 7, side)
+    qr = cv2.resize(cv2.QRCodeEncoder.create().encode("rvm-bench"), (side, side),
+                    interpolation=cv2.INTER_NEAREST)
+    quiet = side // 4   # white margin the detectors need around a code
+    for (x, y), tile in (((2 * quiet, 2 * quiet), marker),
+                         ((width - side - 2 * quiet, height - side - 2 * quiet), qr)):
+        if x >= quiet and y >= quiet:
+            frame[y - quiet:y + side + quiet, x - quiet:x + side + quiet] = 255
+            frame[y:y + side, x:x + side] = cv2.cvtColor(tile, cv2.COLOR_GRAY2BGR)
+    return frame
+
+
+def _load_frames(source: str, max_frames: int) -> List[np.ndarray]:
+    """Frames of an image collection or a video file."""
+    import cv2
+
+    from rvm.io.loader import load_image
+    from rvm.io.sources import IMAGE_EXTENSIONS, is_image_collection, resolve_images
+
+    if is_image_collection(source):
+        return [load_image(p) for p in resolve_images(source)[:max_frames]]
+    if source.lower().endswith(IMAGE_EXTENSIONS):
+        return [load_image(source)]
+    cap = cv2.VideoCapture(source)
+    frames = []
+    while len(frames) < max_frames:
+        ok, frame = cap.read()
+        if not ok:
+            break
+        frames.append(frame)
+    cap.release()
+    if not frames:
+        raise ValueError(f"No frames could be read from {source!r}")
+    return frames
+
+
+def _peak_rss_mb() -> Optional[float]:
+    """Peak resident set size of this process in MB (None where unsupported)."""
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Kilobytes on Linux, bytes on macOS.
+    return round(peak / (1024 * 1024 if platform.system() == "Darwin" else 1024), 1)
+
+
+def _stage(stage: str, frames: List[np.ndarray], options: Dict[str, Any]) -> Tuple[Callable, list]:
+    """Return (call, inputs): call(batch of inputs) is what gets timed."""
+    import cv2
+
+    if stage == "decode":
+        return (lambda batch: [cv2.imdecode(b, cv2.IMREAD_COLOR) for b in batch],
+                [cv2.imencode(".jpg", f)[1] for f in frames])
+    if stage == "encode":
+        return lambda batch: [cv2.imencode(".jpg", f) for f in batch], frames
+    if stage == "draw":
+        from rvm.core.types import Detections
+        from rvm.core.visualize import annotate
+
+        rng = np.random.default_rng(0)
+        h, w = frames[0].shape[:2]
+        xy = rng.uniform(0, [w, h], (50, 2))
+        boxes = Detections(np.concatenate([xy, xy + rng.uniform(10, 120, (50, 2))], axis=1),
+                           rng.random(50), rng.integers(0, 80, 50))
+        return lambda batch: [annotate(f, boxes=boxes) for f in batch], frames
+    if stage == "json":
+        from rvm.io.writer import JsonlWriter
+
+        rng = np.random.default_rng(0)
+        record = {"frame": 0, "detections": [
+            {"x1": int(x), "y1": int(y), "x2": int(x) + 40, "y2": int(y) + 60,
+             "confidence": round(float(c), 4), "class_id": int(k)}
+            for x, y, c, k in zip(rng.integers(0, 600, 100), rng.integers(0, 400, 100),
+                                  rng.random(100), rng.integers(0, 80, 100))]}
+        # Serialization and write calls only; the disk is not part of the stage.
+        sink = JsonlWriter(os.devnull)
+
+        def write(batch):
+            for _ in batch:
+                sink.write(record)
+        return write, frames
+    if stage == "aruco":
+        from rvm.core.registry import get_aruco_detector
+
+        detector = get_aruco_detector()
+        return lambda batch: [detector.detect(f) for f in batch], frames
+    if stage == "barcode":
+        from rvm.core.registry import get_barcode_detector
+
+        detector = get_barcode_detector(localize=options.get("localize", False))
+        return lambda batch: [detector.detect(f) for f in batch], frames
+    if stage == "detect":
+        from rvm.core.registry import get_detector
+
+        detector = get_detector(options.get("model", "yolov8n.pt"),
+                                backend=options.get("backend", "torch"))
+        return lambda batch: detector.detect_batch(batch, len(batch)), frames
+    if stage == "segment":
+        from rvm.core.registry import get_segmenter
+
+        segmenter = get_segmenter(options.get("seg_model", "FastSAM-s.pt"))
+        return lambda batch: [segmenter.segment(f) for f in batch], frames
+    raise ValueError(f"Unknown stage {stage!r}, expected one of {STAGES}")
+
+
+def summarize_latencies(latencies_s: Sequence[float], frames: int) -> Dict[str, float]:
+    """Latency percentiles (ms) and throughput of timed calls processing `frames` frames."""
+    ms = np.asarray(latencies_s, np.float64) * 1000
+    total = float(ms.sum()) / 1000
+    p50, p95, p99 = np.percentile(ms, [50, 95, 99])
+    return {"p50_ms": round(float(p50), 3), "p95_ms": round(float(p95), 3),
+            "p99_ms": round(float(p99), 3), "mean_ms": round(float(ms.mean()), 3),
+            "fps": round(frames / total, 2) if total > 0 else 0.0}
+
+
+def _run_stage(stage: str, workload: Dict[str, Any], batch_sizes: Sequence[int],
+               iterations: int, warmup: int, options: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """Time every (resolution, batch size) case of one stage."""
+    try:
+        if workload.get("source"):
+            groups = [("source", _load_frames(workload["source"], workload.get("max_frames", 64)))]
+        else:
+            groups = [(f"{w}x{h}", [synthetic_frame(w, h, seed) for seed in range(4)])
+                      for w, h in workload["resolutions"]]
+    except Exception as e:
+        return [{"stage": stage, "workload": "source" if workload.get("source") else "synthetic",
+                 "resolution": "source" if workload.get("source") else "synthetic",
+                 "error": f"{type(e).__name__}: {e}"}]
+
+    results = []
+    for resolution, frames in groups:
+        base = {"stage": stage, "workload": "source" if workload.get("source") else "synthetic",
+                "resolution": resolution}
+        try:
+            call, inputs = _stage(stage, frames, options)
+        except Exception as e:
+            results.append({**base, "error": f"{type(e).__name__}: {e}"})
+            continue
+        for batch_size in (batch_sizes if stage in BATCHED_STAGES else (1,)):
+            case = {**base, "batch_size": batch_size}
+            latencies = []
+            try:
+                for i in range(warmup + iterations):
+                    start = i * batch_size
+                    batch = [inputs[(start + k) % len(inputs)] for k in range(batch_size)]
+                    t0 = time.perf_counter()
+                    call(batch)
+                    if i >= warmup:
+                        latencies.append(time.perf_counter() - t0)
+            except Exception as e:
+                results.append({**case, "error": f"{type(e).__name__}: {e}"})
+                continue
+            results.append({**case, "iterations": iterations,
+                            **summarize_latencies(latencies, iterations * batch_size),
+                            "peak_rss_mb": _peak_rss_mb()})
+    return results
+
+
+def _run_isolated(stage: str, workload: Dict[str, Any], batch_sizes: Sequence[int],
+                  iterations: int, warmup: int, options: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """Run every case of one stage in its own spawned process, one after the other."""
+    kind = "source" if workload.get("source") else "synthetic"
+    resolutions = [None] if workload.get("source") else workload["resolutions"]
+    results = []
+    # A fresh process per case: peak RSS only ever grows within a process.
+    with ProcessPoolExecutor(max_workers=1, mp_context=mp.get_context("spawn"),
+                             max_tasks_per_child=1) as pool:
+        for res in resolutions:
+            for batch_size in (batch_sizes if stage in BATCHED_STAGES else (1,)):
+                future = pool.submit(_run_stage, stage, dict(workload, resolutions=[res]),
+                                     (batch_size,), iterations, warmup, options)
+                try:
+                    case_results = future.result()
+                except Exception as e:
+                    case_results = [{"stage": stage, "workload": kind,
+                                     "resolution": f"{res[0]}x{res[1]}" if res else "source",
+                                     "batch_size": batch_size,
+                                     "error": f"{type(e).__name__}: {e}"}]
+                results.extend(case_results)
+                # The stage could not be set up (no frames, no model): other batch
+                # sizes would fail the same way.
+                if any("error" in r and "batch_size" not in r for r in case_results):
+                    break
+    return results
+
+
+def run_benchmark(
+    stages: Sequence[str] = STAGES,
+    resolutions: Sequence[Tuple[int, int]] = ((640, 480), (1280, 720)),
+    batch_sizes: Sequence[int] = (1, 4),
+    iterations: int = 30,
+    warmup: int = 3,
+    source: Optional[str] = None,
+    max_frames: int = 64,
+    isolate: bool = True,
+    **options: Any,
+) -> Dict[str, Any]:
+    """
+    Benchmark pipeline stages.
+
+    Args:
+        stages: Stages to run, from STAGES.
+        resolutions: (width, height) of the synthetic frames (ignored with `source`).
+        batch_sizes: Frames per call for the batched stages (detect).
+        iterations: Timed calls per case.
+        warmup: Untimed calls before timing (model load, lazy setup).
+        source: Image directory/glob/.txt list, image or video file to use instead
+            of synthetic frames.
+        max_frames: Frames read from `source`.
+        isolate: Run each case in a fresh process, so peak RSS is per case. Without
+            it every case runs in this process and reports its cumulative peak.
+        **options: Stage settings: model, backend (detect), seg_model (segment),
+            localize (barcode).
+
+    Returns:
+        dict: {"meta": run information, "results": one dict per case (or an
+        {"stage", ..., "error"} entry for a stage that could not run)}.
+    """
+    unknown = [s for s in stages if s not in STAGES]
+    if unknown:
+        raise ValueError(f"Unknown stages {unknown}, expected any of {STAGES}")
+    if iterations < 1 or any(b < 1 for b in batch_sizes):
+        raise ValueError("iterations and batch sizes must be >= 1")
+    import cv2
+
+    workload = {"source": source, "max_frames": max_frames,
+                "resolutions": [tuple(r) for r in resolutions]}
+    results = []
+    for stage in stages:
+        if isolate:
+            stage_results = _run_isolated(stage, workload, batch_sizes, iterations, warmup, options)
+        else:
+            stage_results = _run_stage(stage, workload, tuple(batch_sizes), iterations, warmup,
+                                       options)
+        for r in stage_results:
+            if "error" in r:
+                print(f"[WARN] {stage} ({r['resolution']}) failed: {r['error']}")
+            else:
+                print(f"[INFO] {stage:>8} {r['resolution']:>10} batch {r['batch_size']:>2}: "
+                      f"p50 {r['p50_ms']:.2f} ms, p95 {r['p95_ms']:.2f} ms, "
+                      f"{r['fps']:.1f} fps, peak RSS {r['peak_rss_mb']} MB")
+        results.extend(stage_results)
+
+    meta = {"created": time.strftime("%Y-%m-%dT%H:%M:%S%z"), "python": platform.python_version(),
+            "platform": platform.platform(), "cpu_count": os.cpu_count(),
+            "numpy": np.__version__, "opencv": cv2.__version__, "iterations": iterations,
+            "warmup": warmup, "isolated": isolate,
+            "rss_scope": "case" if isolate else "process", "options": options}
+    return {"meta": meta, "results": results}
+
+
+def _case_key(result: Dict[str, Any]) -> Tuple:
+    return result["stage"], result["workload"], result["resolution"], result.get("batch_size")
+
+
+def compare(current: Dict[str, Any], baseline: Dict[str, Any],
+            tolerance: float = 0.10) -> List[Dict[str, Any]]:
+    """
+    Compare two benchmark runs case by case.
+
+    Args:
+        current: Output of run_benchmark (or the loaded JSON).
+        baseline: Saved earlier run.
+        tolerance: Allowed relative change before a metric counts as a regression
+            (latency or memory up, fps down).
+
+    Returns:
+        list of dict: One row per case and metric in COMPARED, with the baseline
+        and current values, the relative change and a "regression" flag. Cases
+        missing from either run are skipped, and so is peak RSS unless both runs
+        measured it per case (isolated).
+    """
+    base = {_case_key(r): r for r in baseline["results"] if "error" not in r}
+    per_case = all(run.get("meta", {}).get("rss_scope") == "case" for run in (current, baseline))
+    metrics = [m for m in COMPARED if per_case or m != "peak_rss_mb"]
+    rows = []
+    for r in current["results"]:
+        ref = base.get(_case_key(r)) if "error" not in r else None
+        if ref is None:
+            continue
+        for metric in metrics:
+            old, new = ref.get(metric), r.get(metric)
+            if not old or new is None:
+                continue
+            change = (new - old) / old
+            worse = -change if metric == "fps" else change
+            rows.append({"stage": r["stage"], "workload": r["workload"],
+                         "resolution": r["resolution"], "batch_size": r["batch_size"],
+                         "metric": metric, "baseline": old, "current": new,
+                         "change": round(change, 4), "regression": worse > tolerance})
+    return rows
+
+
+def save_results(results: Dict[str, Any], path: str) -> None:
+    with open(path, "w") as f:
+        json.dump(results, f, indent=2)
+
+
+def load_results(path: str) -> Dict[str, Any]:
+    with open(path, "r") as f:
+        return json.load(f)
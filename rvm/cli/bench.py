@@ -0,0 +1,57 @@
+# rvm/cli/bench.py
+import argparse
+import sys
+from rvm.bench import STAGES, compare, load_results, parse_resolution, run_benchmark, save_results
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark per-stage latency, throughput and memory")
+    parser.add_argument("--stages", nargs="+", choices=STAGES, default=list(STAGES), help="Stages to run")
+    parser.add_argument("--resolutions", nargs="+", default=["640x480", "1280x720"],
+                        help="Synthetic frame sizes (WIDTHxHEIGHT)")
+    parser.add_argument("--batch-sizes", type=int, nargs="+", default=[1, 4],
+                        help="Frames per call for the detector")
+    parser.add_argument("--iterations", type=int, default=30, help="Timed calls per case")
+    parser.add_argument("--warmup", type=int, default=3, help="Untimed calls before timing")
+    parser.add_argument("--source", default=None,
+                        help="Image, video or image directory/glob/.txt list to use instead of synthetic frames")
+    parser.add_argument("--max-frames", type=int, default=64, help="Frames read from --source")
+    parser.add_argument("--model", default="yolov8n.pt", help="YOLO model weights")
+    parser.add_argument("--backend", choices=["torch", "onnx"], default="torch", help="Detector backend")
+    parser.add_argument("--seg-model", default="FastSAM-s.pt", help="Segmentation model weights")
+    parser.add_argument("--no-isolate", action="store_true",
+                        help="Run all cases in this process (peak RSS is then cumulative and not compared)")
+    parser.add_argument("--out", default="bench.json", help="Where to write the results JSON")
+    parser.add_argument("--baseline", default=None, help="Earlier results JSON to compare against")
+    parser.add_argument("--compare", default=None, metavar="RESULTS",
+                        help="Compare this results JSON with --baseline without running anything")
+    parser.add_argument("--tolerance", type=float, default=0.10,
+                        help="Relative change counted as a regression (0.10 = 10%%)")
+    args = parser.parse_args()
+
+    if args.compare:
+        if not args.baseline:
+            parser.error("--compare needs --baseline")
+        results = load_results(args.compare)
+    else:
+        results = run_benchmark(args.stages, [parse_resolution(r) for r in args.resolutions],
+                                args.batch_sizes, args.iterations, args.warmup, source=args.source,
+                                max_frames=args.max_frames, isolate=not args.no_isolate,
+                                model=args.model, backend=args.backend, seg_model=args.seg_model)
+        save_results(results, args.out)
+        print(f"[INFO] Results written to {args.out}")
+
+    if args.baseline:
+        rows = compare(results, load_results(args.baseline), args.tolerance)
+        regressions = [r for r in rows if r["regression"]]
+        for r in rows:
+            flag = "REGRESSION" if r["regression"] else "ok"
+            print(f"{r['stage']:>8} {r['resolution']:>10} batch {r['batch_size']:>2} "
+                  f"{r['metric']:>11}: {r['baseline']:>10} -> {r['current']:>10} "
+                  f"({r['change']:+.1%}) {flag}")
+        print(f"{len(regressions)} regression(s) in {len(rows)} compared metrics "
+              f"(tolerance {args.tolerance:.0%})")
+        if regressions:
+            sys.exit(1)
+
+if __name__ == "__main__":
+    main()
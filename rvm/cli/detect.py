@@ -1,14 +1,66 @@
 # rvm/cli/detect.py
 import argparse
 from rvm.api import detect
+from rvm.batch import run_batch
+from rvm.core.profiling import dir_profiler
+from rvm.io.sources import is_image_collection
 
 def main():
     parser = argparse.ArgumentParser(description="Run object detection")
-    parser.add_argument("--source", required=True, help="Path to image, video or webcam index", default="0")
+    parser.add_argument("--source", required=True, help="Path to image, video, webcam index, or image directory/glob/.txt list", default="0")
     parser.add_argument("--model", default="yolov8n.pt", help="YOLO model weights")
+    parser.add_argument("--backend", choices=["torch", "onnx"], default="torch",
+                        help="Inference backend (onnx exports the weights once and runs ONNX Runtime on CPU)")
     parser.add_argument("--out", default="results", help="Output directory")
+    parser.add_argument("--tile-size", type=int, default=None,
+                        help="Run sliced inference on tiles of this size (high-resolution images)")
+    parser.add_argument("--tile-overlap", type=float, default=0.2, help="Overlap fraction between tiles")
+    parser.add_argument("--tile-merge", choices=["nms", "fuse"], default="nms",
+                        help="How to merge detections across tile borders")
+    parser.add_argument("--no-full-pass", action="store_true",
+                        help="Skip the whole-image pass when tiling")
     parser.add_argument("--realtime", action="store_true", help="Enable real-time display for webcam")
+    parser.add_argument("--batch-size", type=int, default=1, help="Frames per inference batch for video sources")
+    parser.add_argument("--pipelined", action="store_true",
+                        help="Overlap video decode, inference, drawing and encoding on separate threads")
+    parser.add_argument("--keep-all-frames", action="store_true",
+                        help="Process every webcam frame instead of only the newest one")
+    parser.add_argument("--motion-threshold", type=float, default=None,
+                        help="Skip inference on video/webcam frames where less than this fraction "
+                             "of pixels changed (e.g. 0.01); previous detections are reused")
+    parser.add_argument("--motion-roi", type=int, nargs=4, default=None, metavar=("X1", "Y1", "X2", "Y2"),
+                        help="Region watched by the motion gate")
+    parser.add_argument("--track", action="store_true",
+                        help="Track objects across video/webcam frames (adds track_id to results)")
+    parser.add_argument("--detect-every", type=int, default=1,
+                        help="Run the detector every N frames and track in between (implies --track)")
+    parser.add_argument("--stream", action="store_true",
+                        help="Write one JSON Lines record per frame while running (video/webcam)")
+    parser.add_argument("--gzip", action="store_true", help="Gzip the streamed JSON Lines output")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="Worker processes for image collections (default: CPU count)")
+    parser.add_argument("--save-images", action="store_true",
+                        help="Save annotated images when processing an image collection")
+    parser.add_argument("--no-resume", action="store_true",
+                        help="Reprocess images already recorded by an interrupted batch run")
+    parser.add_argument("--cache", default=None, metavar="DIR",
+                        help="Result cache directory; unchanged images are not re-processed")
+    parser.add_argument("--profile", default=None, metavar="DIR",
+                        help="Write per-stage timings (profile.jsonl, Prometheus metrics.prom) to DIR")
+    parser.add_argument("--profile-frames", type=int, nargs=2, default=None, metavar=("START", "N"),
+                        help="Run cProfile for N frames from frame START (DIR/profile.pstats)")
+    parser.add_argument("--trace-memory", action="store_true",
+                        help="Also trace allocations during --profile-frames (DIR/tracemalloc.txt)")
     args = parser.parse_args()
+    detector_options = dict(backend=args.backend, tile_size=args.tile_size,
+                            tile_overlap=args.tile_overlap, tile_merge=args.tile_merge,
+                            tile_full_pass=not args.no_full_pass)
+
+    if is_image_collection(args.source):
+        run_batch("detect", args.source, args.out, workers=args.workers,
+                  save_images=args.save_images, resume=not args.no_resume,
+                  model=args.model, cache=args.cache, **detector_options)
+        return
 
     # Auto-enable realtime if source is webcam
     if args.source.isdigit():
@@ -16,7 +68,20 @@ def main():
     else:
         realtime = args.realtime
 
-    detect(args.source, args.model, args.out, realtime)
+    profiler = dir_profiler(args.profile, profile_frames=args.profile_frames,
+                            trace_memory=args.trace_memory) if args.profile else None
+    results = detect(args.source, args.model, args.out, realtime, batch_size=args.batch_size,
+                     pipelined=args.pipelined, drop_stale=not args.keep_all_frames,
+                     stream=args.stream, compress=args.gzip, lazy=True,
+                     motion_threshold=args.motion_threshold,
+                     motion_roi=tuple(args.motion_roi) if args.motion_roi else None,
+                     track=args.track, detect_every=args.detect_every, cache=args.cache,
+                     profile=profiler, **detector_options)
+    for _ in results:
+        pass
+    if profiler is not None:
+        profiler.close()
+        print(profiler.summary())
 
 if __name__ == "__main__":
     main()
@@ -1,15 +1,40 @@
 # rvm/cli/eval_coco.py
 import argparse
-from rvm.eval.coco_eval import evaluate_coco
+from eval.coco_eval import BACKENDS
 
 def main():
     parser = argparse.ArgumentParser(description="Evaluate COCO detections")
-    parser.add_argument("--images", required=True, help="Images directory (with preds.json inside)")
+    parser.add_argument("--images", required=True,
+                        help="Images directory (with preds.json inside unless --model is given)")
     parser.add_argument("--ann", required=True, help="Path to COCO annotations file")
     parser.add_argument("--out", default="reports", help="Output directory")
+    parser.add_argument("--model", default=None,
+                        help="Run these YOLO weights over the annotated images and evaluate "
+                             "the predictions directly (no preds.json needed)")
+    parser.add_argument("--backend", choices=BACKENDS, default=None,
+                        help="Evaluation backend (default: numpy with --model, pycocotools otherwise)")
+    parser.add_argument("--detector-backend", choices=["torch", "onnx"], default="torch",
+                        help="Inference backend with --model")
+    parser.add_argument("--batch-size", type=int, default=8, help="Images per inference batch")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="Worker processes for detection and matching (default: CPU count)")
+    parser.add_argument("--save-preds", action="store_true",
+                        help="Also write the predictions to <out>/preds.json")
     args = parser.parse_args()
 
-    metrics = evaluate_coco(f"{args.images}/preds.json", args.ann, args.out)
+    if args.model:
+        from rvm.api import evaluate_model
+
+        metrics = evaluate_model(args.ann, args.images, model=args.model, out_dir=args.out,
+                                 workers=args.workers, batch_size=args.batch_size,
+                                 eval_backend=args.backend or "numpy",
+                                 save_predictions=args.save_preds,
+                                 backend=args.detector_backend)
+    else:
+        from eval.coco_eval import evaluate_coco
+
+        metrics = evaluate_coco(f"{args.images}/preds.json", args.ann, args.out,
+                                backend=args.backend or "pycocotools", workers=args.workers)
     print("Evaluation finished:", metrics)
 
 if __name__ == "__main__":
@@ -1,14 +1,68 @@
 # rvm/cli/markers.py
 import argparse
 from rvm.api import detect_markers
+from rvm.batch import run_batch
+from rvm.core.profiling import dir_profiler
+from rvm.io.sources import is_image_collection
 
 def main():
     parser = argparse.ArgumentParser(description="Run marker/QR detection")
-    parser.add_argument("--source", required=True, help="Path to image")
+    parser.add_argument("--source", required=True, help="Path to image, video, webcam index, or image directory/glob/.txt list")
     parser.add_argument("--out", default="results", help="Output directory")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="Worker processes for image collections (default: CPU count)")
+    parser.add_argument("--save-images", action="store_true",
+                        help="Save annotated images when processing an image collection")
+    parser.add_argument("--no-resume", action="store_true",
+                        help="Reprocess images already recorded by an interrupted batch run")
+    parser.add_argument("--localize", action="store_true",
+                        help="Decode only candidate code regions found on a downscaled copy (large images)")
+    parser.add_argument("--cascade", action="store_true",
+                        help="Escalate preprocessing (equalize, CLAHE, binarize, upscale) only when codes are missing")
+    parser.add_argument("--expected", type=int, default=None,
+                        help="Number of QR/barcodes expected per image (cascade stops once reached)")
+    parser.add_argument("--cache", default=None, metavar="DIR",
+                        help="Result cache directory; unchanged images are not re-processed")
+    parser.add_argument("--realtime", action="store_true", help="Enable real-time display for webcam")
+    parser.add_argument("--keep-all-frames", action="store_true",
+                        help="Process every webcam frame instead of only the newest one")
+    parser.add_argument("--scan-every", type=int, default=5,
+                        help="Look for new codes every N video/webcam frames (tracked codes are not re-decoded)")
+    parser.add_argument("--min-confidence", type=float, default=0.6,
+                        help="Re-decode a tracked code when its tracking confidence drops below this")
+    parser.add_argument("--stream", action="store_true",
+                        help="Write one JSON Lines record per frame while running (video/webcam)")
+    parser.add_argument("--gzip", action="store_true", help="Gzip the streamed JSON Lines output")
+    parser.add_argument("--profile", default=None, metavar="DIR",
+                        help="Write per-stage timings (profile.jsonl, Prometheus metrics.prom) to DIR")
+    parser.add_argument("--profile-frames", type=int, nargs=2, default=None, metavar=("START", "N"),
+                        help="Run cProfile for N frames from frame START (DIR/profile.pstats)")
+    parser.add_argument("--trace-memory", action="store_true",
+                        help="Also trace allocations during --profile-frames (DIR/tracemalloc.txt)")
     args = parser.parse_args()
 
-    detect_markers(args.source, args.out)
+    if is_image_collection(args.source):
+        run_batch("markers", args.source, args.out, workers=args.workers,
+                  save_images=args.save_images, resume=not args.no_resume, cache=args.cache,
+                  localize=args.localize, cascade=args.cascade, expected_codes=args.expected)
+        return
+
+    profiler = dir_profiler(args.profile, profile_frames=args.profile_frames,
+                            trace_memory=args.trace_memory) if args.profile else None
+    if args.source.isdigit() or args.source.lower().endswith((".mp4", ".mov", ".avi")):
+        records = detect_markers(args.source, args.out, localize=args.localize,
+                                 realtime=args.realtime or args.source.isdigit(),
+                                 drop_stale=not args.keep_all_frames, stream=args.stream,
+                                 compress=args.gzip, lazy=True, scan_every=args.scan_every,
+                                 min_confidence=args.min_confidence, profile=profiler)
+        for _ in records:
+            pass
+    else:
+        detect_markers(args.source, args.out, cache=args.cache, localize=args.localize,
+                       cascade=args.cascade, expected_codes=args.expected, profile=profiler)
+    if profiler is not None:
+        profiler.close()
+        print(profiler.summary())
 
 if __name__ == "__main__":
     main()
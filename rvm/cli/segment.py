@@ -1,14 +1,38 @@
 # rvm/cli/segment.py
 import argparse
-from rvm.api import segment_image
+from rvm.api import segment_image, segment_objects
+from rvm.batch import run_batch
+from rvm.io.sources import is_image_collection
 
 def main():
     parser = argparse.ArgumentParser(description="Run image segmentation")
-    parser.add_argument("--source", required=True, help="Path to image")
+    parser.add_argument("--source", required=True, help="Path to image, or image directory/glob/.txt list")
     parser.add_argument("--out", default="results", help="Output directory")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="Worker processes for image collections (default: CPU count)")
+    parser.add_argument("--save-images", action="store_true",
+                        help="Save annotated images when processing an image collection")
+    parser.add_argument("--no-resume", action="store_true",
+                        help="Reprocess images already recorded by an interrupted batch run")
+    parser.add_argument("--mask-format", choices=["polygon", "rle"], default="polygon",
+                        help="Mask encoding in the results (rle: compact COCO run-length encoding)")
+    parser.add_argument("--boxes-from", default=None, metavar="YOLO_WEIGHTS",
+                        help="Detect objects with this YOLO model and return one mask per detection")
+    parser.add_argument("--cache", default=None, metavar="DIR",
+                        help="Result cache directory; unchanged images are not re-processed")
     args = parser.parse_args()
 
-    segment_image(args.source, args.out)
+    if is_image_collection(args.source):
+        run_batch("segment", args.source, args.out, workers=args.workers,
+                  save_images=args.save_images, resume=not args.no_resume, cache=args.cache,
+                  mask_format=args.mask_format)
+        return
+
+    if args.boxes_from:
+        segment_objects(args.source, args.boxes_from, args.out, mask_format=args.mask_format)
+        return
+
+    segment_image(args.source, args.out, cache=args.cache, mask_format=args.mask_format)
 
 if __name__ == "__main__":
     main()
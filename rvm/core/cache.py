@@ -0,0 +1,146 @@
+# rvm/core/cache.py
+"""
+Content-addressed on-disk cache for per-image results.
+
+Entries are keyed by (image content hash, task, model weights hash, parameters)
+and stored as small JSON files under `<root>/<key[:2]>/<key>.json`. Writes go
+to a temporary file that is atomically renamed into place, so several
+processes can share one cache directory. Reads refresh the file mtime, and
+once the directory grows beyond `max_bytes` the least recently used entries
+are deleted.
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+from pathlib import Path
+from typing import Any, Dict, Optional, Union
+
+from rvm.core.hashing import file_digest
+
+
+def weights_digest(model: str) -> str:
+    """Content hash of a weights file, or the name itself for aliases (e.g. "yolov8n.pt")."""
+    return file_digest(model) if Path(model).is_file() else str(model)
+
+
+class ResultCache:
+    """Size-bounded, process-safe result cache with hit/miss statistics."""
+
+    def __init__(self, root: Union[str, Path] = "~/.cache/rvm/results", max_bytes: int = 1 << 30):
+        """
+        Args:
+            root: Cache directory (created on first write).
+            max_bytes: Size bound; least recently used entries are evicted beyond it.
+        """
+        self.root = Path(root).expanduser()
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._approx_bytes: Optional[int] = None
+
+    @staticmethod
+    def key(image_digest: str, task: str, model_digest: str, params: Dict[str, Any]) -> str:
+        """Build the cache key for one (image, task, model, parameters) combination."""
+        payload = json.dumps([image_digest, task, model_digest, params], sort_keys=True, default=str)
+        return hashlib.sha256(payload.encode()).hexdigest()
+
+    def _path(self, key: str) -> Path:
+        return self.root / key[:2] / f"{key}.json"
+
+    def get(self, key: str) -> Optional[Any]:
+        """Return the cached value for `key`, or None on a miss."""
+        path = self._path(key)
+        try:
+            with open(path, "r") as f:
+                value = json.load(f)
+            os.utime(path)  # mark as recently used
+        except (OSError, ValueError):
+            # Missing, evicted concurrently, or unreadable: treat as a miss.
+            self.misses += 1
+            return None
+        self.hits += 1
+        return value
+
+    def put(self, key: str, value: Any) -> None:
+        """Store a JSON-serializable value under `key` (atomic replace)."""
+        path = self._path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        data = json.dumps(value, separators=(",", ":")).encode()
+        fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=".tmp-", suffix=".json")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.replace(tmp, path)
+        except BaseException:
+            if os.path.exists(tmp):
+                os.unlink(tmp)
+            raise
+
+        if self._approx_bytes is None:
+            self._approx_bytes = self.size_bytes()
+        else:
+            self._approx_bytes += len(data)
+        if self._approx_bytes > self.max_bytes:
+            self.evict()
+
+    def _entries(self):
+        for path in self.root.glob("*/*.json"):
+            try:
+                st = path.stat()
+            except OSError:
+                continue
+            yield st.st_mtime_ns, st.st_size, path
+
+    def size_bytes(self) -> int:
+        """Total size of the cached entries on disk."""
+        return sum(size for _, size, _ in self._entries())
+
+    def evict(self, target_bytes: Optional[int] = None) -> int:
+        """
+        Delete least recently used entries until the cache fits in `target_bytes`
+        (default: 90% of max_bytes). Returns the number of removed entries.
+        """
+        if target_bytes is None:
+            target_bytes = int(self.max_bytes * 0.9)
+        entries = sorted(self._entries())
+        total = sum(size for _, size, _ in entries)
+        removed = 0
+        for _, size, path in entries:
+            if total <= target_bytes:
+                break
+            try:
+                path.unlink()
+                removed += 1
+            except OSError:
+                pass  # already removed by another process
+            total -= size
+        self.evictions += removed
+        self._approx_bytes = total
+        return removed
+
+    def clear(self) -> None:
+        self.evict(target_bytes=0)
+
+    def stats(self) -> Dict[str, int]:
+        return {"hits": self.hits, "misses": self.misses, "evictions": self.evictions}
+
+    def summary(self) -> str:
+        lookups = self.hits + self.misses
+        rate = 100.0 * self.hits / lookups if lookups else 0.0
+        return f"{self.hits} hits, {self.misses} misses ({rate:.0f}% hit rate)"
+
+
+_CACHES: Dict[str, ResultCache] = {}
+
+
+def open_cache(cache: Union[None, str, Path, ResultCache]) -> Optional[ResultCache]:
+    """Resolve a cache argument (None, directory or ResultCache), one instance per directory."""
+    if cache is None or isinstance(cache, ResultCache):
+        return cache
+    root = str(Path(cache).expanduser().resolve())
+    if root not in _CACHES:
+        _CACHES[root] = ResultCache(root)
+    return _CACHES[root]
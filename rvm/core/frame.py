@@ -0,0 +1,71 @@
+# rvm/core/frame.py
+"""
+Per-frame cache of derived image views.
+
+Several detectors look at the same frame (ArUco, QR/barcodes, ...), and each
+used to convert it to grayscale on its own. A FrameContext wraps one BGR
+frame and computes derived views (gray, RGB, equalized, pyramid levels) on
+first access, so every detector that receives the same context shares them.
+"""
+
+from typing import Dict, Union
+
+import cv2
+import numpy as np
+
+
+class FrameContext:
+    """Lazily computed, memoized views of one BGR frame."""
+
+    __slots__ = ("image", "_views")
+
+    def __init__(self, image: np.ndarray):
+        """
+        Args:
+            image (np.ndarray): BGR (or already grayscale) frame. Views assume it is
+                not modified while the context is in use.
+        """
+        if not isinstance(image, np.ndarray):
+            raise ValueError("image must be a numpy array (H,W,3)")
+        self.image = image
+        self._views: Dict[str, np.ndarray] = {}
+
+    @classmethod
+    def of(cls, image: Union[np.ndarray, "FrameContext"]) -> "FrameContext":
+        """Return `image` if it already is a FrameContext, else wrap it."""
+        return image if isinstance(image, FrameContext) else cls(image)
+
+    @property
+    def shape(self):
+        return self.image.shape
+
+    @property
+    def gray(self) -> np.ndarray:
+        """Single-channel view (direct BGR -> GRAY conversion)."""
+        if "gray" not in self._views:
+            img = self.image
+            self._views["gray"] = img if img.ndim == 2 else cv2.cvtColor(img, cv2.COLOR_BGR2GRAY)
+        return self._views["gray"]
+
+    @property
+    def rgb(self) -> np.ndarray:
+        if "rgb" not in self._views:
+            img = self.image
+            self._views["rgb"] = cv2.cvtColor(img, cv2.COLOR_GRAY2RGB if img.ndim == 2 else cv2.COLOR_BGR2RGB)
+        return self._views["rgb"]
+
+    @property
+    def equalized(self) -> np.ndarray:
+        """Histogram-equalized gray view."""
+        if "equalized" not in self._views:
+            self._views["equalized"] = cv2.equalizeHist(self.gray)
+        return self._views["equalized"]
+
+    def pyramid(self, level: int) -> np.ndarray:
+        """Gray view downscaled `level` times by 2 (level 0 is the gray view itself)."""
+        if level < 0:
+            raise ValueError(f"level must be >= 0, got {level}")
+        key = f"pyramid{level}"
+        if key not in self._views:
+            self._views[key] = self.gray if level == 0 else cv2.pyrDown(self.pyramid(level - 1))
+        return self._views[key]
@@ -0,0 +1,29 @@
+# rvm/core/hashing.py
+"""
+Content hashing helpers used to key on-disk caches (exported models, results).
+"""
+
+import hashlib
+import os
+from functools import lru_cache
+
+
+@lru_cache(maxsize=256)
+def _file_digest(path: str, size: int, mtime_ns: int, algorithm: str) -> str:
+    h = hashlib.new(algorithm)
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def file_digest(path, algorithm: str = "sha256") -> str:
+    """
+    Hex digest of a file's content.
+
+    Results are memoized per (path, size, mtime), so repeated lookups of large
+    weight files do not re-read them.
+    """
+    path = os.path.abspath(str(path))
+    st = os.stat(path)
+    return _file_digest(path, st.st_size, st.st_mtime_ns, algorithm)
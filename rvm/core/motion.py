@@ -0,0 +1,88 @@
+# rvm/core/motion.py
+"""
+Cheap motion gate for fixed cameras.
+
+MotionGate compares a downscaled, blurred grayscale copy of each frame (or of a
+region of interest) with the last frame that was sent to the detector. When
+the fraction of changed pixels stays below `threshold`, the caller can reuse
+the previous detections instead of running the model. The reference is only
+replaced when inference runs, so slow changes still accumulate and trigger it.
+"""
+
+from typing import Optional, Tuple
+
+import cv2
+import numpy as np
+
+
+class MotionGate:
+    """Frame-differencing gate deciding when a frame needs fresh inference."""
+
+    def __init__(self, threshold: float = 0.01, pixel_delta: int = 25, width: int = 160,
+                 roi: Optional[Tuple[int, int, int, int]] = None, max_skip: Optional[int] = None):
+        """
+        Args:
+            threshold: Fraction of (ROI) pixels that must change to count as motion.
+            pixel_delta: Minimum gray-level difference for a pixel to count as changed.
+            width: Width the frame (or ROI) is downscaled to before differencing.
+            roi: Optional (x1, y1, x2, y2) region, in frame pixels, to watch.
+            max_skip: Force inference after this many consecutive skipped frames.
+        """
+        self.threshold = threshold
+        self.pixel_delta = pixel_delta
+        self.width = width
+        self.roi = roi
+        self.max_skip = max_skip
+        self.checked = 0
+        self.skipped = 0
+        self.last_score = 1.0
+        self._reference: Optional[np.ndarray] = None
+        self._run = 0
+
+    def _prepare(self, frame: np.ndarray) -> np.ndarray:
+        if self.roi is not None:
+            x1, y1, x2, y2 = self.roi
+            frame = frame[y1:y2, x1:x2]
+        h, w = frame.shape[:2]
+        if w > self.width:
+            frame = cv2.resize(frame, (self.width, max(1, round(h * self.width / w))),
+                               interpolation=cv2.INTER_AREA)
+        if frame.ndim == 3:
+            frame = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+        return cv2.GaussianBlur(frame, (5, 5), 0)
+
+    def should_infer(self, frame: np.ndarray) -> bool:
+        """
+        Decide whether `frame` needs inference; updates the reference when it does.
+
+        Args:
+            frame (np.ndarray): BGR frame.
+
+        Returns:
+            bool: True if the scene changed (or no reference exists yet).
+        """
+        self.checked += 1
+        small = self._prepare(frame)
+        if self._reference is None or self._reference.shape != small.shape:
+            self._reference = small
+            self._run = 0
+            return True
+
+        diff = cv2.absdiff(small, self._reference)
+        self.last_score = float(np.count_nonzero(diff > self.pixel_delta)) / diff.size
+        forced = self.max_skip is not None and self._run >= self.max_skip
+        if self.last_score >= self.threshold or forced:
+            self._reference = small
+            self._run = 0
+            return True
+
+        self.skipped += 1
+        self._run += 1
+        return False
+
+    def reset(self) -> None:
+        self._reference = None
+        self._run = 0
+
+    def summary(self) -> str:
+        return f"skipped {self.skipped} of {self.checked} inferences"
@@ -0,0 +1,130 @@
+# rvm/core/pipeline.py
+"""
+Stage pipeline for frame streams.
+
+run_stages(source, stages, threaded=False) pushes every item of `source`
+through a chain of one-argument stage functions and yields the results.
+
+- threaded=False: stages run one after another on the calling thread.
+- threaded=True: the source and each stage run on their own thread, linked by
+  bounded queues. Every stage has exactly one worker, so output order matches
+  input order, and a slow stage applies back-pressure instead of buffering
+  the whole stream. OpenCV decode/encode and drawing release the GIL, so they
+  overlap with model inference.
+
+An exception raised in any stage is re-raised in the consuming thread.
+"""
+
+import queue
+import threading
+from typing import Any, Callable, Iterable, Iterator, List
+
+_DONE = object()
+
+
+class _StageError:
+    """Carries an exception from a worker thread to the consumer."""
+
+    def __init__(self, exc: BaseException):
+        self.exc = exc
+
+
+def _put(q: queue.Queue, item: Any, stop: threading.Event) -> bool:
+    """Blocking put that gives up once the pipeline is stopped."""
+    while not stop.is_set():
+        try:
+            q.put(item, timeout=0.1)
+            return True
+        except queue.Full:
+            continue
+    return False
+
+
+def _get(q: queue.Queue, stop: threading.Event) -> Any:
+    """Blocking get that gives up once the pipeline is stopped."""
+    while not stop.is_set():
+        try:
+            return q.get(timeout=0.1)
+        except queue.Empty:
+            continue
+    return _DONE
+
+
+def _produce(source: Iterable, out_q: queue.Queue, stop: threading.Event) -> None:
+    try:
+        for item in source:
+            if not _put(out_q, item, stop):
+                return
+    except BaseException as e:
+        _put(out_q, _StageError(e), stop)
+        return
+    _put(out_q, _DONE, stop)
+
+
+def _work(stage: Callable, in_q: queue.Queue, out_q: queue.Queue, stop: threading.Event) -> None:
+    while True:
+        item = _get(in_q, stop)
+        if item is _DONE or isinstance(item, _StageError):
+            _put(out_q, item, stop)
+            return
+        try:
+            result = stage(item)
+        except BaseException as e:
+            _put(out_q, _StageError(e), stop)
+            return
+        if not _put(out_q, result, stop):
+            return
+
+
+def _run_sequential(source: Iterable, stages: List[Callable]) -> Iterator[Any]:
+    for item in source:
+        for stage in stages:
+            item = stage(item)
+        yield item
+
+
+def _run_threaded(source: Iterable, stages: List[Callable], maxsize: int) -> Iterator[Any]:
+    stop = threading.Event()
+    queues = [queue.Queue(maxsize=maxsize) for _ in range(len(stages) + 1)]
+    threads = [threading.Thread(target=_produce, args=(source, queues[0], stop),
+                                name="rvm-stage-source", daemon=True)]
+    for i, stage in enumerate(stages):
+        threads.append(threading.Thread(
+            target=_work, args=(stage, queues[i], queues[i + 1], stop),
+            name=f"rvm-stage-{getattr(stage, '__name__', i)}", daemon=True,
+        ))
+    for t in threads:
+        t.start()
+
+    try:
+        while True:
+            item = queues[-1].get()
+            if item is _DONE:
+                break
+            if isinstance(item, _StageError):
+                raise item.exc
+            yield item
+    finally:
+        # Unblock every worker (also when the consumer stops early) and wait for them.
+        stop.set()
+        for t in threads:
+            t.join()
+
+
+def run_stages(source: Iterable, stages: List[Callable], threaded: bool = False,
+               maxsize: int = 4) -> Iterator[Any]:
+    """
+    Push items from `source` through `stages` in order.
+
+    Args:
+        source (Iterable): Items to process (e.g. frame batches).
+        stages (List[Callable]): One-argument functions applied in sequence.
+        threaded (bool): Run the source and every stage on its own thread.
+        maxsize (int): Capacity of each inter-stage queue when threaded.
+
+    Yields:
+        The output of the last stage for each source item, in source order.
+    """
+    if threaded:
+        return _run_threaded(source, list(stages), maxsize)
+    return _run_sequential(source, list(stages))
@@ -0,0 +1,328 @@
+# rvm/core/profiling.py
+"""
+Lightweight stage timing and counters for the api layer.
+
+A Profiler accumulates, per named stage (decode, preprocess, inference,
+postprocess, draw, encode, json, ...), the number of calls, total and maximum
+time, plus free-form counters (frames, detections, dropped_frames). Snapshots
+are pushed to pluggable sinks: any callable taking the snapshot dict, a JSON
+Lines log (JsonlSink) or a Prometheus text-format file (PrometheusSink, for
+the node_exporter textfile collector).
+
+    prof = Profiler(sinks=[JsonlSink("profile.jsonl"), PrometheusSink("rvm.prom")])
+    with prof.stage("inference"):
+        ...
+    prof.count("detections", len(dets))
+    prof.frame()          # end of one frame: periodic emit, profiling window
+
+When profiling is off, code uses NULL_PROFILER, whose methods do nothing and
+whose stage() returns a shared no-op context manager, so instrumented code
+costs one method call per stage.
+
+Profiler(profile_frames=(start, n)) additionally runs cProfile (and, with
+trace_memory=True, tracemalloc) for frames start..start+n-1 and writes
+`profile.pstats` / `tracemalloc.txt` to `profile_dir`. cProfile only sees the
+thread that called frame() when the window opened.
+"""
+
+import os
+import threading
+import time
+from contextlib import nullcontext
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple, Union
+
+Sink = Callable[[Dict[str, Any]], None]
+
+
+class _StageTimer:
+    __slots__ = ("_profiler", "_name", "_start")
+
+    def __init__(self, profiler: "Profiler", name: str):
+        self._profiler = profiler
+        self._name = name
+
+    def __enter__(self):
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self._profiler.add_time(self._name, time.perf_counter() - self._start)
+        return False
+
+
+class Profiler:
+    """Stage timers and counters, emitted to sinks periodically and on close()."""
+
+    enabled = True
+
+    def __init__(self, sinks: Sequence[Sink] = (), emit_every: float = 10.0,
+                 profile_frames: Optional[Tuple[int, int]] = None, trace_memory: bool = False,
+                 profile_dir: str = "."):
+        """
+        Args:
+            sinks: Callables receiving each snapshot dict.
+            emit_every: Seconds between periodic emits (checked at frame()); 0 emits every frame.
+            profile_frames: (first frame, number of frames) to run cProfile for.
+            trace_memory: Also trace allocations with tracemalloc during that window.
+            profile_dir: Directory for profile.pstats and tracemalloc.txt.
+        """
+        self.sinks: List[Sink] = list(sinks)
+        self.emit_every = emit_every
+        self.profile_frames = profile_frames
+        self.trace_memory = trace_memory
+        self.profile_dir = Path(profile_dir)
+        self._lock = threading.Lock()
+        self._stages: Dict[str, List[float]] = {}   # name -> [calls, total s, max s]
+        self._counters: Dict[str, int] = {}
+        self._frames = 0
+        self._started = time.time()
+        self._last_emit = time.monotonic()
+        self._cprofile = None
+        self._window_done = False
+        if profile_frames is not None and profile_frames[0] <= 0:
+            self._start_window()
+
+    # -- recording ------------------------------------------------------------
+
+    def stage(self, name: str) -> _StageTimer:
+        """Context manager timing one call of stage `name`."""
+        return _StageTimer(self, name)
+
+    def add_time(self, name: str, seconds: float, calls: int = 1) -> None:
+        """Record time measured elsewhere (e.g. a detector's own breakdown)."""
+        with self._lock:
+            stat = self._stages.get(name)
+            if stat is None:
+                self._stages[name] = [calls, seconds, seconds]
+            else:
+                stat[0] += calls
+                stat[1] += seconds
+                if seconds > stat[2]:
+                    stat[2] = seconds
+
+    def count(self, name: str, n: int = 1) -> None:
+        with self._lock:
+            self._counters[name] = self._counters.get(name, 0) + n
+
+    def timed(self, iterable: Iterable, name: str) -> Iterator:
+        """Yield from `iterable`, timing each next() as stage `name` (e.g. decoding)."""
+        it = iter(iterable)
+        while True:
+            start = time.perf_counter()
+            try:
+                item = next(it)
+            except StopIteration:
+                return
+            self.add_time(name, time.perf_counter() - start)
+            yield item
+
+    def frame(self, n: int = 1) -> None:
+        """Mark the end of `n` frames: drives the profiling window and periodic emits."""
+        with self._lock:
+            self._frames += n
+        if self.profile_frames is not None and not self._window_done:
+            first, length = self.profile_frames
+            if self._cprofile is None and self._frames >= first:
+                self._start_window()
+            elif self._cprofile is not None and self._frames >= first + length:
+                self._stop_window()
+        if self.sinks and time.monotonic() - self._last_emit >= self.emit_every:
+            self.emit()
+
+    # -- profiling window -------------------------------------------------------
+
+    def _start_window(self) -> None:
+        import cProfile
+
+        if self.trace_memory:
+            import tracemalloc
+
+            tracemalloc.start()
+        self._cprofile = cProfile.Profile()
+        self._cprofile.enable()
+
+    def _stop_window(self) -> None:
+        profile, self._cprofile = self._cprofile, None
+        profile.disable()
+        self._window_done = True
+        self.profile_dir.mkdir(parents=True, exist_ok=True)
+        profile.dump_stats(str(self.profile_dir / "profile.pstats"))
+        written = ["profile.pstats"]
+        if self.trace_memory:
+            import tracemalloc
+
+            top = tracemalloc.take_snapshot().statistics("lineno")[:50]
+            tracemalloc.stop()
+            with open(self.profile_dir / "tracemalloc.txt", "w") as f:
+                f.write("\n".join(str(stat) for stat in top) + "\n")
+            written.append("tracemalloc.txt")
+        print(f"[INFO] Profiling window written to {self.profile_dir}: {', '.join(written)}")
+
+    # -- output ---------------------------------------------------------------
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Current totals: {"ts", "elapsed_s", "frames", "stages": {...}, "counters": {...}}."""
+        with self._lock:
+            stages = {name: {"calls": int(calls), "total_ms": round(total * 1000, 3),
+                             "mean_ms": round(total * 1000 / calls, 3) if calls else 0.0,
+                             "max_ms": round(peak * 1000, 3)}
+                      for name, (calls, total, peak) in self._stages.items()}
+            counters = dict(self._counters)
+            frames = self._frames
+        return {"ts": time.time(), "elapsed_s": round(time.time() - self._started, 3),
+                "frames": frames, "stages": stages, "counters": counters}
+
+    def emit(self) -> None:
+        """Push a snapshot to every sink."""
+        self._last_emit = time.monotonic()
+        if not self.sinks:
+            return
+        snapshot = self.snapshot()
+        for sink in self.sinks:
+            try:
+                sink(snapshot)
+            except Exception as e:
+                print(f"[WARN] Profiler sink failed: {e}")
+
+    def summary(self) -> str:
+        """One line per stage, slowest first."""
+        snap = self.snapshot()
+        lines = [f"{snap['frames']} frames in {snap['elapsed_s']:.2f}s"]
+        for name, s in sorted(snap["stages"].items(), key=lambda kv: -kv[1]["total_ms"]):
+            lines.append(f"  {name:<12} {s['calls']:>7} calls {s['total_ms']:>11.1f} ms "
+                         f"(mean {s['mean_ms']:.2f} ms, max {s['max_ms']:.2f} ms)")
+        lines += [f"  {name}: {value}" for name, value in sorted(snap["counters"].items())]
+        return "\n".join(lines)
+
+    def close(self) -> None:
+        """Stop an open profiling window, emit a final snapshot and close the sinks."""
+        if self._cprofile is not None:
+            self._stop_window()
+        self.emit()
+        for sink in self.sinks:
+            close = getattr(sink, "close", None)
+            if close is not None:
+                close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class _NullProfiler:
+    """Disabled profiler: every method is a no-op."""
+
+    enabled = False
+    _NULL_STAGE = nullcontext()
+
+    def stage(self, name: str):
+        return self._NULL_STAGE
+
+    def add_time(self, name: str, seconds: float, calls: int = 1) -> None:
+        pass
+
+    def count(self, name: str, n: int = 1) -> None:
+        pass
+
+    def timed(self, iterable: Iterable, name: str) -> Iterable:
+        return iterable
+
+    def frame(self, n: int = 1) -> None:
+        pass
+
+    def emit(self) -> None:
+        pass
+
+    def close(self) -> None:
+        pass
+
+
+NULL_PROFILER = _NullProfiler()
+
+
+class JsonlSink:
+    """Appends every snapshot as one line to a JSON Lines file."""
+
+    def __init__(self, path):
+        from rvm.io.writer import JsonlWriter
+
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self._writer = JsonlWriter(path, append=True)
+
+    def __call__(self, snapshot: Dict[str, Any]) -> None:
+        self._writer.write(snapshot)
+        self._writer.flush()
+
+    def close(self) -> None:
+        self._writer.close()
+
+
+class PrometheusSink:
+    """Rewrites a Prometheus text-format file with the latest snapshot (atomically)."""
+
+    def __init__(self, path, prefix: str = "rvm", labels: Optional[Dict[str, str]] = None):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.prefix = prefix
+        self.labels = labels or {}
+
+    def _labels(self, **extra: str) -> str:
+        labels = {**self.labels, **extra}
+        if not labels:
+            return ""
+        return "{" + ",".join(f'{k}="{v}"' for k, v in labels.items()) + "}"
+
+    def __call__(self, snapshot: Dict[str, Any]) -> None:
+        p = self.prefix
+        lines = [f"# TYPE {p}_frames_total counter",
+                 f"{p}_frames_total{self._labels()} {snapshot['frames']}"]
+        for metric, key, kind, scale in (("stage_calls_total", "calls", "counter", 1),
+                                         ("stage_seconds_total", "total_ms", "counter", 1e-3),
+                                         ("stage_seconds_max", "max_ms", "gauge", 1e-3)):
+            lines.append(f"# TYPE {p}_{metric} {kind}")
+            for name, stats in snapshot["stages"].items():
+                lines.append(f"{p}_{metric}{self._labels(stage=name)} {stats[key] * scale:.6g}")
+        for name, value in snapshot["counters"].items():
+            lines += [f"# TYPE {p}_{name}_total counter", f"{p}_{name}_total{self._labels()} {value}"]
+        tmp = self.path.with_name(self.path.name + ".tmp")
+        tmp.write_text("\n".join(lines) + "\n")
+        os.replace(tmp, self.path)
+
+
+def open_profiler(profile: Union[None, bool, str, Path, Sink, Profiler, _NullProfiler]):
+    """
+    Resolve a `profile` argument of the api functions.
+
+    Args:
+        profile: None/False (disabled), a Profiler, a callable sink, or a directory
+            that receives profile.jsonl and metrics.prom.
+
+    Returns:
+        (profiler, owned): owned is True when the profiler was created here and
+        should be closed by the caller when done.
+    """
+    if not profile:
+        return NULL_PROFILER, False
+    if isinstance(profile, (Profiler, _NullProfiler)):
+        return profile, False
+    if callable(profile):
+        return Profiler(sinks=[profile]), True
+    return dir_profiler(profile), True
+
+
+def dir_profiler(out_dir, **options) -> Profiler:
+    """Profiler writing profile.jsonl, metrics.prom (and any profiling window) to `out_dir`."""
+    out = Path(out_dir)
+    return Profiler(sinks=[JsonlSink(out / "profile.jsonl"), PrometheusSink(out / "metrics.prom")],
+                    profile_dir=str(out), **options)
+
+
+def finish(profiler, owned: bool) -> None:
+    """Close an owned profiler, or emit the totals of a caller's one."""
+    if owned:
+        profiler.close()
+    else:
+        profiler.emit()
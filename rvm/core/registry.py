@@ -0,0 +1,171 @@
+# rvm/core/registry.py
+"""
+Process-wide model registry.
+
+Loading weights and running the first inference dominate the latency of a
+single api call, so models are built once per process and reused. Entries are
+keyed by (backend, weights, device, imgsz) and evicted least-recently-used
+when either the entry count or the estimated parameter memory exceeds its cap.
+
+Every caller in the process gets the same instance. The registry lock only
+guards lookups; concurrent inference is made safe by the model wrappers
+themselves, which serialize forward passes on a per-instance lock (one lock per
+registry entry) and keep per-call state such as YOLODetector.last_timings per
+thread. Threads therefore share weights but not throughput; use processes
+(rvm.batch) to run inference in parallel.
+
+Functions:
+- get_registry()
+- get_detector(model, device, imgsz, warmup)
+- get_segmenter(model, device, imgsz, warmup)
+- get_aruco_detector(dictionary)
+- get_barcode_detector()
+"""
+
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Hashable, List, Optional, Tuple
+
+RegistryKey = Tuple[str, str, Optional[str], Optional[int]]
+
+
+def estimate_nbytes(obj: Any) -> int:
+    """
+    Estimate the memory held by a model wrapper from its torch parameters.
+
+    Looks at `obj.model` (the wrappers in this package keep their network there)
+    and falls back to `obj` itself. Objects without parameters count as 0.
+    """
+    module = getattr(obj, "model", obj)
+    if not callable(getattr(module, "parameters", None)):
+        return 0
+    try:
+        total = sum(p.numel() * p.element_size() for p in module.parameters())
+        if callable(getattr(module, "buffers", None)):
+            total += sum(b.numel() * b.element_size() for b in module.buffers())
+        return int(total)
+    except Exception:
+        return 0
+
+
+class ModelRegistry:
+    """LRU cache of constructed models with an entry-count and memory cap."""
+
+    def __init__(self, max_models: int = 8, max_bytes: Optional[int] = None):
+        """
+        Args:
+            max_models: Maximum number of models kept alive.
+            max_bytes: Optional cap on the summed estimated model memory.
+        """
+        if max_models < 1:
+            raise ValueError(f"max_models must be >= 1, got {max_models}")
+        self.max_models = max_models
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[Hashable, Tuple[Any, int]]" = OrderedDict()
+        self._lock = threading.RLock()
+
+    def get(self, key: Hashable, factory: Callable[[], Any], warmup: bool = False) -> Any:
+        """
+        Return the model registered under `key`, building it with `factory` on a miss.
+
+        Args:
+            key: Registry key, usually (backend, weights, device, imgsz).
+            factory: Zero-argument callable that constructs the model.
+            warmup: Call the model's `warmup()` (if any) right after construction.
+
+        Returns:
+            The cached or newly built model.
+        """
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                return self._entries[key][0]
+
+            model = factory()
+            if warmup and callable(getattr(model, "warmup", None)):
+                model.warmup()
+            self._entries[key] = (model, estimate_nbytes(model))
+            self._evict()
+            return model
+
+    def _evict(self) -> None:
+        # Always keep the most recently added entry, even if it alone exceeds max_bytes.
+        while len(self._entries) > 1 and (
+            len(self._entries) > self.max_models
+            or (self.max_bytes is not None and self.total_bytes > self.max_bytes)
+        ):
+            self._entries.popitem(last=False)
+
+    def remove(self, key: Hashable) -> bool:
+        """Drop one entry. Returns True if it was present."""
+        with self._lock:
+            return self._entries.pop(key, None) is not None
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def keys(self) -> List[Hashable]:
+        """Registered keys, least recently used first."""
+        with self._lock:
+            return list(self._entries)
+
+    @property
+    def total_bytes(self) -> int:
+        with self._lock:
+            return sum(nbytes for _, nbytes in self._entries.values())
+
+    def __contains__(self, key: Hashable) -> bool:
+        with self._lock:
+            return key in self._entries
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
+
+
+_REGISTRY = ModelRegistry()
+
+
+def get_registry() -> ModelRegistry:
+    """Return the process-wide registry used by rvm.api."""
+    return _REGISTRY
+
+
+def get_detector(model: str = "yolov8n.pt", device: Optional[str] = None, imgsz: int = 640,
+                 warmup: bool = False, backend: str = "torch"):
+    """Return a cached YOLODetector for (backend, weights, device, imgsz)."""
+    from rvm.detect.yolo import YOLODetector
+
+    key: RegistryKey = (backend, str(model), device, imgsz)
+    return _REGISTRY.get(
+        key, lambda: YOLODetector(model, device=device, imgsz=imgsz, backend=backend), warmup
+    )
+
+
+def get_segmenter(model: str = "FastSAM-s.pt", device: str = "cpu", imgsz: int = 512,
+                  warmup: bool = False):
+    """Return a cached SamLiteSegmenter for (weights, device, imgsz)."""
+    from rvm.segment.sam_lite import SamLiteSegmenter
+
+    key: RegistryKey = ("fastsam", str(model), device, imgsz)
+    return _REGISTRY.get(key, lambda: SamLiteSegmenter(model, device=device, imgsz=imgsz), warmup)
+
+
+def get_aruco_detector(dictionary: Optional[int] = None):
+    """Return a cached ArucoDetector for the given predefined dictionary."""
+    from rvm.markers.aruco import ArucoDetector
+
+    if dictionary is None:
+        return _REGISTRY.get(("aruco", "default", None, None), ArucoDetector)
+    return _REGISTRY.get(("aruco", str(dictionary), None, None), lambda: ArucoDetector(dictionary))
+
+
+def get_barcode_detector(localize: bool = False, cascade: bool = False):
+    """Return a cached BarCodesDetector (optionally localizing and/or cascading)."""
+    from rvm.markers.barcodes import BarCodesDetector
+
+    if localize or cascade:
+        return _REGISTRY.get(("pyzbar", f"localize={localize},cascade={cascade}", None, None),
+                             lambda: BarCodesDetector(localize=localize, cascade=cascade))
+    return _REGISTRY.get(("pyzbar", "default", None, None), BarCodesDetector)
@@ -0,0 +1,189 @@
+# rvm/core/rle.py
+"""
+COCO-compatible run-length encoding for binary masks.
+
+An RLE is a dict {"size": [h, w], "counts": str}: the mask is flattened in
+column-major order, run lengths alternate between 0s and 1s (starting with
+0s), and the counts are packed in the same compressed string format as
+pycocotools, so the dicts can be passed to `pycocotools.mask` directly.
+
+Encoding works on whole (N, H, W) mask stacks at once, and area/bbox are
+computed from the run lengths without decoding. decode() can restrict
+itself to a bounding box so drawing a mask only touches its region.
+"""
+
+from typing import Any, Dict, List, Optional, Sequence
+
+import cv2
+import numpy as np
+
+RLE = Dict[str, Any]
+
+
+def _counts_to_string(counts: Sequence[int]) -> str:
+    # Port of pycocotools rleToString: delta-code against counts[i-2], 5 bits per char.
+    out = []
+    for i, x in enumerate(counts):
+        x = int(x)
+        if i > 2:
+            x -= int(counts[i - 2])
+        more = True
+        while more:
+            c = x & 0x1F
+            x >>= 5
+            more = (x != -1) if (c & 0x10) else (x != 0)
+            if more:
+                c |= 0x20
+            out.append(chr(c + 48))
+    return "".join(out)
+
+
+def _string_to_counts(s: str) -> np.ndarray:
+    # Port of pycocotools rleFrString.
+    counts: List[int] = []
+    p, n = 0, len(s)
+    while p < n:
+        x, k, more = 0, 0, True
+        while more:
+            c = ord(s[p]) - 48
+            x |= (c & 0x1F) << (5 * k)
+            more = bool(c & 0x20)
+            p += 1
+            k += 1
+            if not more and (c & 0x10):
+                x |= -1 << (5 * k)
+        if len(counts) > 2:
+            x += counts[-2]
+        counts.append(x)
+    return np.array(counts, dtype=np.int64)
+
+
+def _counts(rle: RLE) -> np.ndarray:
+    counts = rle["counts"]
+    if isinstance(counts, bytes):
+        counts = counts.decode("ascii")
+    if isinstance(counts, str):
+        return _string_to_counts(counts)
+    return np.asarray(counts, dtype=np.int64)
+
+
+def encode_batch(masks: np.ndarray) -> List[RLE]:
+    """
+    Encode a stack of binary masks.
+
+    Args:
+        masks (np.ndarray): (N, H, W) array; non-zero pixels are foreground.
+
+    Returns:
+        list of RLE dicts, one per mask.
+    """
+    masks = np.asarray(masks)
+    if masks.ndim == 2:
+        masks = masks[None]
+    n, h, w = masks.shape
+    if n == 0:
+        return []
+    flat = masks.transpose(0, 2, 1).reshape(n, h * w).astype(bool)
+    # Run boundaries: positions where the value changes, plus both ends.
+    changes = flat[:, 1:] != flat[:, :-1]
+    rows, cols = np.nonzero(changes)
+    splits = np.searchsorted(rows, np.arange(1, n))
+    rles = []
+    for i, pos in enumerate(np.split(cols + 1, splits)):
+        bounds = np.concatenate([[0], pos, [h * w]])
+        counts = np.diff(bounds)
+        if flat[i, 0]:
+            counts = np.concatenate([[0], counts])  # counts always start with a 0-run
+        rles.append({"size": [h, w], "counts": _counts_to_string(counts.tolist())})
+    return rles
+
+
+def encode(mask: np.ndarray) -> RLE:
+    """Encode one (H, W) binary mask."""
+    return encode_batch(np.asarray(mask)[None])[0]
+
+
+def decode(rle: RLE, bbox: Optional[Sequence[int]] = None) -> np.ndarray:
+    """
+    Decode an RLE to a uint8 mask.
+
+    Args:
+        rle: RLE dict.
+        bbox: Optional [x, y, w, h] region; only that crop is decoded and returned.
+
+    Returns:
+        np.ndarray: (H, W) mask, or (h, w) crop when bbox is given.
+    """
+    h, w = rle["size"]
+    counts = _counts(rle)
+    if bbox is None:
+        x0, y0, bw, bh = 0, 0, w, h
+    else:
+        x0, y0, bw, bh = (int(v) for v in bbox)
+    # Column-major layout: columns x0..x0+bw map to one contiguous flat range.
+    a, b = x0 * h, (x0 + bw) * h
+    ends = np.cumsum(counts)
+    starts = ends - counts
+    lengths = np.clip(ends, a, b) - np.clip(starts, a, b)
+    values = np.arange(len(counts), dtype=np.uint8) & 1
+    cols = np.repeat(values, lengths).reshape(bw, h).T
+    return np.ascontiguousarray(cols[y0:y0 + bh])
+
+
+def decode_batch(rles: Sequence[RLE]) -> np.ndarray:
+    """Decode several RLEs of the same size into an (N, H, W) uint8 array."""
+    if not rles:
+        return np.zeros((0, 0, 0), dtype=np.uint8)
+    return np.stack([decode(r) for r in rles])
+
+
+def area(rle: RLE) -> int:
+    """Number of foreground pixels."""
+    return int(_counts(rle)[1::2].sum())
+
+
+def bbox(rle: RLE) -> List[int]:
+    """
+    Tight [x, y, w, h] box of the foreground (pycocotools toBbox convention),
+    computed from the run lengths without decoding.
+    """
+    h, _ = rle["size"]
+    counts = _counts(rle)
+    ends = np.cumsum(counts)
+    starts = (ends - counts)[1::2]
+    lengths = counts[1::2]
+    keep = lengths > 0
+    if not keep.any():
+        return [0, 0, 0, 0]
+    starts, last = starts[keep], (starts + lengths - 1)[keep]
+    x_start, x_end = starts // h, last // h
+    # A run that wraps into the next column covers the whole column height.
+    wraps = x_end > x_start
+    y_min = np.where(wraps, 0, starts % h).min()
+    y_max = np.where(wraps, h - 1, last % h).max()
+    x_min, x_max = x_start.min(), x_end.max()
+    return [int(x_min), int(y_min), int(x_max - x_min + 1), int(y_max - y_min + 1)]
+
+
+def mask_to_polygon(mask: np.ndarray) -> List[List[int]]:
+    """
+    Convert binary mask (H,W) to polygon (list of [x,y] ints) of its largest contour.
+    """
+    mask_uint8 = (mask.astype(np.uint8) * 255)
+    contours, _ = cv2.findContours(mask_uint8, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
+    if not contours:
+        ys, xs = np.where(mask == 1)
+        return [[int(x), int(y)] for x, y in zip(xs.tolist(), ys.tolist())]
+
+    contour = max(contours, key=cv2.contourArea)
+    epsilon = 0.01 * cv2.arcLength(contour, True)
+    approx = cv2.approxPolyDP(contour, epsilon, True)
+    return [[int(pt[0][0]), int(pt[0][1])] for pt in approx]
+
+
+def to_polygon(rle: RLE) -> List[List[int]]:
+    """Polygon of the largest connected region, decoded only inside the mask's bbox."""
+    x, y, w, h = bbox(rle)
+    if w == 0 or h == 0:
+        return []
+    return [[px + x, py + y] for px, py in mask_to_polygon(decode(rle, [x, y, w, h]))]
@@ -1,9 +1,11 @@
 # rvm/core/types.py
 from dataclasses import dataclass, asdict
-from typing import List, Tuple
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple, Union
 
+import numpy as np
 
-@dataclass
+
+@dataclass(slots=True)
 class Box:
     x1: int
     y1: int
@@ -11,20 +13,176 @@ class Box:
     y2: int
     confidence: float
     class_id: int
+    track_id: Optional[int] = None
 
     def to_dict(self):
         """Convert Box object to dictionary for JSON serialization."""
-        return asdict(self)
+        d = {"x1": self.x1, "y1": self.y1, "x2": self.x2, "y2": self.y2,
+             "confidence": self.confidence, "class_id": self.class_id}
+        if self.track_id is not None:
+            d["track_id"] = self.track_id
+        return d
+
+
+class Detections:
+    """
+    Columnar detection results for one frame.
+
+    Boxes are stored as NumPy arrays instead of one Python object per box:
+    - xyxy (N, 4) float32 corner coordinates
+    - scores (N,) float32 confidences
+    - class_ids (N,) int32 class indices
+    - track_ids (N,) int32 track identities, or None when not tracked
+
+    Iterating (or indexing with an int) yields `Box` objects, so code written
+    against `List[Box]` keeps working. Slicing returns a `Detections` view.
+    """
+
+    __slots__ = ("xyxy", "scores", "class_ids", "track_ids")
+
+    def __init__(self, xyxy, scores, class_ids, track_ids=None):
+        self.xyxy = np.asarray(xyxy, dtype=np.float32).reshape(-1, 4)
+        self.scores = np.asarray(scores, dtype=np.float32).reshape(-1)
+        self.class_ids = np.asarray(class_ids, dtype=np.int32).reshape(-1)
+        self.track_ids = None if track_ids is None else np.asarray(track_ids, dtype=np.int32).reshape(-1)
+        if not len(self.xyxy) == len(self.scores) == len(self.class_ids):
+            raise ValueError(
+                f"Mismatched lengths: xyxy={len(self.xyxy)}, "
+                f"scores={len(self.scores)}, class_ids={len(self.class_ids)}"
+            )
+        if self.track_ids is not None and len(self.track_ids) != len(self.scores):
+            raise ValueError(
+                f"Mismatched lengths: track_ids={len(self.track_ids)}, scores={len(self.scores)}"
+            )
+
+    @classmethod
+    def empty(cls) -> "Detections":
+        return cls(np.zeros((0, 4), np.float32), np.zeros(0, np.float32), np.zeros(0, np.int32))
+
+    @classmethod
+    def from_boxes(cls, boxes: Iterable[Box]) -> "Detections":
+        """Build a Detections container from Box objects."""
+        boxes = list(boxes)
+        if not boxes:
+            return cls.empty()
+        tracked = all(b.track_id is not None for b in boxes)
+        return cls(
+            [(b.x1, b.y1, b.x2, b.y2) for b in boxes],
+            [b.confidence for b in boxes],
+            [b.class_id for b in boxes],
+            [b.track_id for b in boxes] if tracked else None,
+        )
+
+    @classmethod
+    def concatenate(cls, items: Iterable["Detections"]) -> "Detections":
+        """Concatenate several Detections into one (track IDs are kept only if all have them)."""
+        items = list(items)
+        if not items:
+            return cls.empty()
+        tracked = all(d.track_ids is not None for d in items)
+        return cls(
+            np.concatenate([d.xyxy for d in items]),
+            np.concatenate([d.scores for d in items]),
+            np.concatenate([d.class_ids for d in items]),
+            np.concatenate([d.track_ids for d in items]) if tracked else None,
+        )
+
+    def __len__(self) -> int:
+        return len(self.scores)
+
+    def __iter__(self) -> Iterator[Box]:
+        return iter(self.boxes)
+
+    def __getitem__(self, index: Union[int, slice, np.ndarray]) -> Union[Box, "Detections"]:
+        if isinstance(index, (int, np.integer)):
+            x1, y1, x2, y2 = self.xyxy[index].astype(int).tolist()
+            return Box(x1=x1, y1=y1, x2=x2, y2=y2,
+                       confidence=float(self.scores[index]),
+                       class_id=int(self.class_ids[index]),
+                       track_id=None if self.track_ids is None else int(self.track_ids[index]))
+        return Detections(self.xyxy[index], self.scores[index], self.class_ids[index],
+                          None if self.track_ids is None else self.track_ids[index])
+
+    def __repr__(self) -> str:
+        return f"Detections(n={len(self)})"
+
+    def _track_list(self) -> List[Optional[int]]:
+        return [None] * len(self) if self.track_ids is None else self.track_ids.tolist()
+
+    @property
+    def boxes(self) -> List[Box]:
+        """Materialise the detections as a list of Box objects."""
+        return [
+            Box(x1=x1, y1=y1, x2=x2, y2=y2, confidence=conf, class_id=cls, track_id=tid)
+            for (x1, y1, x2, y2), conf, cls, tid in zip(
+                self.xyxy.astype(int).tolist(), self.scores.tolist(), self.class_ids.tolist(),
+                self._track_list()
+            )
+        ]
+
+    def to_dicts(self) -> List[Dict[str, Any]]:
+        """Convert to a list of dicts, same layout as `Box.to_dict`."""
+        dicts = [
+            {"x1": x1, "y1": y1, "x2": x2, "y2": y2, "confidence": conf, "class_id": cls}
+            for (x1, y1, x2, y2), conf, cls in zip(
+                self.xyxy.astype(int).tolist(), self.scores.tolist(), self.class_ids.tolist()
+            )
+        ]
+        if self.track_ids is not None:
+            for d, tid in zip(dicts, self.track_ids.tolist()):
+                d["track_id"] = tid
+        return dicts
 
 
 @dataclass
 class Mask:
+    """
+    One segmentation mask, stored as a polygon (`segmentation`) and/or as a
+    COCO-compatible RLE dict (`rle`, see rvm.core.rle).
+    """
     segmentation: List[List[int]]
     confidence: float
     class_id: int = 0
+    rle: Optional[Dict[str, Any]] = None
+
+    @property
+    def polygon(self) -> List[List[int]]:
+        """Polygon vertices, converted from the RLE on demand."""
+        if self.segmentation or self.rle is None:
+            return self.segmentation
+        from rvm.core.rle import to_polygon
+
+        return to_polygon(self.rle)
+
+    @property
+    def area(self) -> float:
+        if self.rle is not None:
+            from rvm.core.rle import area
+
+            return area(self.rle)
+        pts = np.asarray(self.segmentation, dtype=np.float64).reshape(-1, 2)
+        x, y = pts[:, 0], pts[:, 1]
+        return float(abs(np.dot(x, np.roll(y, 1)) - np.dot(y, np.roll(x, 1))) / 2)
+
+    @property
+    def bbox(self) -> List[int]:
+        """Tight [x, y, w, h] box of the mask."""
+        if self.rle is not None:
+            from rvm.core.rle import bbox
+
+            return bbox(self.rle)
+        pts = np.asarray(self.segmentation, dtype=np.int64).reshape(-1, 2)
+        if not len(pts):
+            return [0, 0, 0, 0]
+        (x1, y1), (x2, y2) = pts.min(axis=0), pts.max(axis=0)
+        return [int(x1), int(y1), int(x2 - x1 + 1), int(y2 - y1 + 1)]
 
     def to_dict(self):
-        return asdict(self)
+        d = {"segmentation": self.segmentation, "confidence": self.confidence,
+             "class_id": self.class_id}
+        if self.rle is not None:
+            d["rle"] = self.rle
+        return d
 
 
 @dataclass
@@ -3,97 +3,102 @@
 Visualization utilities for detection/segmentation results.
 
 Functions:
+- annotate(image, boxes, masks, markers, qr_codes, barcodes): render all results
+  for a frame in one pass onto one output buffer (or in place)
 - draw_boxes(image, boxes)
 - draw_masks(image, masks)
 - draw_markers(image, markers)
+- draw_qr_codes(image, qr_codes)
+- draw_barcodes(image, barcodes)
+
+Colors come from a fixed palette indexed by object ID, and mask blending is
+limited to each mask's bounding box, so annotation cost scales with the
+annotated area rather than with the frame size.
 """
 
 import cv2
 import numpy as np
-from typing import List, Tuple
+from typing import Iterable, List, Optional, Tuple
 
+from rvm.core import rle as rle_utils
 from rvm.core.types import Box, Mask, Marker, QRCode, BarCode
-import random
 
-_COLOR_MAP = {}
+# Fixed pseudo-random palette: colors are stable across runs and processes.
+_PALETTE = np.random.default_rng(0).integers(0, 256, size=(1024, 3), dtype=np.uint8)
+_PALETTE_COLORS = [tuple(int(c) for c in color) for color in _PALETTE]
 
 
-def _get_color_for_id(obj_id):
+def _get_color_for_id(obj_id) -> Tuple[int, int, int]:
     """
     Return a consistent color for a given object ID.
     """
-    if obj_id not in _COLOR_MAP:
-        # Generate a random color
-        random.seed(obj_id)
-        _COLOR_MAP[obj_id] = (
-            random.randint(0, 255),
-            random.randint(0, 255),
-            random.randint(0, 255),
-        )
-    return _COLOR_MAP[obj_id]
+    return _PALETTE_COLORS[int(obj_id) % len(_PALETTE_COLORS)]
 
 
-def draw_boxes(image, boxes):
-    """
-    Draw bounding boxes on the image.
-    Each box gets a unique color based on its coordinates hash.
-    """
-    annotated = image.copy()
+def _draw_boxes(img: np.ndarray, boxes: Iterable[Box]) -> None:
     for box in boxes:
-        # Hash box coordinates to get a stable color
-        obj_id = hash((box.x1, box.y1, box.x2, box.y2)) % 10000
+        if box.track_id is not None:
+            obj_id = box.track_id
+        else:
+            # Hash box coordinates to get a stable color
+            obj_id = hash((box.x1, box.y1, box.x2, box.y2)) % 10000
         color = _get_color_for_id(obj_id)
 
-        cv2.rectangle(
-            annotated,
-            (box.x1, box.y1),
-            (box.x2, box.y2),
-            color,
-            2,
-        )
-        label = f"{box.confidence:.2f}"
-        cv2.putText(
-            annotated,
-            label,
-            (box.x1, max(0, box.y1 - 5)),
-            cv2.FONT_HERSHEY_SIMPLEX,
-            0.5,
-            color,
-            2,
-        )
-    return annotated
-
-
-def draw_masks(image: np.ndarray, masks: List[Mask], alpha: float = 0.4) -> np.ndarray:
-    """ 
-    Olay masks on the image with transparency.
-    Each mask gets a unique color based on its segmentation hash.
-    """
-    img = image.copy()
-    overlay = img.copy()
-
-    for mask in masks:
+        cv2.rectangle(img, (box.x1, box.y1), (box.x2, box.y2), color, 2)
+        label = f"{box.confidence:.2f}" if box.track_id is None else f"#{box.track_id} {box.confidence:.2f}"
+        cv2.putText(img, label, (box.x1, max(0, box.y1 - 5)),
+                    cv2.FONT_HERSHEY_SIMPLEX, 0.5, color, 2)
+
+
+def _blend_polygon(img: np.ndarray, pts: np.ndarray, color, alpha: float) -> None:
+    """Alpha-fill a polygon, touching only the pixels of its bounding box."""
+    h, w = img.shape[:2]
+    x, y, bw, bh = cv2.boundingRect(pts)
+    x1, y1, x2, y2 = max(x, 0), max(y, 0), min(x + bw, w), min(y + bh, h)
+    if x2 <= x1 or y2 <= y1:
+        return
+    roi = img[y1:y2, x1:x2]
+    inside = np.zeros(roi.shape[:2], dtype=np.uint8)
+    cv2.fillPoly(inside, [pts - np.array([x1, y1], dtype=np.int32)], 255)
+    blended = cv2.addWeighted(roi, 1 - alpha, np.full_like(roi, color), alpha, 0)
+    cv2.copyTo(blended, inside, roi)
+
+
+def _blend_rle(img: np.ndarray, rle, color, alpha: float) -> None:
+    """Alpha-fill an RLE mask and outline it, decoding only its bounding box."""
+    x, y, w, h = rle_utils.bbox(rle)
+    if w == 0 or h == 0:
+        return
+    inside = rle_utils.decode(rle, [x, y, w, h])
+    roi = img[y:y + h, x:x + w]
+    blended = cv2.addWeighted(roi, 1 - alpha, np.full_like(roi, color), alpha, 0)
+    cv2.copyTo(blended, inside, roi)
+    contours, _ = cv2.findContours(inside, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
+    cv2.drawContours(roi, contours, -1, color, 2)
+
+
+def _draw_masks(img: np.ndarray, masks: Iterable[Mask], alpha: float) -> None:
+    for i, mask in enumerate(masks):
+        # Index-based color: hashing large polygons costs more than drawing them
+        color = _get_color_for_id(i + 3000)
+        if mask.rle is not None and not mask.segmentation:
+            _blend_rle(img, mask.rle, color, alpha)
+            x, y, _, _ = rle_utils.bbox(mask.rle)
+            cv2.putText(img, f"{mask.confidence:.2f}", (x, y - 5),
+                        cv2.FONT_HERSHEY_SIMPLEX, 0.5, color, 1, cv2.LINE_AA)
+            continue
         if len(mask.segmentation) == 0:
             continue
-        obj_id = hash(tuple(map(tuple, mask.segmentation))) % 10000
-        color = _get_color_for_id(obj_id)
 
         pts = np.array(mask.segmentation, dtype=np.int32).reshape((-1, 1, 2))
-        cv2.fillPoly(overlay, [pts], color)
+        _blend_polygon(img, pts, color, alpha)
         cv2.polylines(img, [pts], True, color, 2)
         cv2.putText(img, f"{mask.confidence:.2f}",
                     (pts[0][0][0], pts[0][0][1] - 5),
                     cv2.FONT_HERSHEY_SIMPLEX, 0.5, color, 1, cv2.LINE_AA)
 
-    return cv2.addWeighted(overlay, alpha, img, 1 - alpha, 0)
 
-
-def draw_markers(image: np.ndarray, markers: List[Marker]) -> np.ndarray:
-    """
-    Draw detected markers on the image.
-    Each marker gets a unique color based on its ID or corners hash.
-    """
-    img = image.copy()
+def _draw_markers(img: np.ndarray, markers: Iterable[Marker]) -> None:
     for marker in markers:
         # Use marker ID if available, else hash corners for color
         obj_id = marker.id if marker.id is not None else hash(tuple(map(tuple, marker.corners))) % 10000
@@ -105,70 +110,103 @@ def draw_markers(image: np.ndarray, markers: List[Marker]) -> np.ndarray:
         cY = int(np.mean([pt[1] for pt in marker.corners]))
         cv2.putText(img, str(marker.id), (cX, cY),
                     cv2.FONT_HERSHEY_SIMPLEX, 0.7, color, 2, cv2.LINE_AA)
-    return img
 
 
-def draw_qr_codes(image: np.ndarray, qr_codes: List[QRCode]) -> np.ndarray:
-    """
-    Draw detected QR codes on the image with text at top-right of bounding box.
-    """
-    img = image.copy()
-    for i, qr_code in enumerate(qr_codes):
-        # Use index-based color for QR codes
-        color = _get_color_for_id(i + 1000)  # Offset to differentiate from markers
-        
+def _draw_codes(img: np.ndarray, codes, label: str, id_offset: int, max_chars: int) -> None:
+    for i, code in enumerate(codes):
+        # Index-based color, offset per code type to differ from markers
+        color = _get_color_for_id(i + id_offset)
+
         # Draw bounding polygon
-        corners = np.array(qr_code.corners, dtype=np.int32).reshape((-1, 1, 2))
+        corners = np.array(code.corners, dtype=np.int32).reshape((-1, 1, 2))
         cv2.polylines(img, [corners], True, color, 2)
-        
-        # Calculate top-right position for text
-        max_x = max(pt[0] for pt in qr_code.corners)
-        min_y = min(pt[1] for pt in qr_code.corners)
-        
-        # Add padding to avoid overlap with bounding box
-        text_x = max_x + 5
-        text_y = min_y - 5
-        
-        # Draw QR label at top-right
-        cv2.putText(img, "QR", (text_x, text_y),
+
+        # Text at the top-right of the bounding box, padded to avoid the outline
+        text_x = max(pt[0] for pt in code.corners) + 5
+        text_y = min(pt[1] for pt in code.corners) - 5
+        cv2.putText(img, label, (text_x, text_y),
                     cv2.FONT_HERSHEY_SIMPLEX, 0.6, color, 2, cv2.LINE_AA)
-        
-        # Draw truncated data below the label
-        data_text = qr_code.data[:20] + "..." if len(qr_code.data) > 20 else qr_code.data
+
+        # Truncated data below the label
+        data_text = code.data[:max_chars] + "..." if len(code.data) > max_chars else code.data
         cv2.putText(img, data_text, (text_x, text_y + 20),
                     cv2.FONT_HERSHEY_SIMPLEX, 0.4, color, 1, cv2.LINE_AA)
-    
+
+
+def annotate(
+    image: np.ndarray,
+    boxes: Optional[Iterable[Box]] = None,
+    masks: Optional[List[Mask]] = None,
+    markers: Optional[List[Marker]] = None,
+    qr_codes: Optional[List[QRCode]] = None,
+    barcodes: Optional[List[BarCode]] = None,
+    alpha: float = 0.4,
+    inplace: bool = False,
+) -> np.ndarray:
+    """
+    Render all results for one frame onto a single output buffer.
+
+    Args:
+        image (np.ndarray): Input BGR image.
+        boxes: Detection boxes (list of Box or Detections).
+        masks: Segmentation masks, alpha-blended inside their bounding boxes.
+        markers: ArUco markers.
+        qr_codes: Decoded QR codes.
+        barcodes: Decoded barcodes.
+        alpha (float): Mask fill opacity.
+        inplace (bool): Draw directly on `image` instead of a copy.
+
+    Returns:
+        np.ndarray: The annotated image (`image` itself when inplace=True).
+    """
+    img = image if inplace else image.copy()
+    if masks:
+        _draw_masks(img, masks, alpha)
+    if boxes is not None:
+        _draw_boxes(img, boxes)
+    if markers:
+        _draw_markers(img, markers)
+    if qr_codes:
+        _draw_codes(img, qr_codes, "QR", 1000, 20)
+    if barcodes:
+        _draw_codes(img, barcodes, "BC", 2000, 15)
     return img
 
 
+def draw_boxes(image, boxes):
+    """
+    Draw bounding boxes on the image.
+    Tracked boxes are colored by track ID (stable across frames); others get a
+    color based on their coordinates hash.
+    """
+    return annotate(image, boxes=boxes)
+
+
+def draw_masks(image: np.ndarray, masks: List[Mask], alpha: float = 0.4) -> np.ndarray:
+    """
+    Overlay masks (polygon or RLE) on the image with transparency.
+    Each mask gets a distinct color based on its position in the list.
+    """
+    return annotate(image, masks=masks, alpha=alpha)
+
+
+def draw_markers(image: np.ndarray, markers: List[Marker]) -> np.ndarray:
+    """
+    Draw detected markers on the image.
+    Each marker gets a unique color based on its ID or corners hash.
+    """
+    return annotate(image, markers=markers)
+
+
+def draw_qr_codes(image: np.ndarray, qr_codes: List[QRCode]) -> np.ndarray:
+    """
+    Draw detected QR codes on the image with text at top-right of bounding box.
+    """
+    return annotate(image, qr_codes=qr_codes)
+
+
 def draw_barcodes(image: np.ndarray, barcodes: List[BarCode]) -> np.ndarray:
     """
     Draw detected barcodes on the image with text at top-right of bounding box.
     """
-    img = image.copy()
-    for i, barcode in enumerate(barcodes):
-        # Use index-based color for barcodes
-        color = _get_color_for_id(i + 2000)  # Different offset for barcodes
-        
-        # Draw bounding polygon
-        corners = np.array(barcode.corners, dtype=np.int32).reshape((-1, 1, 2))
-        cv2.polylines(img, [corners], True, color, 2)
-        
-        # Calculate top-right position for text
-        max_x = max(pt[0] for pt in barcode.corners)
-        min_y = min(pt[1] for pt in barcode.corners)
-        
-        # Add padding to avoid overlap with bounding box
-        text_x = max_x + 5
-        text_y = min_y - 5
-        
-        # Draw barcode label at top-right
-        cv2.putText(img, "BC", (text_x, text_y),
-                    cv2.FONT_HERSHEY_SIMPLEX, 0.6, color, 2, cv2.LINE_AA)
-        
-        # Draw truncated data below the label
-        data_text = barcode.data[:15] + "..." if len(barcode.data) > 15 else barcode.data
-        cv2.putText(img, data_text, (text_x, text_y + 20),
-                    cv2.FONT_HERSHEY_SIMPLEX, 0.4, color, 1, cv2.LINE_AA)
-    
-    return img
+    return annotate(image, barcodes=barcodes)
@@ -0,0 +1,188 @@
+# rvm/detect/onnx_backend.py
+"""
+ONNX Runtime backend for YOLOv8 detection.
+
+The ultralytics weights are exported to ONNX once and cached next to the
+weights file as `<stem>.<sha256[:12]>.<imgsz>.onnx`, so later runs (and other
+processes) load the exported graph directly without importing torch. Exports
+of one weights file are serialized by a lock file, so worker processes that
+start together export once and the others load the finished file.
+Pre-processing, NMS and box rescaling are done in NumPy (rvm.detect.ops).
+"""
+
+import ast
+import hashlib
+import os
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import List, Optional, Sequence
+
+import cv2
+import numpy as np
+
+from rvm.core.hashing import file_digest
+from rvm.core.types import Detections
+from rvm.detect.ops import batched_nms, letterbox, scale_boxes
+
+
+def _cache_path(weights: Path, imgsz: int) -> Path:
+    if weights.exists():
+        digest = file_digest(weights)[:12]
+    else:
+        # Built-in configs such as "yolov8n.yaml" resolved by ultralytics: key by name.
+        digest = hashlib.sha256(str(weights).encode()).hexdigest()[:12]
+    return weights.with_name(f"{weights.stem}.{digest}.{imgsz}.onnx")
+
+
+@contextmanager
+def _export_lock(weights: Path):
+    """Exclusive inter-process lock for exporting `weights` (ultralytics writes <stem>.onnx)."""
+    with open(weights.with_name(f".{weights.name}.export.lock"), "a+b") as f:
+        if os.name == "nt":
+            import msvcrt
+
+            while True:
+                try:
+                    msvcrt.locking(f.fileno(), msvcrt.LK_NBLCK, 1)
+                    break
+                except OSError:
+                    time.sleep(0.1)
+            try:
+                yield
+            finally:
+                f.seek(0)
+                msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+        else:
+            import fcntl
+
+            fcntl.flock(f, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(f, fcntl.LOCK_UN)
+
+
+def export_onnx(model_path: str, imgsz: int = 640) -> str:
+    """
+    Return the path of the ONNX export of `model_path`, exporting it on first use.
+
+    Args:
+        model_path: YOLO weights (.pt). A path ending in .onnx is returned unchanged.
+        imgsz: Export image size (part of the cache key).
+
+    Returns:
+        str: Path to the cached .onnx file.
+    """
+    if str(model_path).endswith(".onnx"):
+        return str(model_path)
+
+    cached = _cache_path(Path(model_path), imgsz)
+    if cached.exists():
+        return str(cached)
+
+    from ultralytics import YOLO
+
+    model = YOLO(model_path)
+    # Weights named by alias (e.g. "yolov8n.pt") are downloaded on load; key by the real file.
+    resolved = Path(getattr(model, "ckpt_path", None) or model_path)
+    cached = _cache_path(resolved, imgsz)
+    if cached.exists():
+        return str(cached)
+
+    with _export_lock(resolved):
+        # Another process may have finished the export while we waited for the lock.
+        if cached.exists():
+            return str(cached)
+        print(f"[INFO] Exporting {model_path} to ONNX (imgsz={imgsz}), cached at {cached}")
+        exported = model.export(format="onnx", imgsz=imgsz, dynamic=True, simplify=False,
+                                verbose=False)
+        os.replace(exported, cached)
+    return str(cached)
+
+
+class OnnxYOLO:
+    """YOLOv8 detector running on ONNX Runtime with NumPy post-processing."""
+
+    def __init__(self, model_path: str = "yolov8n.pt", imgsz: int = 640, conf: float = 0.25,
+                 iou: float = 0.7, max_det: int = 300, device: Optional[str] = None):
+        """
+        Args:
+            model_path: YOLO .pt weights (exported and cached) or an .onnx file.
+            imgsz: Inference image size.
+            conf: Minimum confidence.
+            iou: NMS IoU threshold.
+            max_det: Maximum detections per image.
+            device: "cuda" prefers the CUDA provider when available; default is CPU.
+        """
+        try:
+            import onnxruntime as ort
+        except ImportError as e:
+            raise ImportError(
+                "backend='onnx' requires onnxruntime: pip install onnxruntime onnx"
+            ) from e
+
+        self.imgsz = imgsz
+        self.conf = conf
+        self.iou = iou
+        self.max_det = max_det
+        self.onnx_path = export_onnx(model_path, imgsz)
+
+        providers = ["CPUExecutionProvider"]
+        if device and str(device).startswith("cuda") and \
+                "CUDAExecutionProvider" in ort.get_available_providers():
+            providers.insert(0, "CUDAExecutionProvider")
+        options = ort.SessionOptions()
+        options.intra_op_num_threads = int(os.environ.get("OMP_NUM_THREADS", 0))
+        self.session = ort.InferenceSession(self.onnx_path, options, providers=providers)
+        self.input_name = self.session.get_inputs()[0].name
+
+        meta = self.session.get_modelmeta().custom_metadata_map
+        self.stride = int(meta.get("stride", 32))
+        self.names = ast.literal_eval(meta["names"]) if "names" in meta else {}
+        self.last_timings = {}
+
+    def _preprocess(self, frames: Sequence[np.ndarray]):
+        # Rectangular (minimal) padding when all frames share a shape, square otherwise.
+        auto = len({f.shape for f in frames}) == 1
+        batch, meta = [], []
+        for frame in frames:
+            img, ratio, pad = letterbox(frame, self.imgsz, auto=auto, stride=self.stride)
+            batch.append(cv2.cvtColor(img, cv2.COLOR_BGR2RGB))
+            meta.append((ratio, pad, frame.shape[:2]))
+        x = np.ascontiguousarray(np.stack(batch).transpose(0, 3, 1, 2), dtype=np.float32)
+        x /= 255.0
+        return x, meta
+
+    def _postprocess(self, pred: np.ndarray, ratio: float, pad, shape) -> Detections:
+        pred = pred.T  # (anchors, 4 + num_classes)
+        class_scores = pred[:, 4:]
+        class_ids = class_scores.argmax(axis=1)
+        scores = class_scores[np.arange(len(class_ids)), class_ids]
+        mask = scores > self.conf
+        if not mask.any():
+            return Detections.empty()
+
+        cxcywh, scores, class_ids = pred[mask, :4], scores[mask], class_ids[mask]
+        xyxy = np.empty_like(cxcywh)
+        xyxy[:, :2] = cxcywh[:, :2] - cxcywh[:, 2:] / 2
+        xyxy[:, 2:] = cxcywh[:, :2] + cxcywh[:, 2:] / 2
+
+        keep = batched_nms(xyxy, scores, class_ids, self.iou)[:self.max_det]
+        xyxy = scale_boxes(xyxy[keep], ratio, pad, shape)
+        return Detections(xyxy, scores[keep], class_ids[keep])
+
+    def predict(self, frames: Sequence[np.ndarray]) -> List[Detections]:
+        """Run one forward pass over `frames` and return one Detections per frame."""
+        if not frames:
+            self.last_timings = {}
+            return []
+        t0 = time.perf_counter()
+        x, meta = self._preprocess(frames)
+        t1 = time.perf_counter()
+        preds = self.session.run(None, {self.input_name: x})[0]
+        t2 = time.perf_counter()
+        detections = [self._postprocess(p, *m) for p, m in zip(preds, meta)]
+        self.last_timings = {"preprocess": t1 - t0, "inference": t2 - t1,
+                             "postprocess": time.perf_counter() - t2}
+        return detections
@@ -0,0 +1,104 @@
+# rvm/detect/ops.py
+"""
+NumPy detection post-processing shared by the detector backends:
+- letterbox(image, new_shape, auto, stride)
+- scale_boxes(xyxy, ratio, pad, shape)
+- box_iou(a, b)
+- nms(boxes, scores, iou_threshold)
+- batched_nms(boxes, scores, class_ids, iou_threshold)
+"""
+
+from typing import Tuple
+
+import cv2
+import numpy as np
+
+
+def letterbox(image: np.ndarray, new_shape: int = 640, auto: bool = False, stride: int = 32,
+              color: Tuple[int, int, int] = (114, 114, 114)):
+    """
+    Resize keeping aspect ratio and pad to `new_shape` (same rules as ultralytics).
+
+    Args:
+        image: BGR image (H, W, 3).
+        new_shape: Target square size.
+        auto: Pad only up to the next multiple of `stride` instead of the full square.
+        stride: Model stride.
+
+    Returns:
+        tuple: (padded image, scale ratio, (pad_x, pad_y))
+    """
+    h, w = image.shape[:2]
+    r = min(new_shape / h, new_shape / w)
+    new_unpad = (int(round(w * r)), int(round(h * r)))
+    dw, dh = new_shape - new_unpad[0], new_shape - new_unpad[1]
+    if auto:
+        dw, dh = dw % stride, dh % stride
+    dw, dh = dw / 2, dh / 2
+
+    if (w, h) != new_unpad:
+        image = cv2.resize(image, new_unpad, interpolation=cv2.INTER_LINEAR)
+    top, bottom = int(round(dh - 0.1)), int(round(dh + 0.1))
+    left, right = int(round(dw - 0.1)), int(round(dw + 0.1))
+    image = cv2.copyMakeBorder(image, top, bottom, left, right, cv2.BORDER_CONSTANT, value=color)
+    return image, r, (left, top)
+
+
+def scale_boxes(xyxy: np.ndarray, ratio: float, pad: Tuple[int, int],
+                shape: Tuple[int, int]) -> np.ndarray:
+    """Map letterboxed xyxy boxes back to the original image of size `shape` (H, W)."""
+    xyxy = xyxy.copy()
+    xyxy[:, [0, 2]] -= pad[0]
+    xyxy[:, [1, 3]] -= pad[1]
+    xyxy /= ratio
+    xyxy[:, [0, 2]] = xyxy[:, [0, 2]].clip(0, shape[1])
+    xyxy[:, [1, 3]] = xyxy[:, [1, 3]].clip(0, shape[0])
+    return xyxy
+
+
+def box_iou(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    """Pairwise IoU between (N, 4) and (M, 4) xyxy boxes, returned as (N, M)."""
+    a = np.asarray(a, dtype=np.float32).reshape(-1, 4)
+    b = np.asarray(b, dtype=np.float32).reshape(-1, 4)
+    area_a = (a[:, 2] - a[:, 0]).clip(0) * (a[:, 3] - a[:, 1]).clip(0)
+    area_b = (b[:, 2] - b[:, 0]).clip(0) * (b[:, 3] - b[:, 1]).clip(0)
+    lt = np.maximum(a[:, None, :2], b[None, :, :2])
+    rb = np.minimum(a[:, None, 2:], b[None, :, 2:])
+    wh = (rb - lt).clip(0)
+    inter = wh[..., 0] * wh[..., 1]
+    union = area_a[:, None] + area_b[None, :] - inter
+    return np.where(union > 0, inter / np.maximum(union, 1e-9), 0.0).astype(np.float32)
+
+
+def nms(boxes: np.ndarray, scores: np.ndarray, iou_threshold: float) -> np.ndarray:
+    """
+    Greedy non-maximum suppression.
+
+    Returns:
+        np.ndarray: Indices of kept boxes, highest score first.
+    """
+    boxes = np.asarray(boxes, dtype=np.float32).reshape(-1, 4)
+    x1, y1, x2, y2 = boxes.T
+    areas = (x2 - x1).clip(0) * (y2 - y1).clip(0)
+    order = np.argsort(-np.asarray(scores), kind="stable")
+    keep = []
+    while order.size:
+        i = order[0]
+        keep.append(i)
+        rest = order[1:]
+        w = (np.minimum(x2[i], x2[rest]) - np.maximum(x1[i], x1[rest])).clip(0)
+        h = (np.minimum(y2[i], y2[rest]) - np.maximum(y1[i], y1[rest])).clip(0)
+        inter = w * h
+        iou = inter / np.maximum(areas[i] + areas[rest] - inter, 1e-9)
+        order = rest[iou <= iou_threshold]
+    return np.asarray(keep, dtype=np.int64)
+
+
+def batched_nms(boxes: np.ndarray, scores: np.ndarray, class_ids: np.ndarray,
+                iou_threshold: float) -> np.ndarray:
+    """Class-aware NMS: boxes of different classes never suppress each other."""
+    boxes = np.asarray(boxes, dtype=np.float32).reshape(-1, 4)
+    if len(boxes) == 0:
+        return np.zeros(0, dtype=np.int64)
+    offsets = np.asarray(class_ids, dtype=np.float32)[:, None] * (boxes.max() + 1)
+    return nms(boxes + offsets, scores, iou_threshold)
@@ -0,0 +1,149 @@
+# rvm/detect/slicing.py
+"""
+Sliced (tiled) inference for high-resolution images.
+
+SlicedDetector wraps a detector and runs it on overlapping tiles at native
+resolution (plus, optionally, one pass over the whole image for large
+objects), batching all tiles through the model. Per-tile boxes are shifted
+back to image coordinates and merged across tile borders with either:
+- "nms": class-aware NMS on IoU
+- "fuse": greedy merging of same-class boxes whose intersection covers most of
+  the smaller box (IoS); merged boxes take the enclosing extent and the best
+  score, which rejoins objects cut in two by a tile border.
+"""
+
+from typing import List, Sequence, Tuple
+
+import numpy as np
+
+from rvm.core.types import Detections
+from rvm.detect.ops import batched_nms
+
+MERGE_MODES = ("nms", "fuse")
+
+
+def _starts(length: int, tile: int, step: int) -> List[int]:
+    if length <= tile:
+        return [0]
+    starts = list(range(0, length - tile, step))
+    starts.append(length - tile)  # last tile flush with the border
+    return sorted(set(starts))
+
+
+def tile_windows(height: int, width: int, tile_size: int = 640,
+                 overlap: float = 0.2) -> List[Tuple[int, int, int, int]]:
+    """
+    Compute overlapping tile windows covering an image.
+
+    Args:
+        height, width: Image size.
+        tile_size: Tile side in pixels.
+        overlap: Fraction of the tile shared with its neighbour (0 <= overlap < 1).
+
+    Returns:
+        list of (x1, y1, x2, y2) windows.
+    """
+    if not 0 <= overlap < 1:
+        raise ValueError(f"overlap must be in [0, 1), got {overlap}")
+    step = max(1, int(round(tile_size * (1 - overlap))))
+    return [
+        (x, y, min(x + tile_size, width), min(y + tile_size, height))
+        for y in _starts(height, tile_size, step)
+        for x in _starts(width, tile_size, step)
+    ]
+
+
+def fuse_boxes(detections: Detections, ios_threshold: float = 0.5) -> Detections:
+    """
+    Greedy same-class box merging on intersection-over-smaller-area.
+
+    The highest scoring box absorbs every same-class box that overlaps it by more
+    than `ios_threshold` of the smaller box; the result covers all absorbed boxes.
+    """
+    if len(detections) == 0:
+        return detections
+    xyxy = detections.xyxy
+    areas = (xyxy[:, 2] - xyxy[:, 0]).clip(0) * (xyxy[:, 3] - xyxy[:, 1]).clip(0)
+    order = np.argsort(-detections.scores, kind="stable")
+    out_xyxy, out_scores, out_cls = [], [], []
+    while order.size:
+        i = order[0]
+        rest = order[1:]
+        lt = np.maximum(xyxy[i, :2], xyxy[rest, :2])
+        rb = np.minimum(xyxy[i, 2:], xyxy[rest, 2:])
+        inter = (rb - lt).clip(0).prod(axis=1)
+        ios = inter / np.maximum(np.minimum(areas[i], areas[rest]), 1e-9)
+        same = (detections.class_ids[rest] == detections.class_ids[i]) & (ios > ios_threshold)
+        group = np.concatenate([[i], rest[same]])
+        out_xyxy.append(np.concatenate([xyxy[group, :2].min(axis=0), xyxy[group, 2:].max(axis=0)]))
+        out_scores.append(detections.scores[i])
+        out_cls.append(detections.class_ids[i])
+        order = rest[~same]
+    return Detections(np.stack(out_xyxy), out_scores, out_cls)
+
+
+class SlicedDetector:
+    """Run a detector over overlapping tiles and merge the results."""
+
+    def __init__(self, detector, tile_size: int = 640, overlap: float = 0.2,
+                 full_pass: bool = True, merge: str = "nms", iou: float = 0.5,
+                 batch_size: int = 8):
+        """
+        Args:
+            detector: Object with detect_batch(frames, batch_size) -> List[Detections].
+            tile_size: Tile side in pixels (usually the model input size).
+            overlap: Fraction of overlap between neighbouring tiles.
+            full_pass: Also run the detector on the whole (downscaled) image.
+            merge: "nms" or "fuse" (see module docstring).
+            iou: IoU threshold for "nms", IoS threshold for "fuse".
+            batch_size: Tiles per forward pass.
+        """
+        if merge not in MERGE_MODES:
+            raise ValueError(f"Unknown merge mode {merge!r}, expected one of {MERGE_MODES}")
+        self.detector = detector
+        self.tile_size = tile_size
+        self.overlap = overlap
+        self.full_pass = full_pass
+        self.merge = merge
+        self.iou = iou
+        self.batch_size = batch_size
+
+    @property
+    def names(self):
+        """Class names of the wrapped detector."""
+        return self.detector.names
+
+    def detect(self, image: np.ndarray) -> Detections:
+        """
+        Run tiled detection on one image.
+
+        Args:
+            image (np.ndarray): Input BGR image.
+
+        Returns:
+            Detections: Merged detections in image coordinates.
+        """
+        h, w = image.shape[:2]
+        windows = tile_windows(h, w, self.tile_size, self.overlap)
+        if len(windows) == 1:
+            return self.detector.detect_batch([image], 1)[0]
+
+        frames = [image[y1:y2, x1:x2] for x1, y1, x2, y2 in windows]
+        if self.full_pass:
+            frames.append(image)
+            windows = windows + [(0, 0, w, h)]
+        per_frame = self.detector.detect_batch(frames, self.batch_size)
+
+        shifted = []
+        for (x1, y1, _, _), dets in zip(windows, per_frame):
+            if len(dets):
+                offset = np.array([x1, y1, x1, y1], dtype=np.float32)
+                shifted.append(Detections(dets.xyxy + offset, dets.scores, dets.class_ids))
+        merged = Detections.concatenate(shifted)
+        if self.merge == "fuse":
+            return fuse_boxes(merged, self.iou)
+        return merged[batched_nms(merged.xyxy, merged.scores, merged.class_ids, self.iou)]
+
+    def detect_batch(self, frames: Sequence[np.ndarray], batch_size: int = 8) -> List[Detections]:
+        """Tiled detection for several images (tiles are batched per image)."""
+        return [self.detect(frame) for frame in frames]
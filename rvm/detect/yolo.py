@@ -1,19 +1,97 @@
 # rvm/detect/yolo.py
-import torch
-from ultralytics import YOLO
+import threading
+
 import numpy as np
-from typing import List
+from typing import Dict, List, Optional, Sequence
+
+from rvm.core.types import Detections
 
-from rvm.core.types import Box
+BACKENDS = ("torch", "onnx")
 
 
 class YOLODetector:
-    """Wrapper for YOLOv8 detection."""
+    """
+    Wrapper for YOLOv8 detection.
 
-    def __init__(self, model_path: str = "yolov8n.pt"):
-        self.model = YOLO(model_path)
+    One detector may be shared between threads (rvm.core.registry hands out a
+    single instance per process): forward passes are serialized by an instance
+    lock, and `last_timings` is kept per thread.
+    """
 
-    def detect(self, image: np.ndarray) -> List[Box]:
+    def __init__(self, model_path: str = "yolov8n.pt", device: Optional[str] = None,
+                 imgsz: int = 640, backend: str = "torch", conf: float = 0.25,
+                 iou: float = 0.7):
+        """
+        Args:
+            model_path: YOLO weights file.
+            device: 'cpu', 'cuda', 'mps', ... or None to let ultralytics pick.
+            imgsz: Inference image size.
+            backend: "torch" (ultralytics/PyTorch) or "onnx" (ONNX Runtime, exported
+                once and cached next to the weights).
+            conf: Minimum confidence.
+            iou: NMS IoU threshold.
+        """
+        if backend not in BACKENDS:
+            raise ValueError(f"Unknown backend {backend!r}, expected one of {BACKENDS}")
+        self.model_path = model_path
+        self.device = device
+        self.imgsz = imgsz
+        self.backend = backend
+        self.conf = conf
+        self.iou = iou
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+        if backend == "onnx":
+            from rvm.detect.onnx_backend import OnnxYOLO
+
+            self.model = OnnxYOLO(model_path, imgsz=imgsz, conf=conf, iou=iou, device=device)
+        else:
+            from ultralytics import YOLO
+
+            self.model = YOLO(model_path)
+
+    @property
+    def last_timings(self) -> Dict[str, float]:
+        """Seconds spent in preprocess/inference/postprocess by this thread's last detect call."""
+        return getattr(self._local, "timings", {})
+
+    @last_timings.setter
+    def last_timings(self, timings: Dict[str, float]) -> None:
+        self._local.timings = timings
+
+    @property
+    def names(self) -> Dict[int, str]:
+        """Class index -> class name mapping of the loaded model."""
+        return dict(self.model.names)
+
+    def _to_detections(self, result) -> Detections:
+        """Convert one ultralytics result (one frame) with a single device-to-host copy."""
+        data = result.boxes.data.cpu().numpy()  # (N, 6): x1, y1, x2, y2, conf, cls
+        return Detections(data[:, :4], data[:, -2], data[:, -1])
+
+    def _predict(self, frames: List[np.ndarray]) -> List[Detections]:
+        # ultralytics predictors (and OnnxYOLO.last_timings) are not thread-safe.
+        with self._lock:
+            if self.backend == "onnx":
+                detections = self.model.predict(frames)
+                timings = self.model.last_timings
+            else:
+                results = self.model(frames, verbose=False, device=self.device,
+                                     imgsz=self.imgsz, conf=self.conf, iou=self.iou)
+                detections = [self._to_detections(r) for r in results]
+                # ultralytics reports milliseconds per image of the batch
+                timings = {k: v * len(results) / 1000 for k, v in results[0].speed.items()} \
+                    if results else {}
+        for stage, seconds in timings.items():
+            self.last_timings[stage] = self.last_timings.get(stage, 0.0) + seconds
+        return detections
+
+    def warmup(self) -> None:
+        """Run one dummy inference so the first real call does not pay for lazy setup."""
+        self.detect(np.zeros((self.imgsz, self.imgsz, 3), dtype=np.uint8))
+
+    def detect(self, image: np.ndarray) -> Detections:
         """
         Run object detection on an image.
 
@@ -21,16 +99,28 @@ class YOLODetector:
             image (np.ndarray): Input BGR image.
 
         Returns:
-            List[Box]: List of detection results.
+            Detections: Detection results (iterates as Box objects).
         """
-        results = self.model(image, verbose=False)
-        boxes: List[Box] = []
-
-        for r in results:
-            for b in r.boxes:
-                xyxy = b.xyxy[0].cpu().numpy().astype(int).tolist()
-                conf = float(b.conf.cpu().numpy())
-                cls = int(b.cls.cpu().numpy())
-                boxes.append(Box(x1=xyxy[0], y1=xyxy[1], x2=xyxy[2], y2=xyxy[3],
-                                 confidence=conf, class_id=cls))
-        return boxes
+        self.last_timings = {}
+        return self._predict([image])[0]
+
+    def detect_batch(self, frames: Sequence[np.ndarray], batch_size: int = 8) -> List[Detections]:
+        """
+        Run object detection on several frames, `batch_size` frames per forward pass.
+
+        Args:
+            frames (Sequence[np.ndarray]): Input BGR images.
+            batch_size (int): Maximum number of frames sent to the model at once.
+
+        Returns:
+            List[Detections]: One Detections per input frame, in input order.
+        """
+        if batch_size < 1:
+            raise ValueError(f"batch_size must be >= 1, got {batch_size}")
+
+        self.last_timings = {}
+        all_detections: List[Detections] = []
+        for start in range(0, len(frames), batch_size):
+            chunk = list(frames[start:start + batch_size])
+            all_detections.extend(self._predict(chunk))
+        return all_detections
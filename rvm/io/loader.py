@@ -3,6 +3,8 @@
 Loader utilities for images, videos, and webcam.
 """
 
+import threading
+import time
 import cv2
 from pathlib import Path
 
@@ -48,15 +50,168 @@ def load_video(video_path: str, out_path: str, fps: float = None):
     return cap, writer
 
 
-def load_webcam(index: int = 0):
+def iter_frame_batches(cap, batch_size: int = 1):
+    """
+    Read frames from a capture and group them into batches.
+    Args:
+        cap (VideoCapture): Opened capture to read from.
+        batch_size (int): Number of frames per batch (the last batch may be shorter).
+    Yields:
+        list: Consecutive BGR frames.
+    """
+    if batch_size < 1:
+        raise ValueError(f"batch_size must be >= 1, got {batch_size}")
+    batch = []
+    while True:
+        ret, frame = cap.read()
+        if not ret:
+            break
+        batch.append(frame)
+        if len(batch) == batch_size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def iter_timestamped_frames(cap):
+    """
+    Read every frame from a capture, tagging it with its index and capture time.
+    Args:
+        cap (VideoCapture): Opened capture to read from.
+    Yields:
+        tuple: (frame_idx, capture_ts, frame) with capture_ts from time.time().
+    """
+    frame_idx = 0
+    while True:
+        ret, frame = cap.read()
+        if not ret:
+            break
+        yield frame_idx, time.time(), frame
+        frame_idx += 1
+
+
+class LatestFrameGrabber:
+    """
+    Threaded capture that always hands out the newest frame.
+
+    A background thread keeps reading the capture so the driver buffer never
+    fills up. Frames that are replaced by a newer one before anybody read them
+    are dropped and counted in `dropped`.
+    """
+
+    def __init__(self, cap):
+        """
+        Args:
+            cap (VideoCapture): Opened capture; owned (and released) by the grabber.
+        """
+        self.cap = cap
+        self.captured = 0
+        self.delivered = 0
+        self.dropped = 0
+        self._cond = threading.Condition()
+        self._frame = None
+        self._frame_idx = -1
+        self._capture_ts = 0.0
+        self._pending = False
+        self._ok = True
+        self._running = True
+        self._exited = False
+        self._release_on_exit = False
+        self._thread = threading.Thread(target=self._run, name="rvm-frame-grabber", daemon=True)
+        self._thread.start()
+
+    def _run(self):
+        try:
+            while self._running:
+                ret, frame = self.cap.read()
+                capture_ts = time.time()
+                with self._cond:
+                    if not ret:
+                        self._ok = False
+                        self._cond.notify_all()
+                        return
+                    if self._pending:
+                        self.dropped += 1
+                    self._frame = frame
+                    self._frame_idx = self.captured
+                    self._capture_ts = capture_ts
+                    self.captured += 1
+                    self._pending = True
+                    self._cond.notify_all()
+        finally:
+            with self._cond:
+                self._exited = True
+                release = self._release_on_exit
+            if release:
+                self.cap.release()
+
+    def read_latest(self, timeout: float = None):
+        """
+        Wait for a frame that has not been handed out yet and return it.
+        Args:
+            timeout (float): Maximum seconds to wait (None waits until the stream ends).
+        Returns:
+            tuple or None: (frame_idx, capture_ts, frame), or None once the stream
+            has ended or the timeout expired.
+        """
+        with self._cond:
+            self._cond.wait_for(lambda: self._pending or not self._ok, timeout)
+            if not self._pending:
+                return None
+            self._pending = False
+            self.delivered += 1
+            return self._frame_idx, self._capture_ts, self._frame
+
+    def read(self):
+        """VideoCapture-compatible read returning (ret, frame)."""
+        item = self.read_latest()
+        if item is None:
+            return False, None
+        return True, item[2]
+
+    def __iter__(self):
+        while True:
+            item = self.read_latest()
+            if item is None:
+                return
+            yield item
+
+    def isOpened(self) -> bool:
+        return self._ok and self.cap.isOpened()
+
+    def release(self, timeout: float = 1.0):
+        """
+        Stop the grabber thread and release the capture.
+
+        The capture is never released while the thread may still be inside
+        cap.read(): if the thread does not stop within `timeout` seconds, it
+        releases the capture itself as soon as that read returns.
+        """
+        self._running = False
+        self._thread.join(timeout=timeout)
+        with self._cond:
+            release_now = self._exited
+            self._release_on_exit = not release_now
+        if release_now:
+            self.cap.release()
+        else:
+            print(f"[WARN] Frame grabber still reading after {timeout}s; "
+                  "the capture is released when the read returns")
+
+
+def load_webcam(index: int = 0, latest_only: bool = False):
     """
     Open webcam stream.
     Args:
         index (int): Webcam index (default=0).
+        latest_only (bool): Wrap the capture in a LatestFrameGrabber that drops stale frames.
     Returns:
-        VideoCapture
+        VideoCapture or LatestFrameGrabber
     """
     cap = cv2.VideoCapture(index)
     if not cap.isOpened():
         raise IOError("Cannot open webcam")
+    if latest_only:
+        return LatestFrameGrabber(cap)
     return cap
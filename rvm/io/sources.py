@@ -0,0 +1,60 @@
+# rvm/io/sources.py
+"""
+Resolve image collections given as a directory, glob pattern, text file list,
+or Python list of paths.
+"""
+
+import glob
+from pathlib import Path
+from typing import List, Sequence, Union
+
+IMAGE_EXTENSIONS = (".jpg", ".jpeg", ".png", ".bmp", ".tif", ".tiff", ".webp")
+
+Source = Union[str, Path, Sequence[Union[str, Path]]]
+
+
+def is_image_collection(source: Source) -> bool:
+    """
+    Return True if `source` names several images rather than one image, video or webcam.
+    Args:
+        source: Directory, glob pattern, .txt file list, list of paths, or a single path.
+    """
+    if isinstance(source, (list, tuple)):
+        return True
+    source = str(source)
+    if any(ch in source for ch in "*?["):
+        return True
+    if source.lower().endswith(".txt"):
+        return True
+    return Path(source).is_dir()
+
+
+def resolve_images(source: Source, recursive: bool = True) -> List[str]:
+    """
+    Expand an image collection into a sorted, de-duplicated list of file paths.
+    Args:
+        source: Directory, glob pattern, .txt file list (one path per line), or list of paths.
+        recursive (bool): Search sub-directories when `source` is a directory.
+    Returns:
+        list of str: Image paths.
+    """
+    if isinstance(source, (list, tuple)):
+        paths = [str(p) for p in source]
+        return list(dict.fromkeys(paths))
+
+    source = str(source)
+    if Path(source).is_dir():
+        pattern = "**/*" if recursive else "*"
+        paths = [str(p) for p in Path(source).glob(pattern)
+                 if p.is_file() and p.suffix.lower() in IMAGE_EXTENSIONS]
+    elif any(ch in source for ch in "*?["):
+        paths = [p for p in glob.glob(source, recursive=True)
+                 if p.lower().endswith(IMAGE_EXTENSIONS)]
+    elif source.lower().endswith(".txt"):
+        with open(source) as f:
+            lines = [line.strip() for line in f]
+        return list(dict.fromkeys(line for line in lines if line and not line.startswith("#")))
+    else:
+        raise ValueError(f"Not an image collection: {source}")
+
+    return sorted(set(paths))
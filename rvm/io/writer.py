@@ -1,5 +1,7 @@
+import gzip
 import json
 import os
+import time
 import cv2 as cv
 
 def save_json(data, path):
@@ -7,6 +9,92 @@ def save_json(data, path):
         json.dump(data, f, indent=2)
 
 
+class JsonlWriter:
+    """
+    Streaming JSON Lines writer: one compact JSON record per line.
+
+    Records are flushed to disk every `flush_interval` seconds or once
+    `flush_bytes` of unflushed data accumulate, so a crash loses at most that
+    window. Paths ending in ".gz" (or compress=True) are gzip-compressed; each
+    flush emits a gzip sync point so the file stays readable up to it.
+    """
+
+    def __init__(self, path, compress: bool = None, append: bool = False,
+                 flush_interval: float = 1.0, flush_bytes: int = 1 << 20):
+        """
+        Args:
+            path: Output file path.
+            compress: Gzip the output. Defaults to True when `path` ends with ".gz".
+            append: Append to an existing file instead of truncating it.
+            flush_interval: Maximum seconds between flushes.
+            flush_bytes: Flush once this many bytes are buffered.
+        """
+        self.path = str(path)
+        self.compress = self.path.endswith(".gz") if compress is None else compress
+        self.flush_interval = flush_interval
+        self.flush_bytes = flush_bytes
+        mode = "at" if append else "wt"
+        if self.compress:
+            self._fh = gzip.open(self.path, mode, encoding="utf-8")
+        else:
+            self._fh = open(self.path, mode, encoding="utf-8")
+        self._pending = 0
+        self._last_flush = time.monotonic()
+        self.records = 0
+
+    def write(self, record) -> None:
+        line = json.dumps(record, separators=(",", ":")) + "\n"
+        self._fh.write(line)
+        self.records += 1
+        self._pending += len(line)
+        if (self._pending >= self.flush_bytes
+                or time.monotonic() - self._last_flush >= self.flush_interval):
+            self.flush()
+
+    def flush(self) -> None:
+        self._fh.flush()
+        self._pending = 0
+        self._last_flush = time.monotonic()
+
+    def close(self) -> None:
+        if not self._fh.closed:
+            self._fh.flush()
+            self._fh.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def read_jsonl(path):
+    """
+    Iterate over the records of a (optionally gzipped) JSON Lines file.
+
+    A truncated last line, e.g. from a run that was killed mid-write, is skipped.
+    """
+    path = str(path)
+    opener = gzip.open if path.endswith(".gz") else open
+    with opener(path, "rt", encoding="utf-8") as f:
+        try:
+            lines = iter(f)
+            for line in lines:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    if next(lines, None) is None:
+                        return
+                    raise
+                yield record
+        except EOFError:
+            # gzip stream cut off after its last sync point
+            return
+
+
 def save_video(output_path, fps, width, height):
     fourcc = cv.VideoWriter_fourcc(*"mp4v")  # codec mp4
     return cv.VideoWriter(output_path, fourcc, fps, (width, height))
@@ -1,7 +1,9 @@
 # rvm/markers/aruco.py
 import cv2
-from typing import List
+import numpy as np
+from typing import List, Union
 
+from rvm.core.frame import FrameContext
 from rvm.core.types import Marker
 
 
@@ -11,24 +13,27 @@ class ArucoDetector:
     def __init__(self, dictionary=cv2.aruco.DICT_6X6_250):
         self.aruco_dict = cv2.aruco.getPredefinedDictionary(dictionary)
         self.parameters = cv2.aruco.DetectorParameters()
+        # Built once; detectMarkers does not change the detector's state.
+        self.detector = cv2.aruco.ArucoDetector(self.aruco_dict, self.parameters)
 
-    def detect(self, image) -> List[Marker]:
+    def detect(self, image: Union[np.ndarray, FrameContext]) -> List[Marker]:
         """
         Detect ArUco markers in the image.
 
         Args:
-            image (np.ndarray): Input BGR image.
+            image (np.ndarray or FrameContext): Input BGR image, or a FrameContext
+                whose (shared) gray view is used.
 
         Returns:
             List[Marker]: List of detected markers with IDs and corners.
         """
-        detector = cv2.aruco.ArucoDetector(self.aruco_dict, self.parameters)
-        corners, ids, _ = detector.detectMarkers(image)
+        corners, ids, _ = self.detector.detectMarkers(FrameContext.of(image).gray)
         markers: List[Marker] = []
 
         if ids is not None:
-            for i, corner in enumerate(corners):
-                points = [(int(x), int(y)) for x, y in corner[0]]
-                markers.append(Marker(id=int(ids[i][0]), corners=points))
+            # ids is (N, 1) in OpenCV 4 and (N,) in OpenCV 5
+            for marker_id, corner in zip(np.asarray(ids).ravel(), corners):
+                points = [(int(x), int(y)) for x, y in np.asarray(corner).reshape(-1, 2)]
+                markers.append(Marker(id=int(marker_id), corners=points))
         return markers
 
@@ -1,16 +1,51 @@
+import time
 import cv2
-from typing import List, Optional, Set
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Iterator, List, Optional, Set, Tuple
 from pyzbar import pyzbar
 from pyzbar.pyzbar import ZBarSymbol
 
+from rvm.core.frame import FrameContext
 from rvm.core.types import QRCode, BarCode
+from rvm.markers.localize import MATRIX, find_code_regions
+
+# Symbologies tried first for 2D (matrix) candidate regions; the rest are linear.
+MATRIX_SYMBOLS = {ZBarSymbol.QRCODE}
+
+# Preprocessing steps of cascade mode, cheapest first.
+CASCADE_STEPS = ("gray", "equalize", "clahe", "binarize", "upscale")
+
+
+def _cascade_views(frame: FrameContext, steps) -> Iterator[Tuple[str, Any, float]]:
+    """Yield (step, image, scale) lazily so unused steps cost nothing."""
+    gray = frame.gray
+    for step in steps:
+        if step == "gray":
+            yield step, gray, 1.0
+        elif step == "equalize":
+            yield step, frame.equalized, 1.0
+        elif step == "clahe":
+            yield step, cv2.createCLAHE(clipLimit=2.0, tileGridSize=(8, 8)).apply(gray), 1.0
+        elif step == "binarize":
+            yield step, cv2.adaptiveThreshold(gray, 255, cv2.ADAPTIVE_THRESH_GAUSSIAN_C,
+                                              cv2.THRESH_BINARY, 31, 10), 1.0
+        elif step == "upscale":
+            yield step, cv2.resize(gray, None, fx=2.0, fy=2.0, interpolation=cv2.INTER_CUBIC), 2.0
+        else:
+            raise ValueError(f"Unknown cascade step {step!r}, expected one of {CASCADE_STEPS}")
 
 class BarCodesDetector:
     """Detected barcode and QR Code detector using pyzbar."""
 
     def __init__(self, symbols: Optional[Set[ZBarSymbol]] = None,
                  convert_to_grayscale: bool = True,
-                 enhance_image: bool = False):
+                 enhance_image: bool = False,
+                 localize: bool = False,
+                 localize_side: int = 1024,
+                 max_workers: int = 4,
+                 cascade: bool = False,
+                 cascade_steps: Tuple[str, ...] = CASCADE_STEPS,
+                 expected: Optional[int] = None):
                  
         """
         Initialize the barcode detector.
@@ -19,6 +54,17 @@ class BarCodesDetector:
             symbols: Set of barcode symbols to detect. If None, detects all supported types.
             convert_to_grayscale: Whether to convert image to grayscale for better detection.
             enhance_image: Whether to apply image enhancement historgram equalization technique.
+            localize: Find candidate code regions on a downscaled copy and decode only
+                those crops (falls back to a full-frame scan when none are found).
+                Much faster on large images.
+            localize_side: Longer side of the downscaled copy used for localization.
+            max_workers: Threads decoding candidate crops in parallel.
+            cascade: Decode the plain grayscale image first and escalate through
+                `cascade_steps` (equalize, CLAHE, binarize, 2x upscale) only while
+                fewer than `expected` codes (default: any code) have been found.
+                Per-step timings are returned by `detect_with_report`.
+            cascade_steps: Preprocessing steps tried in cascade mode, in order.
+            expected: Number of codes after which the cascade stops.
         """
 
         # Configure which barcode types to detect
@@ -39,53 +85,169 @@ class BarCodesDetector:
         
         self.convert_to_grayscale = convert_to_grayscale
         self.enhance_image = enhance_image
+        self.localize = localize
+        self.localize_side = localize_side
+        self.max_workers = max_workers
+        self._pool: Optional[ThreadPoolExecutor] = None
+        self.cascade = cascade
+        self.cascade_steps = tuple(cascade_steps)
+        self.expected = expected
 
     def _preprocess_image(self, image):
         """
         Preprocess the image for better detection using histogram equalization.
         
         Args:
-            image (np.ndarray): Input BGR image.
+            image (np.ndarray or FrameContext): Input BGR image.
             
         Returns:
             np.ndarray: Preprocessed image.
         """
-        # Convert BGR to RGB for pyzbar
-        processed_image = cv2.cvtColor(image, cv2.COLOR_BGR2RGB)
-        
+        frame = FrameContext.of(image)
         if self.convert_to_grayscale:
-            processed_image = cv2.cvtColor(processed_image, cv2.COLOR_RGB2GRAY)
-        
+            # Shared views: BGR -> GRAY directly, equalized at most once per frame
+            return frame.equalized if self.enhance_image else frame.gray
+
+        # RGB for pyzbar
+        processed_image = frame.rgb
         if self.enhance_image:
-            # Apply histogram equalization for better contrast
-            if len(processed_image.shape) == 2:  # Grayscale
-                processed_image = cv2.equalizeHist(processed_image)
-            else:  # RGB
-                processed_image = cv2.convertScaleAbs(processed_image, alpha=1.2, beta=10)
-        
+            processed_image = cv2.convertScaleAbs(processed_image, alpha=1.2, beta=10)
         return processed_image
 
 
-    def detect(self, image) -> tuple[List[QRCode], List[BarCode]]:
+    def _decode_crop(self, processed_image, region) -> list:
+        """Decode one candidate crop, trying the symbologies that match its shape first."""
+        x1, y1, x2, y2 = region.window
+        crop = processed_image[y1:y2, x1:x2]
+        preferred = MATRIX_SYMBOLS if region.kind == MATRIX else self.symbols - MATRIX_SYMBOLS
+        first = self.symbols & preferred
+        codes = pyzbar.decode(crop, symbols=first) if first else []
+        rest = self.symbols - first
+        if not codes and rest:
+            codes = pyzbar.decode(crop, symbols=rest)
+        return [(code, (x1, y1)) for code in codes]
+
+    def _decode_regions(self, processed_image, regions) -> list:
+        """Decode candidate regions in parallel, dropping codes read by several crops."""
+        if self._pool is None:
+            self._pool = ThreadPoolExecutor(max_workers=self.max_workers,
+                                            thread_name_prefix="rvm-barcode")
+        found, seen = [], set()
+        for codes in self._pool.map(lambda r: self._decode_crop(processed_image, r), regions):
+            for code, offset in codes:
+                # Overlapping crops can read the same code twice.
+                key = (code.type, code.data, (code.rect.left + offset[0]) // 16,
+                       (code.rect.top + offset[1]) // 16)
+                if key not in seen:
+                    seen.add(key)
+                    found.append((code, offset))
+        return found
+
+    def _decode_localized(self, processed_image) -> Optional[list]:
+        """Decode localized candidate regions; None when localization found nothing."""
+        gray = processed_image if processed_image.ndim == 2 else \
+            cv2.cvtColor(processed_image, cv2.COLOR_RGB2GRAY)
+        regions = find_code_regions(gray, max_side=self.localize_side)
+        if not regions:
+            return None
+        return self._decode_regions(processed_image, regions)
+
+    def _decode(self, processed_image) -> list:
+        """Decode one preprocessed image; returns (code, crop offset) pairs."""
+        detected_codes = self._decode_localized(processed_image) if self.localize else None
+        if detected_codes is None:
+            detected_codes = [(code, (0, 0)) for code in
+                              pyzbar.decode(processed_image, symbols=self.symbols)]
+        return detected_codes
+
+    def _decode_cascade(self, frame: FrameContext,
+                        expected: Optional[int]) -> Tuple[list, List[Dict[str, Any]]]:
+        """Escalate through the cascade steps until enough codes are found. Returns (codes, report)."""
+        wanted = expected or 1
+        found, seen, report = [], set(), []
+        start = time.perf_counter()
+        for step, view, scale in _cascade_views(frame, self.cascade_steps):
+            new = 0
+            for code, (dx, dy) in self._decode(view):
+                # Codes read again by a later step are kept once (by payload and position).
+                key = (code.type, code.data, int((code.rect.left + dx) / scale) // 16,
+                       int((code.rect.top + dy) / scale) // 16)
+                if key not in seen:
+                    seen.add(key)
+                    found.append((code, (dx, dy), scale))
+                    new += 1
+            now = time.perf_counter()
+            report.append({"step": step, "ms": round((now - start) * 1000, 3),
+                                     "new": new, "total": len(found)})
+            start = now
+            if len(found) >= wanted:
+                break
+        return found, report
+
+    def detect(self, image, expected: Optional[int] = None) -> Tuple[List[QRCode], List[BarCode]]:
         """
         Detect every barcode type present in the image
         
         Args:
-            image (np.ndarray): Input BGR image.
+            image (np.ndarray or FrameContext): Input BGR image, or a FrameContext
+                shared with other detectors of the same frame.
+            expected (int): Cascade mode only: stop escalating once this many codes
+                were found (default: the detector's `expected`, or any code).
             
         Returns:
             tuple: (List of QR codes, List of barcodes)
         """
+        qr_codes, bar_codes, _ = self.detect_with_report(image, expected)
+        return qr_codes, bar_codes
 
+    def detect_with_report(self, image, expected: Optional[int] = None
+                           ) -> Tuple[List[QRCode], List[BarCode], List[Dict[str, Any]]]:
+        """
+        Like `detect`, also returning the cascade report of this call.
+
+        The report is returned rather than stored on the detector, which is
+        shared between threads by the model registry.
+
+        Returns:
+            tuple: (List of QR codes, List of barcodes, report) where report has one
+            {"step", "ms", "new", "total"} dict per cascade step tried (empty
+            outside cascade mode).
+        """
+        report = []
+        if self.cascade:
+            detected_codes, report = self._decode_cascade(FrameContext.of(image),
+                                                          expected or self.expected)
+        else:
+            processed_image = self._preprocess_image(image)
+            detected_codes = [(code, offset, 1.0) for code, offset in self._decode(processed_image)]
+        return (*self._to_results(detected_codes), report)
+
+    def detect_regions(self, image, regions) -> Tuple[List[QRCode], List[BarCode]]:
+        """
+        Decode only the given regions of the image (no localization, no cascade).
+
+        Args:
+            image (np.ndarray or FrameContext): Input BGR image.
+            regions (list of CodeRegion): Full-resolution windows to decode.
+
+        Returns:
+            tuple: (List of QR codes, List of barcodes) in image coordinates.
+        """
+        if not regions:
+            return [], []
         processed_image = self._preprocess_image(image)
-        detected_codes = pyzbar.decode(processed_image, symbols=self.symbols)
-        
+        return self._to_results([(code, offset, 1.0) for code, offset in
+                                 self._decode_regions(processed_image, regions)])
+
+    def _to_results(self, detected_codes) -> Tuple[List[QRCode], List[BarCode]]:
+        """Convert (code, crop offset, scale) triples to QRCode/BarCode objects."""
         qr_codes: List[QRCode] = []
         barcodes: List[BarCode] = []
         
-        for code in detected_codes:
+        for code, (dx, dy), scale in detected_codes:
             try:
-                corners = [(int(point.x), int(point.y)) for point in code.polygon]
+                corners = [(int((point.x + dx) / scale), int((point.y + dy) / scale))
+                           for point in code.polygon]
                 data = code.data.decode('utf-8')
                 
                 if code.type == 'QRCODE':
@@ -110,7 +272,7 @@ class BarCodesDetector:
         Returns:
             List[QRCode]: List of QR codes with data and corners.
         """
-        qr_codes, _ = self.detect_all(image)
+        qr_codes, _ = self.detect(image)
         return qr_codes
 
 
@@ -124,5 +286,5 @@ class BarCodesDetector:
         Returns:
             List[BarCode]: List of barcodes with data and corners.
         """
-        _, barcodes = self.detect_all(image)
+        _, barcodes = self.detect(image)
         return barcodes
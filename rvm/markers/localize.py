@@ -0,0 +1,119 @@
+# rvm/markers/localize.py
+"""
+Barcode / QR code localization on a downscaled image.
+
+Codes are regions of dense, high-contrast edges. find_code_regions() looks
+for them on a reduced grayscale copy:
+morphological gradient -> blur -> Otsu threshold -> closing -> contours.
+It returns padded full-resolution crop windows so the decoder only has to
+scan small crops instead of the whole frame.
+
+Each region is also classified with the coherence of its structure tensor:
+1D barcodes have one dominant edge orientation (high coherence), while 2D
+codes such as QR have edges in every direction (low coherence). The decoder
+uses this to try only the matching symbologies first.
+"""
+
+from dataclasses import dataclass
+from typing import List, Tuple
+
+import cv2
+import numpy as np
+
+LINEAR = "linear"   # 1D barcodes (EAN, UPC, Code 128, ...)
+MATRIX = "matrix"   # 2D codes (QR)
+
+
+@dataclass
+class CodeRegion:
+    """Candidate code region in full-resolution pixel coordinates."""
+    x1: int
+    y1: int
+    x2: int
+    y2: int
+    kind: str  # LINEAR or MATRIX
+
+    @property
+    def window(self) -> Tuple[int, int, int, int]:
+        return self.x1, self.y1, self.x2, self.y2
+
+
+def _coherence(gx: np.ndarray, gy: np.ndarray) -> float:
+    jxx, jyy, jxy = float((gx * gx).sum()), float((gy * gy).sum()), float((gx * gy).sum())
+    trace = jxx + jyy
+    if trace <= 0:
+        return 0.0
+    return float(np.sqrt((jxx - jyy) ** 2 + 4 * jxy ** 2) / trace)
+
+
+def find_code_regions(gray: np.ndarray, max_side: int = 1024, min_area: float = 0.0005,
+                      pad: float = 0.15, coherence_threshold: float = 0.5) -> List[CodeRegion]:
+    """
+    Find candidate barcode/QR regions.
+
+    Args:
+        gray (np.ndarray): Grayscale image (full resolution).
+        max_side: The image is downscaled so its longer side is at most this.
+        min_area: Minimum region area as a fraction of the image area.
+        pad: Padding added around each region, as a fraction of its size (quiet zone).
+        coherence_threshold: Regions above it are classified as linear barcodes.
+
+    Returns:
+        list of CodeRegion (overlapping candidates merged), largest first.
+    """
+    h, w = gray.shape[:2]
+    scale = min(1.0, max_side / max(h, w))
+    small = cv2.resize(gray, (max(1, round(w * scale)), max(1, round(h * scale))),
+                       interpolation=cv2.INTER_AREA) if scale < 1.0 else gray
+    sh, sw = small.shape[:2]
+
+    k = max(3, (min(sh, sw) // 160) | 1)  # odd kernel sizes, proportional to the image
+    grad = cv2.morphologyEx(small, cv2.MORPH_GRADIENT, cv2.getStructuringElement(cv2.MORPH_RECT, (3, 3)))
+    grad = cv2.blur(grad, (k, k))
+    _, binary = cv2.threshold(grad, 0, 255, cv2.THRESH_BINARY | cv2.THRESH_OTSU)
+    closed = cv2.morphologyEx(binary, cv2.MORPH_CLOSE,
+                              cv2.getStructuringElement(cv2.MORPH_RECT, (3 * k, 3 * k)))
+    closed = cv2.morphologyEx(closed, cv2.MORPH_OPEN,
+                              cv2.getStructuringElement(cv2.MORPH_RECT, (2 * k, 2 * k)))
+    contours, _ = cv2.findContours(closed, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
+
+    gx = cv2.Sobel(small, cv2.CV_32F, 1, 0, ksize=3)
+    gy = cv2.Sobel(small, cv2.CV_32F, 0, 1, ksize=3)
+
+    regions = []
+    for contour in sorted(contours, key=cv2.contourArea, reverse=True):
+        x, y, bw, bh = cv2.boundingRect(contour)
+        if bw * bh < min_area * sh * sw:
+            continue
+        # Code regions fill most of their box; long thin edges (shelves, text lines) do not.
+        if cv2.contourArea(contour) < 0.4 * bw * bh:
+            continue
+        coherence = _coherence(gx[y:y + bh, x:x + bw], gy[y:y + bh, x:x + bw])
+        px, py = pad * bw, pad * bh
+        regions.append(CodeRegion(
+            x1=max(0, int((x - px) / scale)), y1=max(0, int((y - py) / scale)),
+            x2=min(w, int(np.ceil((x + bw + px) / scale))), y2=min(h, int(np.ceil((y + bh + py) / scale))),
+            kind=LINEAR if coherence >= coherence_threshold else MATRIX,
+        ))
+    return _merge_overlapping(regions)
+
+
+def _merge_overlapping(regions: List[CodeRegion]) -> List[CodeRegion]:
+    """Union overlapping windows (wide gaps can split one barcode into pieces)."""
+    merged = list(regions)
+    changed = True
+    while changed:
+        changed = False
+        out: List[CodeRegion] = []
+        for r in merged:
+            for m in out:
+                if r.x1 < m.x2 and m.x1 < r.x2 and r.y1 < m.y2 and m.y1 < r.y2:
+                    # Larger region (earlier in the list) keeps its classification.
+                    m.x1, m.y1 = min(m.x1, r.x1), min(m.y1, r.y1)
+                    m.x2, m.y2 = max(m.x2, r.x2), max(m.y2, r.y2)
+                    changed = True
+                    break
+            else:
+                out.append(r)
+        merged = out
+    return merged
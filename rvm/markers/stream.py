@@ -0,0 +1,221 @@
+# rvm/markers/stream.py
+"""
+Marker / QR / barcode detection on video streams with decode reuse.
+
+Payload decoding (pyzbar) is by far the most expensive step of code
+detection, but in a stream the same codes stay in view for many frames.
+StreamingMarkerDetector decodes each code once and then follows it:
+
+- feature points inside every known code are tracked frame to frame with
+  pyramidal Lucas-Kanade optical flow (forward-backward checked), and a
+  similarity transform fitted with RANSAC moves the code's corners;
+- the tracking confidence of a code is the fraction of its points that are
+  RANSAC inliers. While it stays above `min_confidence` the stored payload is
+  reused; when it drops, only a window around the last known position is
+  decoded again;
+- new codes are looked for every `scan_every` frames by localizing candidate
+  regions and decoding only those not covered by a tracked code.
+
+ArUco markers are cheap to detect and are detected on every frame.
+"""
+
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+
+import cv2
+import numpy as np
+
+from rvm.core.frame import FrameContext
+from rvm.core.types import BarCode, Marker, QRCode
+from rvm.markers.localize import LINEAR, MATRIX, CodeRegion, find_code_regions
+
+_LK_PARAMS = dict(winSize=(21, 21), maxLevel=3,
+                  criteria=(cv2.TERM_CRITERIA_EPS | cv2.TERM_CRITERIA_COUNT, 20, 0.03))
+
+
+@dataclass(eq=False)
+class CodeTrack:
+    """One decoded code followed across frames (compared by identity)."""
+    track_id: int
+    kind: str                 # "qr_code" or "barcode"
+    data: str
+    corners: np.ndarray       # (K, 2) float32 polygon in image coordinates
+    points: np.ndarray        # (P, 2) float32 feature points tracked between frames
+    confidence: float = 1.0
+    reused: bool = False      # payload carried over (not decoded) on the last frame
+
+    @property
+    def window(self) -> Tuple[float, float, float, float]:
+        (x1, y1), (x2, y2) = self.corners.min(axis=0), self.corners.max(axis=0)
+        return float(x1), float(y1), float(x2), float(y2)
+
+    def to_code(self):
+        corners = [(int(round(x)), int(round(y))) for x, y in self.corners]
+        cls = QRCode if self.kind == "qr_code" else BarCode
+        return cls(data=self.data, corners=corners)
+
+    def to_dict(self) -> Dict:
+        return {**self.to_code().to_dict(), "track_id": self.track_id,
+                "confidence": round(self.confidence, 3), "reused": self.reused}
+
+
+class StreamingMarkerDetector:
+    """Per-stream marker and code detector that decodes every code only once."""
+
+    def __init__(self, aruco=None, codes=None, min_confidence: float = 0.6,
+                 scan_every: int = 5, max_points: int = 40, fb_error: float = 1.5,
+                 pad: float = 0.3):
+        """
+        Args:
+            aruco: ArucoDetector (default: the shared registry instance).
+            codes: BarCodesDetector used for (re-)decoding (default: registry instance).
+            min_confidence: Tracks whose inlier fraction falls below this are decoded again.
+            scan_every: Look for new codes every N frames (1 = every frame).
+            max_points: Feature points tracked per code.
+            fb_error: Maximum forward-backward optical-flow error (pixels) of a point.
+            pad: Padding of the re-decode window, as a fraction of the code size.
+        """
+        if aruco is None or codes is None:
+            from rvm.core.registry import get_aruco_detector, get_barcode_detector
+            aruco = aruco or get_aruco_detector()
+            codes = codes or get_barcode_detector()
+        if scan_every < 1:
+            raise ValueError(f"scan_every must be >= 1, got {scan_every}")
+        self.aruco = aruco
+        self.codes = codes
+        self.min_confidence = min_confidence
+        self.scan_every = scan_every
+        self.max_points = max_points
+        self.fb_error = fb_error
+        self.pad = pad
+        self.reset()
+
+    def reset(self) -> None:
+        """Forget all tracks (e.g. after a scene cut)."""
+        self.tracks: List[CodeTrack] = []
+        self.frame_idx = 0
+        self.decoded = 0     # codes whose payload was decoded
+        self.reused = 0      # code observations served from a track
+        self._next_id = 1
+        self._prev_gray: Optional[np.ndarray] = None
+
+    # -- tracking -----------------------------------------------------------
+
+    def _features(self, gray: np.ndarray, corners: np.ndarray) -> np.ndarray:
+        """Good features inside the code polygon, plus the polygon corners."""
+        h, w = gray.shape
+        x1, y1 = np.floor(corners.min(axis=0)).astype(int).clip(0, [w - 1, h - 1])
+        x2, y2 = np.ceil(corners.max(axis=0)).astype(int).clip(0, [w - 1, h - 1]) + 1
+        mask = np.zeros((y2 - y1, x2 - x1), np.uint8)
+        cv2.fillConvexPoly(mask, cv2.convexHull((corners - [x1, y1]).astype(np.int32)), 255)
+        pts = cv2.goodFeaturesToTrack(gray[y1:y2, x1:x2], self.max_points, 0.01, 3, mask=mask)
+        pts = np.empty((0, 2), np.float32) if pts is None else pts.reshape(-1, 2) + [x1, y1]
+        return np.concatenate([pts, corners]).astype(np.float32)
+
+    def _propagate(self, gray: np.ndarray) -> List[CodeTrack]:
+        """Move every track to the new frame; returns the tracks that were lost."""
+        p0 = np.concatenate([t.points for t in self.tracks]).reshape(-1, 1, 2)
+        # One forward and one backward pass for the points of all codes at once.
+        p1, st1, _ = cv2.calcOpticalFlowPyrLK(self._prev_gray, gray, p0, None, **_LK_PARAMS)
+        pb, st2, _ = cv2.calcOpticalFlowPyrLK(gray, self._prev_gray, p1, None, **_LK_PARAMS)
+        ok = (st1.ravel() == 1) & (st2.ravel() == 1) & \
+            (np.linalg.norm((pb - p0).reshape(-1, 2), axis=1) < self.fb_error)
+        p0, p1 = p0.reshape(-1, 2), p1.reshape(-1, 2)
+
+        lost, start = [], 0
+        for track in self.tracks:
+            sl = slice(start, start + len(track.points))
+            start = sl.stop
+            good = ok[sl]
+            src, dst = p0[sl][good], p1[sl][good]
+            matrix, inliers = (None, None) if len(src) < 4 else cv2.estimateAffinePartial2D(
+                src, dst, method=cv2.RANSAC, ransacReprojThreshold=2.0)
+            track.confidence = 0.0 if matrix is None else float(inliers.sum()) / len(track.points)
+            if track.confidence < self.min_confidence:
+                lost.append(track)
+                continue
+            track.corners = cv2.transform(track.corners[None], matrix)[0]
+            track.points = dst[inliers.ravel() == 1]
+            if len(track.points) < self.max_points // 2:
+                track.points = self._features(gray, track.corners)
+        return lost
+
+    def _region(self, window, kind: str, shape) -> CodeRegion:
+        h, w = shape[:2]
+        x1, y1, x2, y2 = window
+        px, py = self.pad * (x2 - x1) + 8, self.pad * (y2 - y1) + 8
+        return CodeRegion(x1=max(0, int(x1 - px)), y1=max(0, int(y1 - py)),
+                          x2=min(w, int(np.ceil(x2 + px))), y2=min(h, int(np.ceil(y2 + py))),
+                          kind=MATRIX if kind == "qr_code" else LINEAR)
+
+    # -- detection ----------------------------------------------------------
+
+    def detect(self, frame) -> Tuple[List[Marker], List[QRCode], List[BarCode]]:
+        """
+        Process the next frame of the stream.
+
+        Args:
+            frame (np.ndarray or FrameContext): BGR frame.
+
+        Returns:
+            tuple: (markers, QR codes, barcodes). Per-code track ids, confidences and
+            whether the payload was reused are available in `tracks`.
+        """
+        ctx = FrameContext.of(frame)
+        gray = ctx.gray
+        markers = self.aruco.detect(ctx)
+
+        lost = self._propagate(gray) if self.tracks and self._prev_gray is not None else []
+        live = [t for t in self.tracks if t not in lost]
+        regions = [self._region(t.window, t.kind, gray.shape) for t in lost]
+
+        scan = self.frame_idx % self.scan_every == 0
+        if scan:
+            covered = [self._region(t.window, t.kind, gray.shape) for t in live]
+            for r in find_code_regions(gray, max_side=self.codes.localize_side):
+                if not any(r.x1 < c.x2 and c.x1 < r.x2 and r.y1 < c.y2 and c.y1 < r.y2
+                           for c in covered + regions):
+                    regions.append(r)
+
+        if scan and not regions and not live:
+            # Localization found nothing: fall back to one full-frame scan.
+            qr_codes, bar_codes = self.codes.detect(ctx)
+        else:
+            qr_codes, bar_codes = self.codes.detect_regions(ctx, regions)
+
+        for t in live:
+            t.reused = True
+        self.reused += len(live)
+        decoded = [("qr_code", c) for c in qr_codes] + [("barcode", c) for c in bar_codes]
+        self.decoded += len(decoded)
+        for kind, code in decoded:
+            corners = np.asarray(code.corners, np.float32).reshape(-1, 2)
+            if any(t.kind == kind and t.data == code.data and
+                   _overlaps(t.window, corners) for t in live):
+                continue  # already tracked (window of a lost track overlapped a live one)
+            # A lost code read again at its last position keeps its track id.
+            previous = next((t for t in lost if t.kind == kind and t.data == code.data), None)
+            if previous is not None:
+                lost.remove(previous)
+                track_id = previous.track_id
+            else:
+                track_id, self._next_id = self._next_id, self._next_id + 1
+            live.append(CodeTrack(track_id, kind, code.data, corners,
+                                  self._features(gray, corners)))
+
+        self.tracks = live
+        self._prev_gray = gray
+        self.frame_idx += 1
+        return (markers, [t.to_code() for t in live if t.kind == "qr_code"],
+                [t.to_code() for t in live if t.kind == "barcode"])
+
+    def summary(self) -> str:
+        total = self.decoded + self.reused
+        saved = 100.0 * self.reused / total if total else 0.0
+        return (f"{self.frame_idx} frames, {self.decoded} code decodes, "
+                f"{self.reused} reused ({saved:.1f}% of reads skipped)")
+
+
+def _overlaps(window, corners: np.ndarray) -> bool:
+    (x1, y1), (x2, y2) = corners.min(axis=0), corners.max(axis=0)
+    return x1 < window[2] and window[0] < x2 and y1 < window[3] and window[1] < y2
@@ -0,0 +1,149 @@
+# rvm/predict.py
+"""
+COCO-format predictions for the images of a COCO annotation file.
+
+predict_coco(annotations, images_dir) resolves every image listed in the
+annotation file under `images_dir`, runs batched detection over them in a pool
+of worker processes (one model per worker, images decoded ahead on a helper
+thread) and yields COCO result dicts as chunks finish. Model class ids are
+mapped to the dataset's category ids by class name, so the results can be
+evaluated directly, without writing or re-reading a predictions JSON.
+"""
+
+import json
+import multiprocessing as mp
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Mapping, Optional, Tuple, Union
+
+from rvm.batch import _limit_threads, _prefetch
+from eval.coco_format import category_mapping, to_coco_results
+
+# Per-process worker settings, filled in by _init_worker.
+_WORKER: Dict[str, Any] = {}
+
+
+def load_annotations(annotations: Union[str, Path, Dict[str, Any]]) -> Dict[str, Any]:
+    """Return the COCO annotation dict (`annotations` may already be one)."""
+    if isinstance(annotations, dict):
+        return annotations
+    with open(annotations, "r") as f:
+        return json.load(f)
+
+
+def _init_worker(model: str, categories: List[Dict[str, Any]],
+                 category_map: Optional[Mapping[int, int]], batch_size: int,
+                 detector_options: Dict[str, Any], threads: int) -> None:
+    _limit_threads(threads, detector_options.get("backend", "torch") == "torch")
+    _WORKER.clear()
+    _WORKER.update(model=model, categories=categories, category_map=category_map,
+                   batch_size=batch_size, detector_options=detector_options)
+
+
+def _predict_chunk(items: List[Tuple[int, str]]) -> Tuple[List[Dict[str, Any]], List[str], List[str]]:
+    """
+    Detect objects in a chunk of (image_id, path) pairs.
+
+    Returns the COCO results, the images that could not be read and the names of
+    model classes without a dataset category.
+    """
+    from rvm import api
+
+    detector = api._build_detector(_WORKER["model"], **_WORKER["detector_options"])
+    if "mapping" not in _WORKER:
+        _WORKER["mapping"] = category_mapping(detector.names, _WORKER["categories"],
+                                              _WORKER["category_map"])
+    mapping = _WORKER["mapping"]
+    unmapped = [name for cls, name in detector.names.items() if int(cls) not in mapping]
+
+    batch_size = _WORKER["batch_size"]
+    results, failed, batch = [], [], []
+    decoded = _prefetch([path for _, path in items])
+    for (image_id, path), (img, error) in zip(items, decoded):
+        if error is not None:
+            failed.append(path)
+        else:
+            batch.append((image_id, img))
+        if len(batch) == batch_size:
+            results.extend(_detect(detector, batch, mapping, batch_size))
+            batch = []
+    results.extend(_detect(detector, batch, mapping, batch_size))
+    return results, failed, unmapped
+
+
+def _detect(detector, batch, mapping, batch_size: int) -> List[Dict[str, Any]]:
+    if not batch:
+        return []
+    detections = detector.detect_batch([img for _, img in batch], batch_size)
+    return [r for (image_id, _), dets in zip(batch, detections)
+            for r in to_coco_results(dets, image_id, mapping)]
+
+
+def predict_coco(
+    annotations: Union[str, Path, Dict[str, Any]],
+    images_dir: str,
+    model: str = "yolov8n.pt",
+    workers: Optional[int] = None,
+    chunk_size: int = 64,
+    batch_size: int = 8,
+    category_map: Optional[Mapping[int, int]] = None,
+    **detector_options: Any,
+) -> Iterator[Dict[str, Any]]:
+    """
+    Run detection over the images of a COCO annotation file.
+
+    Args:
+        annotations: Path to the COCO annotation JSON, or the loaded dict.
+        images_dir (str): Directory the annotation `file_name`s are relative to.
+        model (str): YOLO weights.
+        workers (int): Number of worker processes (default: CPU count). 1 runs in-process.
+        chunk_size (int): Images handed to a worker at a time.
+        batch_size (int): Images per forward pass.
+        category_map (dict): Explicit model class id -> category id entries, for
+            class names that differ from the dataset's category names.
+        **detector_options: Forwarded to the detector (backend="onnx", tile_size=...).
+
+    Yields:
+        dict: COCO results {"image_id", "category_id", "bbox": [x, y, w, h], "score"},
+        one chunk of images at a time (chunks finish in any order).
+    """
+    if chunk_size < 1:
+        raise ValueError(f"chunk_size must be >= 1, got {chunk_size}")
+    dataset = load_annotations(annotations)
+    items = [(img["id"], str(Path(images_dir) / img["file_name"])) for img in dataset["images"]]
+
+    workers = max(1, workers or os.cpu_count() or 1)
+    chunk_size = max(1, min(chunk_size, -(-len(items) // workers)))
+    chunks = [items[i:i + chunk_size] for i in range(0, len(items), chunk_size)]
+    workers = min(workers, max(1, len(chunks)))
+    threads = max(1, (os.cpu_count() or 1) // workers)
+    init_args = (model, dataset.get("categories", []), category_map, batch_size,
+                 detector_options, threads)
+
+    print(f"[INFO] predict: {len(items)} images, {workers} worker(s)")
+    failed, unmapped = [], set()
+    if workers == 1:
+        _init_worker(*init_args)
+        outputs = map(_predict_chunk, chunks)
+        pool = None
+    else:
+        # "spawn" keeps torch/OpenCV thread pools out of forked children.
+        pool = ProcessPoolExecutor(max_workers=workers, mp_context=mp.get_context("spawn"),
+                                   initializer=_init_worker, initargs=init_args)
+        outputs = (f.result() for f in as_completed([pool.submit(_predict_chunk, c)
+                                                     for c in chunks]))
+    try:
+        for results, chunk_failed, chunk_unmapped in outputs:
+            failed.extend(chunk_failed)
+            unmapped.update(chunk_unmapped)
+            yield from results
+    finally:
+        if pool is not None:
+            pool.shutdown(cancel_futures=True)
+    if unmapped:
+        names = sorted(unmapped)
+        print(f"[WARN] {len(names)} model classes have no matching category and were "
+              f"dropped: {', '.join(names[:10])}{', ...' if len(names) > 10 else ''}")
+    if failed:
+        print(f"[WARN] {len(failed)} images could not be read, e.g. {failed[0]}")
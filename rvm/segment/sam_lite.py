@@ -3,27 +3,48 @@
 SAM-Lite wrapper (using FastSAM-s.pt):
  - class SamLiteSegmenter
  - method: segment(image: np.ndarray, point_coords=None, point_labels=None) -> List[Mask]
+ - method: session(image) -> SegmentationSession, for many point/box prompts on
+   one image at the cost of a single model pass
+
+Masks are returned as polygons (default) or, with mask_format="rle", as
+COCO-compatible RLEs encoded in one batch straight from the model's mask
+tensor (rvm.core.rle); polygons can then be derived on demand via Mask.polygon.
 
 If FastSAM is not installed, this will fall back to a lightweight
 stub that returns a central rectangular mask (useful for tests / CI).
+
+One segmenter may be shared between threads (rvm.core.registry hands out a
+single instance per process): model passes are serialized by an instance lock.
 """
-from typing import List, Optional
+import threading
+from typing import List, Optional, Tuple
 import numpy as np
 import cv2
 
+from rvm.core import rle as rle_utils
 from rvm.core.types import Mask
 
+MASK_FORMATS = ("polygon", "rle")
+
 
 class SamLiteSegmenter:
-    def __init__(self, model_path: str = "FastSAM-s.pt", device: str = "cpu"):
+    def __init__(self, model_path: str = "FastSAM-s.pt", device: str = "cpu", imgsz: int = 512,
+                 mask_format: str = "polygon"):
         """
         Try to load FastSAM model if available. If not, keep a flag to use fallback.
         Args:
             model_path: path to FastSAM checkpoint (default: FastSAM-s.pt)
             device: 'cpu', 'cuda', or 'mps'
+            imgsz: inference image size
+            mask_format: default output format, "polygon" or "rle"
         """
+        if mask_format not in MASK_FORMATS:
+            raise ValueError(f"Unknown mask_format {mask_format!r}, expected one of {MASK_FORMATS}")
         self.device = device
+        self.imgsz = imgsz
+        self.mask_format = mask_format
         self._available = False
+        self._lock = threading.Lock()
         try:
             from ultralytics import FastSAM  # type: ignore
             self.model = FastSAM(model_path)
@@ -37,41 +58,108 @@ class SamLiteSegmenter:
         """
         Convert binary mask (H,W) to polygon (list of [x,y] ints).
         """
-        mask_uint8 = (mask.astype(np.uint8) * 255)
-        contours, _ = cv2.findContours(mask_uint8, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
-        if not contours:
-            ys, xs = np.where(mask == 1)
-            return [[int(x), int(y)] for x, y in zip(xs.tolist(), ys.tolist())]
+        return rle_utils.mask_to_polygon(mask)
+
+    def warmup(self) -> None:
+        """Run one dummy segmentation so the first real call does not pay for lazy setup."""
+        if self._available:
+            self.segment(np.zeros((self.imgsz, self.imgsz, 3), dtype=np.uint8))
+
+    def _predict(self, image: np.ndarray):
+        # ultralytics predictors keep per-call state and are not thread-safe.
+        with self._lock:
+            return self.model.predict(image, device=self.device, retina_masks=True, imgsz=self.imgsz)
+
+    def _fallback_mask(self, h: int, w: int) -> np.ndarray:
+        """Simple centered rectangle mask used when FastSAM is unavailable."""
+        mask = np.zeros((h, w), dtype=np.uint8)
+        cv2.rectangle(mask, (w // 4, h // 4), (3 * w // 4, 3 * h // 4), 1, -1)
+        return mask
+
+    def segment_everything(self, image: np.ndarray) -> np.ndarray:
+        """
+        Run one "segment everything" pass.
+
+        Returns:
+            np.ndarray: (N, H, W) bool masks at image resolution.
+        """
+        if not isinstance(image, np.ndarray):
+            raise ValueError("image must be a numpy array (H,W,3)")
+        h, w = image.shape[:2]
+        if self._available:
+            try:
+                results = self._predict(image)
+                stacks = [r.masks.data.cpu().numpy() > 0.5 for r in results
+                          if getattr(r, "masks", None) is not None]
+                return np.concatenate(stacks) if stacks else np.zeros((0, h, w), dtype=bool)
+            except Exception as e:
+                print(f"[WARN] FastSAM prediction failed, falling back: {e}")
+        return self._fallback_mask(h, w)[None].astype(bool)
 
-        contour = max(contours, key=cv2.contourArea)
-        epsilon = 0.01 * cv2.arcLength(contour, True)
-        approx = cv2.approxPolyDP(contour, epsilon, True)
-        return [[int(pt[0][0]), int(pt[0][1])] for pt in approx]
+    def session(self, image: np.ndarray):
+        """Segment `image` once and return a SegmentationSession to query with prompts."""
+        from rvm.segment.session import SegmentationSession
+
+        return SegmentationSession(self.segment_everything(image))
+
+    def _check(self, image: np.ndarray, mask_format: Optional[str]) -> str:
+        if not isinstance(image, np.ndarray):
+            raise ValueError("image must be a numpy array (H,W,3)")
+        mask_format = mask_format or self.mask_format
+        if mask_format not in MASK_FORMATS:
+            raise ValueError(f"Unknown mask_format {mask_format!r}, expected one of {MASK_FORMATS}")
+        return mask_format
 
     def segment(self, image: np.ndarray, point_coords: Optional[np.ndarray] = None,
-                point_labels: Optional[np.ndarray] = None) -> List[Mask]:
+                point_labels: Optional[np.ndarray] = None,
+                mask_format: Optional[str] = None) -> List[Mask]:
         """
         Run segmentation on an image using FastSAM if available.
 
         Args:
             image: BGR image as numpy array.
-            point_coords / point_labels: ignored (not used in FastSAM).
+            point_coords: Optional (P, 2) array of (x, y) prompt points. When given,
+                only the mask selected by the points is returned.
+            point_labels: Optional (P,) labels, 1 = foreground, 0 = background.
+            mask_format: "polygon" or "rle" (default: the segmenter's mask_format).
 
         Returns:
             List[Mask]: list of Mask dataclasses
         """
-        if not isinstance(image, np.ndarray):
-            raise ValueError("image must be a numpy array (H,W,3)")
+        mask_format = self._check(image, mask_format)
+        if point_coords is not None:
+            session = self.session(image)
+            index = session.group_index(point_coords, point_labels)
+            return session.to_masks([index] if index >= 0 else [], mask_format)
+        return self.try_segment(image, mask_format)[0]
+
+    def try_segment(self, image: np.ndarray,
+                    mask_format: Optional[str] = None) -> Tuple[List[Mask], bool]:
+        """
+        Segment everything in `image`, telling real masks from the fallback.
 
+        Returns:
+            (masks, ok): ok is False when FastSAM is unavailable or failed and
+            `masks` is the placeholder rectangle (which callers should not cache).
+        """
+        mask_format = self._check(image, mask_format)
         h, w = image.shape[:2]
 
         if self._available:
             try:
-                results = self.model.predict(image, device=self.device, retina_masks=True, imgsz=512)
+                results = self._predict(image)
                 masks_list: List[Mask] = []
                 for r in results:
                     if not hasattr(r, "masks") or r.masks is None:
                         continue
+                    if mask_format == "rle":
+                        # One device-to-host copy and one vectorized encode for all masks.
+                        data = r.masks.data.cpu().numpy() > 0.5
+                        masks_list.extend(
+                            Mask(segmentation=[], confidence=1.0, class_id=0, rle=rle)
+                            for rle in rle_utils.encode_batch(data)
+                        )
+                        continue
                     for m in r.masks:
                         for poly in m.xy:  # polygon points [[x, y], ...]
                             masks_list.append(
@@ -81,14 +169,15 @@ class SamLiteSegmenter:
                                     class_id=0
                                 )
                             )
-                return masks_list
+                return masks_list, True
             except Exception as e:
                 print(f"[WARN] FastSAM prediction failed, falling back: {e}")
 
         # Fallback: simple centered rectangle mask
-        mask = np.zeros((h, w), dtype=np.uint8)
         x1, y1 = w // 4, h // 4
         x2, y2 = 3 * w // 4, 3 * h // 4
-        cv2.rectangle(mask, (x1, y1), (x2, y2), 1, -1)
+        if mask_format == "rle":
+            mask = self._fallback_mask(h, w)
+            return [Mask(segmentation=[], confidence=1.0, class_id=0, rle=rle_utils.encode(mask))], False
         polygon = [[x1, y1], [x2, y1], [x2, y2], [x1, y2]]
-        return [Mask(segmentation=polygon, confidence=1.0, class_id=0)]
+        return [Mask(segmentation=polygon, confidence=1.0, class_id=0)], False
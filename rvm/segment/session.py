@@ -0,0 +1,167 @@
+# rvm/segment/session.py
+"""
+Prompt-driven segmentation on top of one "segment everything" pass.
+
+FastSAM segments the whole image once; prompts are then answered by
+selecting among the resulting masks, the same way FastSAM's own prompt
+step works. SegmentationSession keeps the mask stack of one image together
+with the areas and bounding boxes of every mask. Any number of point or box
+prompts (including YOLO Detections) can then be answered in batches without
+running the model again.
+
+Selection rules:
+- a point selects the smallest mask that contains it
+- a group of points with labels (1 = foreground, 0 = background) selects the
+  smallest mask containing every foreground point and no background point
+- a box selects the mask with the highest IoU against the box
+"""
+
+from typing import List, Optional, Sequence, Union
+
+import numpy as np
+
+from rvm.core import rle as rle_utils
+from rvm.core.types import Detections, Mask
+
+
+class SegmentationSession:
+    """All masks of one image, queried with point and box prompts."""
+
+    def __init__(self, masks: np.ndarray, scores: Optional[np.ndarray] = None):
+        """
+        Args:
+            masks (np.ndarray): (N, H, W) binary masks at image resolution.
+            scores (np.ndarray): Optional (N,) confidence per mask (default 1.0).
+        """
+        self.masks = np.asarray(masks, dtype=bool).reshape((-1,) + np.shape(masks)[-2:])
+        n = len(self.masks)
+        self.scores = np.ones(n, np.float32) if scores is None else np.asarray(scores, np.float32)
+        self.areas = self.masks.reshape(n, -1).sum(axis=1)
+        # Bounding boxes as half-open xyxy, from row/column projections.
+        cols, rows = self.masks.any(axis=1), self.masks.any(axis=2)
+        self.boxes = np.zeros((n, 4), dtype=np.int64)
+        for i in np.flatnonzero(self.areas):
+            xs, ys = np.flatnonzero(cols[i]), np.flatnonzero(rows[i])
+            self.boxes[i] = xs[0], ys[0], xs[-1] + 1, ys[-1] + 1
+
+    @classmethod
+    def from_image(cls, segmenter, image: np.ndarray) -> "SegmentationSession":
+        """Run the segmenter's "segment everything" pass once and wrap its masks."""
+        return cls(segmenter.segment_everything(image))
+
+    def __len__(self) -> int:
+        return len(self.masks)
+
+    @property
+    def shape(self):
+        return self.masks.shape[1:]
+
+    # -- selection (indices, -1 = no mask) ---------------------------------
+
+    def point_indices(self, points: np.ndarray) -> np.ndarray:
+        """
+        Independent point prompts: for each (x, y), the smallest mask containing it.
+
+        Returns:
+            (P,) int array of mask indices, -1 where no mask contains the point.
+        """
+        pts = np.asarray(points, dtype=np.int64).reshape(-1, 2)
+        if not len(self):
+            return np.full(len(pts), -1, dtype=np.int64)
+        h, w = self.shape
+        inside = (pts[:, 0] >= 0) & (pts[:, 0] < w) & (pts[:, 1] >= 0) & (pts[:, 1] < h)
+        x, y = pts[:, 0].clip(0, w - 1), pts[:, 1].clip(0, h - 1)
+        hits = self.masks[:, y, x] & inside[None, :]          # (N, P)
+        areas = np.where(hits, self.areas[:, None], np.iinfo(np.int64).max)
+        return np.where(hits.any(axis=0), areas.argmin(axis=0), -1)
+
+    def group_index(self, points: np.ndarray, labels: Optional[Sequence[int]] = None) -> int:
+        """
+        One prompt made of several points (SAM style).
+
+        Returns:
+            Index of the smallest mask containing all foreground points and no
+            background point, or -1.
+        """
+        pts = np.asarray(points, dtype=np.int64).reshape(-1, 2)
+        labels = np.ones(len(pts), bool) if labels is None else np.asarray(labels).astype(bool)
+        h, w = self.shape
+        x, y = pts[:, 0].clip(0, w - 1), pts[:, 1].clip(0, h - 1)
+        hits = self.masks[:, y, x]
+        ok = hits[:, labels].all(axis=1) & ~hits[:, ~labels].any(axis=1)
+        if not ok.any():
+            return -1
+        return int(np.flatnonzero(ok)[self.areas[ok].argmin()])
+
+    def box_indices(self, boxes: Union[np.ndarray, Detections]) -> np.ndarray:
+        """
+        Box prompts: for each xyxy box, the mask with the highest IoU against it.
+
+        Returns:
+            (B,) int array of mask indices, -1 where no mask overlaps the box.
+        """
+        xyxy = boxes.xyxy if isinstance(boxes, Detections) else np.asarray(boxes, np.float32)
+        xyxy = np.round(xyxy.reshape(-1, 4)).astype(np.int64)
+        h, w = self.shape
+        xyxy[:, [0, 2]] = xyxy[:, [0, 2]].clip(0, w)
+        xyxy[:, [1, 3]] = xyxy[:, [1, 3]].clip(0, h)
+
+        out = np.full(len(xyxy), -1, dtype=np.int64)
+        for b, (x1, y1, x2, y2) in enumerate(xyxy):
+            # Only masks whose bbox overlaps the box can score above zero.
+            cand = np.flatnonzero((self.boxes[:, 0] < x2) & (self.boxes[:, 2] > x1) &
+                                  (self.boxes[:, 1] < y2) & (self.boxes[:, 3] > y1))
+            if not len(cand) or x2 <= x1 or y2 <= y1:
+                continue
+            inter = self.masks[cand, y1:y2, x1:x2].reshape(len(cand), -1).sum(axis=1)
+            iou = inter / ((x2 - x1) * (y2 - y1) + self.areas[cand] - inter)
+            if iou.max() > 0:
+                out[b] = cand[iou.argmax()]
+        return out
+
+    # -- Mask objects -------------------------------------------------------
+
+    def to_masks(self, indices: Sequence[int], mask_format: str = "polygon",
+                 confidences: Optional[Sequence[float]] = None,
+                 class_ids: Optional[Sequence[int]] = None) -> List[Mask]:
+        """
+        Convert selected mask indices to Mask objects (one per index, in order).
+        Index -1 yields an empty mask so results stay aligned with the prompts.
+        """
+        indices = [int(i) for i in indices]
+        valid = [i for i in indices if i >= 0]
+        encoded = {}
+        if mask_format == "rle" and valid:
+            unique = sorted(set(valid))
+            encoded = dict(zip(unique, rle_utils.encode_batch(self.masks[unique])))
+        out = []
+        for k, i in enumerate(indices):
+            conf = float(confidences[k]) if confidences is not None else (
+                float(self.scores[i]) if i >= 0 else 0.0)
+            cls = int(class_ids[k]) if class_ids is not None else 0
+            if i < 0:
+                out.append(Mask(segmentation=[], confidence=conf, class_id=cls))
+            elif mask_format == "rle":
+                out.append(Mask(segmentation=[], confidence=conf, class_id=cls, rle=encoded[i]))
+            else:
+                out.append(Mask(segmentation=rle_utils.mask_to_polygon(self.masks[i]),
+                                confidence=conf, class_id=cls))
+        return out
+
+    def everything(self, mask_format: str = "polygon") -> List[Mask]:
+        """All masks of the image."""
+        return self.to_masks(range(len(self)), mask_format)
+
+    def at_points(self, points: np.ndarray, mask_format: str = "polygon") -> List[Mask]:
+        """One mask per point prompt (see point_indices)."""
+        return self.to_masks(self.point_indices(points), mask_format)
+
+    def in_boxes(self, boxes: Union[np.ndarray, Detections], mask_format: str = "polygon") -> List[Mask]:
+        """
+        One mask per box prompt (see box_indices). With YOLO Detections the masks
+        inherit the detection's confidence and class_id.
+        """
+        indices = self.box_indices(boxes)
+        if isinstance(boxes, Detections):
+            return self.to_masks(indices, mask_format, boxes.scores, boxes.class_ids)
+        return self.to_masks(indices, mask_format)
@@ -0,0 +1,243 @@
+# rvm/track/tracker.py
+"""
+Lightweight multi-object tracking.
+
+IoUTracker follows the SORT recipe without extra dependencies: every track
+carries a constant-velocity Kalman filter over (cx, cy, w, h), detections are
+associated with predicted track boxes by greedy same-class IoU matching, and
+unmatched detections start new tracks. All tracks are filtered together with
+NumPy, so the per-frame cost stays small.
+
+TrackingDetector wraps a detector and runs it only on keyframes (every N
+frames or on a custom schedule). In between, the tracker's predictions are
+returned, so the model is called less often on real-time streams.
+"""
+
+from typing import Callable, List, Optional, Sequence, Union
+
+import numpy as np
+
+from rvm.core.types import Detections
+from rvm.detect.ops import box_iou
+
+# Constant-velocity model: state (cx, cy, w, h, vcx, vcy, vw, vh), measurement (cx, cy, w, h).
+_F = np.eye(8, dtype=np.float64)
+_F[:4, 4:] = np.eye(4)
+_H = np.eye(4, 8, dtype=np.float64)
+
+
+def _xyxy_to_cxcywh(xyxy: np.ndarray) -> np.ndarray:
+    wh = xyxy[:, 2:] - xyxy[:, :2]
+    return np.concatenate([xyxy[:, :2] + wh / 2, wh], axis=1)
+
+
+def _cxcywh_to_xyxy(cxcywh: np.ndarray) -> np.ndarray:
+    half = np.abs(cxcywh[:, 2:]) / 2
+    return np.concatenate([cxcywh[:, :2] - half, cxcywh[:, :2] + half], axis=1)
+
+
+def greedy_match(iou: np.ndarray, threshold: float):
+    """
+    Greedily pair rows and columns of an IoU matrix, best pairs first.
+
+    Returns:
+        (rows, cols): Matched index arrays; each row and column is used at most once.
+    """
+    rows, cols = np.nonzero(iou >= threshold)
+    order = np.argsort(-iou[rows, cols], kind="stable")
+    used_r, used_c, out_r, out_c = set(), set(), [], []
+    for r, c in zip(rows[order].tolist(), cols[order].tolist()):
+        if r in used_r or c in used_c:
+            continue
+        used_r.add(r)
+        used_c.add(c)
+        out_r.append(r)
+        out_c.append(c)
+    return np.array(out_r, dtype=np.int64), np.array(out_c, dtype=np.int64)
+
+
+class IoUTracker:
+    """IoU + Kalman (SORT-style) tracker assigning stable track IDs."""
+
+    def __init__(self, iou_threshold: float = 0.3, max_age: int = 30, min_hits: int = 1,
+                 process_noise: float = 1e-2, measurement_noise: float = 1e-1):
+        """
+        Args:
+            iou_threshold: Minimum IoU between a detection and a predicted track box.
+            max_age: Frames a track survives without a matching detection.
+            min_hits: Matched detections needed before a track is reported.
+            process_noise: Kalman process noise scale (relative to box size).
+            measurement_noise: Kalman measurement noise scale (relative to box size).
+        """
+        self.iou_threshold = iou_threshold
+        self.max_age = max_age
+        self.min_hits = min_hits
+        self.process_noise = process_noise
+        self.measurement_noise = measurement_noise
+        self.frame_count = 0
+        self._since_update = 0
+        self._next_id = 1
+        self._x = np.zeros((0, 8))          # states
+        self._p = np.zeros((0, 8, 8))       # covariances
+        self._ids = np.zeros(0, np.int32)
+        self._cls = np.zeros(0, np.int32)
+        self._scores = np.zeros(0, np.float32)
+        self._hits = np.zeros(0, np.int32)
+        self._misses = np.zeros(0, np.int32)  # frames since the last match
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def _noise(self, scale: float, size: int) -> np.ndarray:
+        # Noise proportional to box size so small and large objects behave alike.
+        wh = np.maximum(np.abs(self._x[:, 2:4]), 1.0)
+        std = scale * np.tile(wh, (1, size // 2))  # (w, h, w, h, ...) for (cx, cy, w, h, ...)
+        return np.einsum("ni,ij->nij", std ** 2, np.eye(size))
+
+    def _advance(self) -> None:
+        self.frame_count += 1
+        self._since_update += 1
+        if not len(self):
+            return
+        self._x = self._x @ _F.T
+        self._p = _F @ self._p @ _F.T + self._noise(self.process_noise, 8)
+        self._misses += 1
+
+    def _correct(self, idx: np.ndarray, measured: np.ndarray) -> None:
+        x, p = self._x[idx], self._p[idx]
+        r = self._noise(self.measurement_noise, 4)[idx]
+        s = _H @ p @ _H.T + r
+        k = p @ _H.T @ np.linalg.inv(s)
+        y = measured - x[:, :4]
+        self._x[idx] = x + np.einsum("nij,nj->ni", k, y)
+        self._p[idx] = (np.eye(8) - k @ _H) @ p
+
+    def _spawn(self, cxcywh: np.ndarray, scores: np.ndarray, class_ids: np.ndarray) -> None:
+        n = len(cxcywh)
+        x = np.zeros((n, 8))
+        x[:, :4] = cxcywh
+        p = np.tile(np.diag([1.0, 1.0, 1.0, 1.0, 1e3, 1e3, 1e3, 1e3]), (n, 1, 1))
+        p *= np.tile(np.maximum(np.abs(cxcywh[:, 2:]), 1.0), (1, 4))[:, :, None] ** 2 * 1e-2
+        self._x = np.concatenate([self._x, x])
+        self._p = np.concatenate([self._p, p])
+        self._ids = np.concatenate([self._ids, np.arange(self._next_id, self._next_id + n, dtype=np.int32)])
+        self._cls = np.concatenate([self._cls, class_ids.astype(np.int32)])
+        self._scores = np.concatenate([self._scores, scores.astype(np.float32)])
+        self._hits = np.concatenate([self._hits, np.ones(n, np.int32)])
+        self._misses = np.concatenate([self._misses, np.zeros(n, np.int32)])
+        self._next_id += n
+
+    def _prune(self) -> None:
+        keep = self._misses <= self.max_age
+        if keep.all():
+            return
+        for name in ("_x", "_p", "_ids", "_cls", "_scores", "_hits", "_misses"):
+            setattr(self, name, getattr(self, name)[keep])
+
+    def _report(self, mask: np.ndarray) -> Detections:
+        return Detections(_cxcywh_to_xyxy(self._x[mask, :4]), self._scores[mask],
+                          self._cls[mask], self._ids[mask])
+
+    def predict(self) -> Detections:
+        """
+        Advance all tracks by one frame without a detection step.
+
+        Returns:
+            Detections: Predicted boxes of the confirmed tracks matched at the last
+            update, with track IDs.
+        """
+        self._advance()
+        self._prune()
+        return self._report((self._hits >= self.min_hits) & (self._misses <= self._since_update))
+
+    def update(self, detections: Detections) -> Detections:
+        """
+        Advance all tracks by one frame and associate them with new detections.
+
+        Args:
+            detections (Detections): Detections for the current frame.
+
+        Returns:
+            Detections: The confirmed tracks matched (or started) in this frame, with
+            filtered boxes and track IDs.
+        """
+        self._advance()
+        self._since_update = 0
+        n_tracks = len(self)
+        measured = _xyxy_to_cxcywh(detections.xyxy.astype(np.float64))
+
+        iou = box_iou(_cxcywh_to_xyxy(self._x[:, :4]), detections.xyxy)
+        iou[self._cls[:, None] != detections.class_ids[None, :]] = 0.0
+        rows, cols = greedy_match(iou, self.iou_threshold)
+
+        if len(rows):
+            self._correct(rows, measured[cols])
+            self._scores[rows] = detections.scores[cols]
+            self._hits[rows] += 1
+            self._misses[rows] = 0
+
+        unmatched = np.setdiff1d(np.arange(len(detections)), cols)
+        self._spawn(measured[unmatched], detections.scores[unmatched],
+                    detections.class_ids[unmatched])
+
+        current = np.zeros(len(self), dtype=bool)
+        current[rows] = True
+        current[n_tracks:] = True
+        current &= self._hits >= self.min_hits
+        out = self._report(current)
+        self._prune()
+        return out
+
+    def reset(self) -> None:
+        self.__init__(self.iou_threshold, self.max_age, self.min_hits,
+                      self.process_noise, self.measurement_noise)
+
+
+Schedule = Union[int, Callable[[int], bool]]
+
+
+class TrackingDetector:
+    """Detector wrapper that detects on keyframes and tracks in between."""
+
+    def __init__(self, detector, tracker: Optional[IoUTracker] = None, detect_every: Schedule = 1):
+        """
+        Args:
+            detector: Object with detect_batch(frames, batch_size) -> List[Detections].
+            tracker: Tracker instance (default: IoUTracker()).
+            detect_every: Run the detector every N frames, or a callable taking the
+                frame index and returning True for keyframes.
+        """
+        if not callable(detect_every) and detect_every < 1:
+            raise ValueError(f"detect_every must be >= 1, got {detect_every}")
+        self.detector = detector
+        self.tracker = tracker or IoUTracker()
+        self.detect_every = detect_every
+        self.frame_idx = 0
+        self.detector_calls = 0
+
+    def is_keyframe(self, frame_idx: int) -> bool:
+        if callable(self.detect_every):
+            return bool(self.detect_every(frame_idx))
+        return frame_idx % self.detect_every == 0
+
+    def detect(self, image: np.ndarray) -> Detections:
+        """Detect (on keyframes) or predict, and return tracked detections for one frame."""
+        return self.detect_batch([image], 1)[0]
+
+    def detect_batch(self, frames: Sequence[np.ndarray], batch_size: int = 8) -> List[Detections]:
+        """
+        Process consecutive frames in order; only keyframes go to the detector.
+
+        Returns:
+            List[Detections]: One Detections (with track IDs) per input frame.
+        """
+        keyframes = [self.is_keyframe(self.frame_idx + i) for i in range(len(frames))]
+        keyed = [f for f, k in zip(frames, keyframes) if k]
+        detected = iter(self.detector.detect_batch(keyed, batch_size) if keyed else [])
+        self.detector_calls += len(keyed)
+
+        out = []
+        for is_key in keyframes:
+            out.append(self.tracker.update(next(detected)) if is_key else self.tracker.predict())
+            self.frame_idx += 1
+        return out
@@ -0,0 +1,17 @@
+# tests/test_aruco.py
+import cv2
+import numpy as np
+
+from rvm.core.frame import FrameContext
+from rvm.markers.aruco import ArucoDetector
+
+
+def test_detects_marker_from_array_and_frame_context():
+    detector = ArucoDetector()
+    marker = cv2.aruco.generateImageMarker(detector.aruco_dict, 7, 200)
+    img = np.full((400, 400, 3), 255, np.uint8)
+    img[100:300, 100:300] = marker[..., None]
+    for source in (img, FrameContext(img)):
+        (found,) = detector.detect(source)
+        assert found.id == 7
+        assert found.corners[0] == (100, 100)
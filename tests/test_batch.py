@@ -0,0 +1,55 @@
+# tests/test_batch.py
+import time
+
+import numpy as np
+
+from rvm import batch
+from rvm.io.writer import read_jsonl, save_image
+
+
+def test_resume_restarts_when_options_change(tmp_path, monkeypatch):
+    """Resuming skips finished images only while the task options stay the same."""
+    calls = []
+
+    def run_task(task, img, image_path, task_options):
+        calls.append(task_options["model"])
+        return img, [{"model": task_options["model"]}]
+
+    monkeypatch.setattr(batch, "_run_task", run_task)
+    for name in ("a.jpg", "b.jpg"):
+        save_image(np.zeros((8, 8, 3), np.uint8), str(tmp_path / "imgs"), name)
+    source, out_dir = str(tmp_path / "imgs"), str(tmp_path / "out")
+
+    batch.run_batch("detect", source, out_dir, workers=1, model="a.pt")
+    resumed = batch.run_batch("detect", source, out_dir, workers=1, model="a.pt")
+    assert calls == ["a.pt", "a.pt"]
+    assert [r["results"] for r in resumed] == [[{"model": "a.pt"}]] * 2
+
+    changed = batch.run_batch("detect", source, out_dir, workers=1, model="b.pt")
+    assert calls == ["a.pt", "a.pt", "b.pt", "b.pt"]
+    assert [r["results"] for r in changed] == [[{"model": "b.pt"}]] * 2
+    assert len(list(read_jsonl(tmp_path / "out" / "detect_batch.jsonl"))) == 3
+
+
+
+def test_only_torch_tasks_limit_torch_threads(monkeypatch):
+    """Markers and ONNX detect workers must not import torch just to limit its threads."""
+    calls = []
+    monkeypatch.setattr(batch, "_limit_threads", lambda threads, torch: calls.append(torch))
+    for task, options in [("markers", {}), ("detect", {"backend": "onnx"}),
+                          ("detect", {}), ("segment", {})]:
+        batch._init_worker(task, options, ".", False, 1)
+    assert calls == [False, False, True, True]
+
+
+def test_prefetch_is_bounded(monkeypatch):
+    """Only the next image is decoded ahead of the one being processed."""
+    reads = []
+    monkeypatch.setattr(batch, "_read", lambda path: (reads.append(path) or path, None))
+    paths = [f"{i}.jpg" for i in range(10)]
+    seen = []
+    for img, _ in batch._prefetch(paths, ahead=1):
+        time.sleep(0.01)  # give an unbounded prefetcher time to run ahead
+        assert len(reads) <= len(seen) + 2
+        seen.append(img)
+    assert seen == paths
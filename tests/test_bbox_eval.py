@@ -0,0 +1,151 @@
+# tests/test_bbox_eval.py
+import contextlib
+import io
+
+import numpy as np
+import pytest
+
+from eval.bbox_eval import BBoxEvaluator, box_iou
+
+pycocotools = pytest.importorskip("pycocotools")
+from pycocotools import mask as mask_utils  # noqa: E402
+from pycocotools.coco import COCO  # noqa: E402
+from pycocotools.cocoeval import COCOeval  # noqa: E402
+
+
+def _dataset(seed, n_img=12, n_cat=3, n_det=600):
+    """Random boxes with crowds, duplicate detections, score ties and unknown categories."""
+    rng = np.random.default_rng(seed)
+    images = [{"id": 3 * i + 1, "width": 640, "height": 480} for i in range(n_img)]
+    cats = [{"id": 2 * c + 1, "name": f"c{c}"} for c in range(n_cat)]
+    anns = []
+    for im in images:
+        for _ in range(rng.integers(0, 10)):
+            w, h = rng.uniform(4, 200, 2)
+            x, y = rng.uniform(0, 400), rng.uniform(0, 300)
+            anns.append({"id": len(anns) + 1, "image_id": im["id"],
+                         "category_id": int(rng.choice([c["id"] for c in cats])),
+                         "bbox": [float(x), float(y), float(w), float(h)],
+                         "area": float(w * h * rng.uniform(0.5, 1)), "iscrowd": int(rng.random() < 0.1)})
+    preds = []
+    for _ in range(n_det):
+        if rng.random() < 0.6:
+            a = anns[rng.integers(len(anns))]
+            box = np.array(a["bbox"]) + rng.normal(0, 6, 4)
+            box[2:] = np.abs(box[2:]) + 1
+            img, cat = a["image_id"], a["category_id"]
+        else:
+            img = images[rng.integers(n_img)]["id"]
+            cat = int(rng.choice([c["id"] for c in cats] + [99]))
+            box = np.array([*rng.uniform(0, 400, 2), *rng.uniform(4, 200, 2)])
+        preds.append({"image_id": img, "category_id": cat, "bbox": box.tolist(),
+                      "score": round(float(rng.random()), 2)})
+    return {"images": images, "categories": cats, "annotations": anns}, preds
+
+
+def _cocoeval(gt, preds):
+    coco = COCO()
+    coco.dataset = gt
+    with contextlib.redirect_stdout(io.StringIO()):
+        coco.createIndex()
+        ev = COCOeval(coco, coco.loadRes([dict(p) for p in preds]), "bbox")
+        ev.evaluate()
+        ev.accumulate()
+        ev.summarize()
+    return ev
+
+
+@pytest.mark.parametrize("seed", [0, 1, 2])
+def test_matches_pycocotools_exactly(seed):
+    gt, preds = _dataset(seed)
+    ref = _cocoeval(gt, preds)
+    res = BBoxEvaluator(gt, workers=1).evaluate(preds, verbose=False)
+    assert np.array_equal(res.precision, ref.eval["precision"])
+    assert np.array_equal(res.recall, ref.eval["recall"])
+    assert np.array_equal(res.scores, ref.eval["scores"])
+    assert np.array_equal(res.stats, ref.stats)
+
+
+def test_process_pool_gives_same_result():
+    gt, preds = _dataset(3, n_img=20)
+    serial = BBoxEvaluator(gt, workers=1).evaluate(preds, verbose=False)
+    pooled = BBoxEvaluator(gt, workers=2, min_chunk_images=5).evaluate(preds, verbose=False)
+    assert np.array_equal(serial.precision, pooled.precision)
+    assert np.array_equal(serial.stats, pooled.stats)
+
+
+def test_box_iou_matches_mask_api():
+    rng = np.random.default_rng(0)
+    dt, gt = rng.uniform(0, 100, (7, 4)), rng.uniform(0, 100, (5, 4))
+    crowd = [0, 1, 0, 0, 1]
+    assert np.array_equal(box_iou(dt, gt, crowd), mask_utils.iou(dt.tolist(), gt.tolist(), crowd))
+
+
+def test_unknown_image_is_rejected():
+    gt, preds = _dataset(0)
+    with pytest.raises(ValueError):
+        BBoxEvaluator(gt).evaluate(preds + [{"image_id": 10 ** 6, "category_id": 1,
+                                             "bbox": [0, 0, 1, 1], "score": 1.0}])
+
+
+def test_evaluate_coco_backends_agree(tmp_path):
+    import json
+    from eval.coco_eval import evaluate_coco
+
+    gt, preds = _dataset(4)
+    (tmp_path / "ann.json").write_text(json.dumps(gt))
+    (tmp_path / "preds.json").write_text(json.dumps(preds))
+    args = (str(tmp_path / "preds.json"), str(tmp_path / "ann.json"))
+    ref = evaluate_coco(*args, str(tmp_path / "ref"))
+    fast = evaluate_coco(*args, str(tmp_path / "fast"), backend="numpy", workers=1)
+    assert fast == ref
+    assert (tmp_path / "fast" / "report.html").exists()
+
+
+def test_match_index_filters_match_pycocotools(tmp_path):
+    """Score, category and maxDets filters on cached matches equal a fresh COCOeval."""
+    from eval.bbox_eval import MatchIndex
+
+    gt, preds = _dataset(4)
+    path = tmp_path / "matches.npz"
+    BBoxEvaluator(gt, workers=2, min_chunk_images=4).index(preds).save(path)
+    index = MatchIndex.load(path)
+
+    res = index.evaluate(score_thr=0.3, categories=["c0", 5], max_dets=(1, 5, 20), verbose=False)
+    coco = COCO()
+    coco.dataset = gt
+    with contextlib.redirect_stdout(io.StringIO()):
+        coco.createIndex()
+        ev = COCOeval(coco, coco.loadRes([dict(p) for p in preds if p["score"] >= 0.3]), "bbox")
+        ev.params.catIds, ev.params.maxDets = [1, 5], [1, 5, 20]
+        ev.evaluate()
+        ev.accumulate()
+        ev.summarize()
+    # COCOeval.summarize hard-codes maxDets=100 for stats[0] (-1 here).
+    assert np.array_equal(res.stats[1:], ev.stats[1:])
+    assert np.array_equal(res.precision[:, :, [0, 2]], ev.eval["precision"])
+
+    # Other area ranges are re-matched from the cached IoUs.
+    medium = index.select(area_rngs=[(32 ** 2, 96 ** 2)])
+    assert np.array_equal(medium.matched[0], index.matches.matched[2])
+    assert np.array_equal(medium.ignored[0], index.matches.ignored[2])
+    res_medium = index.evaluate(area_rngs=[(32 ** 2, 96 ** 2)], verbose=False)
+    assert res_medium.precision.shape[3] == 1 and res_medium.stats is None
+    full = index.evaluate(verbose=False)
+    assert np.array_equal(res_medium.precision[..., 0, :], full.precision[..., 2, :])
+
+
+def test_sweep_table():
+    from eval.sweep import best_f1, sweep
+
+    gt, preds = _dataset(5)
+    index = BBoxEvaluator(gt, workers=1).index(preds)
+    rows = sweep(index, [0.0, 0.5, 1.01], categories=[1])
+    for row in rows:
+        m = index.select(score_thr=row["score_thr"], categories=[1])
+        tp = m.matched[0, 0] & ~m.ignored[0, 0]
+        assert row["tp"] == tp.sum()
+        assert row["fp"] == (~m.matched[0, 0] & ~m.ignored[0, 0]).sum()
+        assert row["tp"] + row["fn"] == m.n_positive[:, 0].sum()
+    assert rows[-1]["tp"] == rows[-1]["fp"] == 0
+    assert best_f1(rows)["f1"] == max(r["f1"] for r in rows)
@@ -0,0 +1,64 @@
+import copy
+
+import pytest
+
+from rvm.bench import compare, parse_resolution, run_benchmark, summarize_latencies, synthetic_frame
+from rvm.markers.aruco import ArucoDetector
+
+
+def test_summarize_latencies():
+    stats = summarize_latencies([0.001 * i for i in range(1, 101)], frames=200)
+    assert stats["p50_ms"] == pytest.approx(50.5)
+    assert stats["p99_ms"] == pytest.approx(99.01)
+    assert stats["fps"] == pytest.approx(200 / 5.05, rel=1e-3)
+
+
+def test_synthetic_frame_has_marker():
+    frame = synthetic_frame(320, 240)
+    assert frame.shape == (240, 320, 3)
+    assert [m.id for m in ArucoDetector().detect(frame)] == [7]
+
+
+def test_run_and_compare():
+    """A run compares clean against itself and flags slower latency and fewer fps."""
+    results = run_benchmark(["encode", "draw"], resolutions=[(64, 48)], iterations=3,
+                            warmup=0, isolate=False)
+    cases = results["results"]
+    assert [(r["stage"], r["resolution"], r["batch_size"]) for r in cases] == \
+        [("encode", "64x48", 1), ("draw", "64x48", 1)]
+    assert all(r["fps"] > 0 and r["p50_ms"] <= r["p95_ms"] <= r["p99_ms"] for r in cases)
+    assert not any(r["regression"] for r in compare(results, results))
+
+    slower = copy.deepcopy(results)
+    slower["results"][0]["p50_ms"] *= 1.5
+    slower["results"][0]["fps"] /= 1.5
+    flagged = {(r["stage"], r["metric"]) for r in compare(slower, results) if r["regression"]}
+    assert flagged == {("encode", "p50_ms"), ("encode", "fps")}
+
+
+def test_parse_resolution():
+    assert parse_resolution("1280x720") == (1280, 720)
+    with pytest.raises(ValueError):
+        parse_resolution("720p")
+
+
+def test_bad_source_is_an_error_entry(tmp_path):
+    for isolate in (False, True):
+        results = run_benchmark(["encode"], iterations=1, warmup=0,
+                                source=str(tmp_path / "missing.mp4"), isolate=isolate)
+        assert [(r["stage"], r["resolution"]) for r in results["results"]] == [("encode", "source")]
+        assert "error" in results["results"][0]
+
+
+def test_isolated_cases_run_in_their_own_process():
+    """Each case gets a fresh process, so peak RSS is not inherited from earlier cases."""
+    results = run_benchmark(["encode"], resolutions=[(64, 48), (96, 64)], iterations=2,
+                            warmup=0, isolate=True)
+    assert results["meta"]["rss_scope"] == "case"
+    assert [r["resolution"] for r in results["results"]] == ["64x48", "96x64"]
+    assert all(r["peak_rss_mb"] for r in results["results"])
+    in_process = run_benchmark(["encode"], resolutions=[(64, 48)], iterations=2, warmup=0,
+                               isolate=False)
+    assert in_process["meta"]["rss_scope"] == "process"
+    # Cumulative in-process RSS is not comparable with a per-case baseline.
+    assert {r["metric"] for r in compare(in_process, results)} == {"p50_ms", "p95_ms", "fps"}
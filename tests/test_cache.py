@@ -0,0 +1,107 @@
+# tests/test_cache.py
+import os
+import time
+from types import SimpleNamespace
+
+from rvm.core.cache import ResultCache, open_cache
+
+
+def test_cache_round_trip_and_stats(tmp_path):
+    cache = ResultCache(tmp_path)
+    key = cache.key("img-digest", "detect", "weights-digest", {"backend": "torch"})
+    assert cache.get(key) is None
+
+    cache.put(key, [{"x1": 1, "class_id": 2}])
+    assert cache.get(key) == [{"x1": 1, "class_id": 2}]
+    assert cache.stats() == {"hits": 1, "misses": 1, "evictions": 0}
+    # No temporary files are left behind by the atomic write
+    assert not list(tmp_path.rglob(".tmp-*"))
+
+
+def test_cache_key_depends_on_every_part():
+    base = ResultCache.key("a", "detect", "m", {"tile_size": None})
+    assert base == ResultCache.key("a", "detect", "m", {"tile_size": None})
+    assert base != ResultCache.key("b", "detect", "m", {"tile_size": None})
+    assert base != ResultCache.key("a", "segment", "m", {"tile_size": None})
+    assert base != ResultCache.key("a", "detect", "m2", {"tile_size": None})
+    assert base != ResultCache.key("a", "detect", "m", {"tile_size": 640})
+
+
+def test_cache_evicts_least_recently_used(tmp_path):
+    cache = ResultCache(tmp_path, max_bytes=10_000)
+    payload = "x" * 1000
+    keys = [cache.key(str(i), "detect", "m", {}) for i in range(5)]
+    for i, key in enumerate(keys):
+        cache.put(key, payload)
+        path = cache._path(key)
+        os.utime(path, ns=(time.time_ns() - (10 - i) * 10**9,) * 2)
+    cache.get(keys[0])  # refresh the oldest entry
+
+    cache.max_bytes = 3500
+    cache.evict()
+    remaining = [k for k in keys if cache._path(k).exists()]
+    assert keys[0] in remaining and keys[1] not in remaining
+    assert cache.size_bytes() <= 3500
+
+
+def test_open_cache_reuses_instances(tmp_path):
+    assert open_cache(None) is None
+    assert open_cache(str(tmp_path)) is open_cache(tmp_path)
+
+
+def test_fallback_masks_are_not_cached(tmp_path, monkeypatch):
+    """A FastSAM failure must not leave its placeholder rectangle in the cache."""
+    import cv2
+    import numpy as np
+
+    from rvm import api
+    from rvm.segment.sam_lite import SamLiteSegmenter
+
+    calls = []
+
+    def predict(image):
+        calls.append(1)
+        if len(calls) == 1:
+            raise RuntimeError("CUDA out of memory")
+        mask = SimpleNamespace(xy=[np.array([[1.0, 1.0], [9.0, 1.0], [9.0, 9.0]])])
+        return [SimpleNamespace(masks=[mask])]
+
+    segmenter = SamLiteSegmenter.__new__(SamLiteSegmenter)
+    segmenter.mask_format, segmenter._available, segmenter._predict = "polygon", True, predict
+    monkeypatch.setattr(api, "get_segmenter", lambda model: segmenter)
+    image_path = str(tmp_path / "img.png")
+    img = np.zeros((40, 40, 3), np.uint8)
+    cv2.imwrite(image_path, img)
+    cache = ResultCache(tmp_path / "cache")
+
+    _, fallback = api._segment_array(img, image_path, cache=cache)
+    assert fallback[0]["segmentation"] == [[10, 10], [30, 10], [30, 30], [10, 30]]
+    _, real = api._segment_array(img, image_path, cache=cache)
+    assert real[0]["segmentation"] == [[1, 1], [9, 1], [9, 9]]
+    assert api._segment_array(img, image_path, cache=cache)[1] == real
+    assert len(calls) == 2
+
+
+def test_cascade_steps_are_reported_only_when_decoded(tmp_path, monkeypatch):
+    """A cache hit has no cascade timings instead of the ones of an earlier decode."""
+    import cv2
+    import numpy as np
+
+    from rvm import api
+
+    class _Codes:
+        def detect_with_report(self, image, expected=None):
+            return [], [], [{"step": "gray", "ms": 1.0, "new": 0, "total": 0}]
+
+    monkeypatch.setattr(api, "get_aruco_detector", lambda: SimpleNamespace(detect=lambda img: []))
+    monkeypatch.setattr(api, "get_barcode_detector", lambda localize, cascade: _Codes())
+    image_path = str(tmp_path / "img.png")
+    img = np.zeros((40, 40, 3), np.uint8)
+    cv2.imwrite(image_path, img)
+    cache = ResultCache(tmp_path / "cache")
+
+    _, first = api._markers_array(img, image_path, cache=cache, cascade=True)
+    assert first["detection_summary"]["cascade_steps"][0]["step"] == "gray"
+    _, second = api._markers_array(img, image_path, cache=cache, cascade=True)
+    assert cache.stats()["hits"] == 1
+    assert "cascade_steps" not in second["detection_summary"]
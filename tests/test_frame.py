@@ -0,0 +1,39 @@
+# tests/test_frame.py
+import cv2
+import numpy as np
+import pytest
+
+from rvm.core.frame import FrameContext
+
+
+def _frame():
+    rng = np.random.default_rng(0)
+    return rng.integers(0, 256, (64, 96, 3), dtype=np.uint8)
+
+
+def test_views_match_opencv_and_are_memoized():
+    img = _frame()
+    ctx = FrameContext(img)
+    gray = cv2.cvtColor(img, cv2.COLOR_BGR2GRAY)
+    assert np.array_equal(ctx.gray, gray)
+    assert ctx.gray is ctx.gray
+    assert np.array_equal(ctx.equalized, cv2.equalizeHist(gray))
+    assert ctx.equalized is ctx.equalized
+    assert np.array_equal(ctx.rgb, img[..., ::-1])
+
+
+def test_pyramid_levels():
+    ctx = FrameContext(_frame())
+    assert ctx.pyramid(0) is ctx.gray
+    assert ctx.pyramid(2).shape == (16, 24)
+    assert ctx.pyramid(2) is ctx.pyramid(2)
+    with pytest.raises(ValueError):
+        ctx.pyramid(-1)
+
+
+def test_grayscale_input_and_of():
+    gray = _frame()[..., 0].copy()
+    ctx = FrameContext(gray)
+    assert ctx.gray is gray
+    assert FrameContext.of(ctx) is ctx
+    assert FrameContext.of(gray).image is gray
@@ -0,0 +1,72 @@
+# tests/test_loader.py
+import threading
+import time
+
+import numpy as np
+import pytest
+
+from rvm.io.loader import LatestFrameGrabber, iter_frame_batches
+
+
+class _FakeCapture:
+    """Capture that produces `n` numbered frames, one every `interval` seconds."""
+
+    def __init__(self, n, interval=0.0):
+        self.n = n
+        self.interval = interval
+        self.i = 0
+        self.released = threading.Event()
+
+    def read(self):
+        if self.i >= self.n:
+            return False, None
+        time.sleep(self.interval)
+        frame = np.full((2, 2, 3), self.i, dtype=np.uint8)
+        self.i += 1
+        return True, frame
+
+    def isOpened(self):
+        return True
+
+    def release(self):
+        self.released.set()
+
+
+def test_iter_frame_batches_groups_frames():
+    batches = list(iter_frame_batches(_FakeCapture(7), batch_size=3))
+    assert [len(b) for b in batches] == [3, 3, 1]
+    assert [int(f[0, 0, 0]) for b in batches for f in b] == list(range(7))
+
+
+def test_iter_frame_batches_rejects_bad_size():
+    with pytest.raises(ValueError):
+        next(iter_frame_batches(_FakeCapture(3), batch_size=0))
+
+
+def test_latest_frame_grabber_drops_stale_frames():
+    """A slow consumer only sees recent frames; skipped ones are counted as dropped."""
+    grabber = LatestFrameGrabber(_FakeCapture(30, interval=0.002))
+    seen = []
+    for frame_idx, capture_ts, frame in grabber:
+        assert int(frame[0, 0, 0]) == frame_idx
+        assert capture_ts <= time.time()
+        seen.append(frame_idx)
+        time.sleep(0.01)
+    grabber.release()
+
+    assert seen == sorted(seen)
+    assert grabber.captured == 30
+    assert grabber.dropped > 0
+    assert grabber.delivered + grabber.dropped == grabber.captured
+    assert grabber.cap.released.is_set()
+
+
+def test_latest_frame_grabber_release_waits_for_blocked_read():
+    """A capture stuck in read() is released by the grabber thread once the read returns."""
+    cap = _FakeCapture(100, interval=0.3)
+    grabber = LatestFrameGrabber(cap)
+    time.sleep(0.05)  # the grabber is now inside a slow read
+    grabber.release(timeout=0.05)
+    assert not cap.released.is_set()
+    assert cap.released.wait(1.0)
+    assert cap.i == 1
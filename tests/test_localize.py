@@ -0,0 +1,30 @@
+# tests/test_localize.py
+import cv2
+import numpy as np
+
+from rvm.markers.localize import LINEAR, MATRIX, find_code_regions
+
+
+def _scene():
+    rng = np.random.default_rng(0)
+    img = (np.full((1500, 2000), 200.0) + rng.normal(0, 8, (1500, 2000))).clip(0, 255).astype(np.uint8)
+    qr = cv2.resize(cv2.QRCodeEncoder.create().encode("rvm"), (300, 300), interpolation=cv2.INTER_NEAREST)
+    img[200:500, 300:600] = qr
+    bars = np.where((rng.random(95) > 0.5).repeat(4), 0, 255).astype(np.uint8)
+    img[1000:1200, 1200:1200 + bars.size] = bars
+    return img
+
+
+def test_find_code_regions_locates_and_classifies():
+    regions = find_code_regions(_scene(), max_side=800)
+    kinds = {}
+    for r in regions:
+        if r.x1 <= 300 and r.y1 <= 200 and r.x2 >= 600 and r.y2 >= 500:
+            kinds["qr"] = r.kind
+        if r.x1 <= 1200 and r.y1 <= 1000 and r.x2 >= 1580 and r.y2 >= 1200:
+            kinds["bars"] = r.kind
+    assert kinds == {"qr": MATRIX, "bars": LINEAR}
+
+
+def test_find_code_regions_empty_on_flat_image():
+    assert find_code_regions(np.full((600, 800), 128, np.uint8)) == []
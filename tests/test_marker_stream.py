@@ -0,0 +1,77 @@
+# tests/test_marker_stream.py
+import cv2
+import numpy as np
+
+from rvm.core.types import QRCode
+from rvm.markers.stream import StreamingMarkerDetector
+
+
+class _Codes:
+    """Decoder double: 'reads' the code when a window covers its true position."""
+    localize_side = 1024
+
+    def __init__(self):
+        self.box = None
+        self.calls = 0
+
+    def _read(self):
+        x1, y1, x2, y2 = self.box
+        return QRCode(data="pallet-42", corners=[(x1, y1), (x2, y1), (x2, y2), (x1, y2)])
+
+    def detect(self, image):
+        self.calls += 1
+        return ([self._read()] if self.box else []), []
+
+    def detect_regions(self, image, regions):
+        self.calls += 1
+        if self.box is None:
+            return [], []
+        x1, y1, x2, y2 = self.box
+        hit = any(r.x1 <= x1 and r.y1 <= y1 and r.x2 >= x2 and r.y2 >= y2 for r in regions)
+        return ([self._read()] if hit else []), []
+
+
+class _NoAruco:
+    def detect(self, image):
+        return []
+
+
+def _frames(n, step=5):
+    rng = np.random.default_rng(0)
+    bg = cv2.GaussianBlur(rng.normal(150, 30, (360, 480)).clip(0, 255).astype(np.uint8), (7, 7), 0)
+    code = cv2.resize((rng.random((21, 21)) > 0.5).astype(np.uint8) * 255, (105, 105),
+                      interpolation=cv2.INTER_NEAREST)
+    for i in range(n):
+        x, y = 40 + i * step, 60 + i
+        frame = bg.copy()
+        frame[y:y + 105, x:x + 105] = code
+        yield cv2.cvtColor(frame, cv2.COLOR_GRAY2BGR), (x, y, x + 104, y + 104)
+
+
+def test_code_is_decoded_once_and_tracked():
+    codes = _Codes()
+    stream = StreamingMarkerDetector(aruco=_NoAruco(), codes=codes, scan_every=1)
+    for frame, box in _frames(20):
+        codes.box = box
+        _, qr_codes, _ = stream.detect(frame)
+        assert [q.data for q in qr_codes] == ["pallet-42"]
+        assert np.abs(np.subtract(qr_codes[0].corners[0], box[:2])).max() <= 2
+    assert stream.decoded == 1 and stream.reused == 19
+    assert [t.track_id for t in stream.tracks] == [1]
+    assert stream.tracks[0].reused
+
+
+def test_lost_track_is_redecoded_or_dropped():
+    codes = _Codes()
+    stream = StreamingMarkerDetector(aruco=_NoAruco(), codes=codes, scan_every=100)
+    frames = list(_frames(3))
+    for frame, box in frames[:2]:
+        codes.box = box
+        stream.detect(frame)
+    # The code disappears: tracking confidence collapses, the re-decode finds nothing.
+    blank = cv2.GaussianBlur(frames[2][0], (31, 31), 0)
+    codes.box = None
+    calls = codes.calls
+    _, qr_codes, _ = stream.detect(blank)
+    assert qr_codes == [] and stream.tracks == []
+    assert codes.calls == calls + 1
@@ -0,0 +1,31 @@
+# tests/test_motion.py
+import numpy as np
+
+from rvm.core.motion import MotionGate
+
+
+def _frame(value=0):
+    return np.full((240, 320, 3), value, dtype=np.uint8)
+
+
+def test_motion_gate_skips_static_frames():
+    """Identical frames are skipped after the first; a moving object triggers inference."""
+    gate = MotionGate(threshold=0.01)
+    assert gate.should_infer(_frame())
+    assert not gate.should_infer(_frame())
+
+    moved = _frame()
+    moved[50:150, 50:150] = 255
+    assert gate.should_infer(moved)
+    assert not gate.should_infer(moved.copy())
+    assert (gate.checked, gate.skipped) == (4, 2)
+
+
+def test_motion_gate_roi_and_max_skip():
+    """Changes outside the ROI are ignored; max_skip forces periodic inference."""
+    gate = MotionGate(threshold=0.01, roi=(0, 0, 100, 100), max_skip=2)
+    gate.should_infer(_frame())
+    outside = _frame()
+    outside[150:, 200:] = 255
+    decisions = [gate.should_infer(outside) for _ in range(3)]
+    assert decisions == [False, False, True]
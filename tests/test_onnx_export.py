@@ -0,0 +1,54 @@
+# tests/test_onnx_export.py
+import multiprocessing as mp
+import sys
+import time
+import types
+from pathlib import Path
+
+from rvm.detect.onnx_backend import _cache_path
+
+
+class _FakeYOLO:
+    """Stands in for ultralytics.YOLO: export writes <stem>.onnx slowly, like the real one."""
+
+    def __init__(self, path):
+        self.ckpt_path = path
+
+    def export(self, format, imgsz, **kwargs):
+        out = Path(self.ckpt_path).with_suffix(".onnx")
+        with open(out, "wb") as f:
+            f.write(b"half")
+            f.flush()
+            time.sleep(0.3)
+            f.write(b"-done")
+        with open(Path(self.ckpt_path).with_name("exports.log"), "a") as log:
+            log.write("export\n")
+        return str(out)
+
+
+def _export(weights, barrier, results):
+    sys.modules["ultralytics"] = types.SimpleNamespace(YOLO=_FakeYOLO)
+    from rvm.detect.onnx_backend import export_onnx
+
+    barrier.wait()
+    path = export_onnx(weights, imgsz=320)
+    results.put((path, Path(path).read_bytes()))
+
+
+def test_concurrent_workers_export_once(tmp_path):
+    """Two processes exporting the same weights get one complete, shared export."""
+    weights = tmp_path / "model.pt"
+    weights.write_bytes(b"weights")
+    ctx = mp.get_context("spawn")
+    barrier, results = ctx.Barrier(2), ctx.Queue()
+    procs = [ctx.Process(target=_export, args=(str(weights), barrier, results)) for _ in range(2)]
+    for p in procs:
+        p.start()
+    outputs = [results.get(timeout=60) for _ in procs]
+    for p in procs:
+        p.join(timeout=60)
+        assert p.exitcode == 0
+
+    cached = str(_cache_path(weights, 320))
+    assert outputs == [(cached, b"half-done")] * 2
+    assert (tmp_path / "exports.log").read_text() == "export\n"
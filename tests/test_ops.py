@@ -0,0 +1,40 @@
+# tests/test_ops.py
+import numpy as np
+
+from rvm.detect.ops import batched_nms, box_iou, letterbox, nms, scale_boxes
+
+
+def test_box_iou():
+    a = np.array([[0, 0, 10, 10]], dtype=np.float32)
+    b = np.array([[0, 0, 10, 10], [5, 0, 15, 10], [20, 20, 30, 30]], dtype=np.float32)
+    np.testing.assert_allclose(box_iou(a, b), [[1.0, 1 / 3, 0.0]], rtol=1e-6)
+
+
+def test_nms_suppresses_overlaps():
+    boxes = np.array([[0, 0, 10, 10], [1, 1, 11, 11], [20, 20, 30, 30]], dtype=np.float32)
+    scores = np.array([0.8, 0.9, 0.7])
+    assert nms(boxes, scores, 0.5).tolist() == [1, 2]
+    assert nms(boxes, scores, 0.9).tolist() == [1, 0, 2]
+
+
+def test_batched_nms_keeps_other_classes():
+    boxes = np.array([[0, 0, 10, 10], [1, 1, 11, 11]], dtype=np.float32)
+    scores = np.array([0.8, 0.9])
+    assert batched_nms(boxes, scores, np.array([0, 1]), 0.5).tolist() == [1, 0]
+    assert batched_nms(boxes, scores, np.array([2, 2]), 0.5).tolist() == [1]
+    assert batched_nms(np.zeros((0, 4)), np.zeros(0), np.zeros(0), 0.5).tolist() == []
+
+
+def test_letterbox_scale_roundtrip():
+    """Boxes in letterboxed coordinates map back onto the original image."""
+    image = np.zeros((300, 200, 3), dtype=np.uint8)
+    padded, ratio, pad = letterbox(image, 320)
+    assert padded.shape == (320, 320, 3)
+
+    original = np.array([[10, 20, 110, 220]], dtype=np.float32)
+    letterboxed = original * ratio + np.array([pad[0], pad[1], pad[0], pad[1]])
+    np.testing.assert_allclose(scale_boxes(letterboxed, ratio, pad, (300, 200)), original,
+                               atol=1e-3)
+
+    rect, _, _ = letterbox(image, 320, auto=True)
+    assert rect.shape[0] == 320 and rect.shape[1] % 32 == 0 and rect.shape[1] < 320
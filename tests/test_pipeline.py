@@ -0,0 +1,73 @@
+# tests/test_pipeline.py
+import time
+
+import pytest
+
+from rvm.core.pipeline import run_stages
+
+
+def _slow_square(x):
+    time.sleep(0.001 * (x % 3))
+    return x * x
+
+
+@pytest.mark.parametrize("threaded", [False, True])
+def test_run_stages_preserves_order(threaded):
+    """Threaded and sequential runs produce the same ordered output."""
+    out = list(run_stages(range(50), [_slow_square, lambda x: x + 1], threaded=threaded, maxsize=2))
+    assert out == [x * x + 1 for x in range(50)]
+
+
+def test_run_stages_propagates_errors():
+    """An exception in a worker stage is raised in the consumer."""
+    def boom(x):
+        if x == 3:
+            raise RuntimeError("stage failed")
+        return x
+
+    with pytest.raises(RuntimeError, match="stage failed"):
+        list(run_stages(range(10), [boom], threaded=True))
+
+
+def test_run_stages_early_stop():
+    """Closing the consumer early shuts down the worker threads."""
+    gen = run_stages(iter(range(1000)), [lambda x: x], threaded=True, maxsize=1)
+    assert next(gen) == 0
+    gen.close()
+
+
+def test_video_stops_stages_before_release(monkeypatch):
+    """Stopping a pipelined video run early joins the stage threads before releasing handles."""
+    import numpy as np
+
+    from rvm import api
+    from rvm.core.types import Detections
+
+    events = []
+
+    class _Capture:
+        def read(self):
+            time.sleep(0.01)
+            events.append("read")
+            return True, np.zeros((8, 8, 3), np.uint8)
+
+        def release(self):
+            events.append("release")
+
+    class _Writer:
+        def write(self, frame):
+            events.append("write")
+
+        def release(self):
+            events.append("release")
+
+    class _Detector:
+        def detect_batch(self, frames, batch_size=1):
+            return [Detections.empty() for _ in frames]
+
+    monkeypatch.setattr(api, "load_video", lambda source, out_path: (_Capture(), _Writer()))
+    frames = api._video_frames(_Detector(), "in.mp4", "out.mp4", 1, pipelined=True)
+    next(frames)
+    frames.close()
+    time.sleep(0.05)
+    assert events[-2:] == ["release", "release"]
@@ -0,0 +1,53 @@
+import numpy as np
+import pytest
+
+from eval.coco_eval import evaluate_predictions
+from eval.coco_format import category_mapping, to_coco_results
+from rvm import api
+from rvm.core.types import Detections
+from rvm.io.writer import save_image
+from rvm.predict import predict_coco
+
+CATEGORIES = [{"id": 1, "name": "person"}, {"id": 3, "name": "car"},
+              {"id": 44, "name": "Traffic-Light"}]
+
+
+class _Detector:
+    names = {0: "person", 1: "bicycle", 2: "car", 3: "traffic light"}
+
+    def detect_batch(self, frames, batch_size=8):
+        return [Detections(np.array([[10, 20, 40, 60], [0, 0, 5, 5], [1, 1, 9, 9.5]]),
+                           [0.9, 0.5, 0.123456], [0, 1, 3]) for _ in frames]
+
+
+def test_category_mapping_by_name():
+    """Class names match category names regardless of case and punctuation."""
+    mapping = category_mapping(_Detector.names, CATEGORIES, overrides={1: 3})
+    assert mapping == {0: 1, 1: 3, 2: 3, 3: 44}
+    results = to_coco_results(_Detector().detect_batch([None])[0], 7, {0: 1, 3: 44})
+    assert results == [
+        {"image_id": 7, "category_id": 1, "bbox": [10.0, 20.0, 30.0, 40.0], "score": 0.9},
+        {"image_id": 7, "category_id": 44, "bbox": [1.0, 1.0, 8.0, 8.5], "score": 0.12346},
+    ]
+
+
+def test_predict_then_evaluate(tmp_path, monkeypatch):
+    """Predictions stream into COCO format and evaluate without a predictions file."""
+    monkeypatch.setattr(api, "_build_detector", lambda model, **options: _Detector())
+    for name in ("a.jpg", "b.jpg"):
+        save_image(np.zeros((64, 64, 3), np.uint8), str(tmp_path), name)
+    dataset = {
+        "images": [{"id": i, "file_name": f, "width": 64, "height": 64}
+                   for i, f in [(1, "a.jpg"), (2, "b.jpg"), (3, "missing.jpg")]],
+        "annotations": [{"id": 1, "image_id": 1, "category_id": 1, "bbox": [10, 20, 30, 40],
+                         "area": 1200, "iscrowd": 0}],
+        "categories": CATEGORIES,
+    }
+    preds = list(predict_coco(dataset, str(tmp_path), workers=1, batch_size=1))
+    assert sorted(p["image_id"] for p in preds) == [1, 1, 2, 2]
+    assert {p["category_id"] for p in preds} == {1, 44}
+
+    metrics = [evaluate_predictions(preds, dataset, str(tmp_path / b), backend=b, workers=1)
+               for b in ("numpy", "pycocotools")]
+    assert metrics[0] == pytest.approx(metrics[1])
+    assert metrics[0]["recall"] == pytest.approx(1.0)
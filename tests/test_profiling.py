@@ -0,0 +1,89 @@
+import json
+
+import cv2
+import numpy as np
+
+from rvm import api
+from rvm.core.profiling import NULL_PROFILER, Profiler, dir_profiler, open_profiler
+from rvm.core.types import Detections
+
+
+class _Detector:
+    names = {0: "person"}
+
+    def __init__(self):
+        self.last_timings = {}
+
+    def detect_batch(self, frames, batch_size=1):
+        self.last_timings = {"preprocess": 0.001, "inference": 0.002, "postprocess": 0.001}
+        return [Detections(np.array([[1, 1, 9, 9]]), [0.9], [0]) for _ in frames]
+
+
+def test_stages_counters_and_sinks(tmp_path):
+    """Stage times and counters accumulate and reach the JSON Lines and Prometheus sinks."""
+    prof = dir_profiler(tmp_path)
+    for _ in range(3):
+        with prof.stage("infer"):
+            pass
+        prof.add_time("inference", 0.5)
+        prof.count("detections", 2)
+        prof.frame()
+    assert list(prof.timed(iter("ab"), "decode")) == ["a", "b"]
+    prof.close()
+
+    snap = json.loads((tmp_path / "profile.jsonl").read_text().splitlines()[-1])
+    assert snap["frames"] == 3 and snap["counters"] == {"detections": 6}
+    assert snap["stages"]["inference"] == {"calls": 3, "total_ms": 1500.0, "mean_ms": 500.0,
+                                           "max_ms": 500.0}
+    assert snap["stages"]["decode"]["calls"] == 2
+    metrics = (tmp_path / "metrics.prom").read_text().splitlines()
+    assert "rvm_frames_total 3" in metrics
+    assert 'rvm_stage_seconds_total{stage="inference"} 1.5' in metrics
+    assert "rvm_detections_total 6" in metrics
+
+
+def test_null_profiler_and_resolution(tmp_path):
+    frames = iter([1, 2])
+    assert NULL_PROFILER.timed(frames, "decode") is frames
+    with NULL_PROFILER.stage("infer"):
+        NULL_PROFILER.count("detections")
+    assert open_profiler(None) == (NULL_PROFILER, False)
+    prof = Profiler()
+    assert open_profiler(prof) == (prof, False)
+    snapshots = []
+    prof, owned = open_profiler(snapshots.append)
+    assert owned
+    prof.close()
+    assert len(snapshots) == 1 and snapshots[0]["frames"] == 0
+
+
+def test_profiling_window(tmp_path):
+    """cProfile (and tracemalloc) run only for the requested frames."""
+    prof = Profiler(profile_frames=(2, 2), trace_memory=True, profile_dir=str(tmp_path))
+    for i in range(5):
+        prof.frame()
+        assert (tmp_path / "profile.pstats").exists() == (i >= 3)
+    assert (tmp_path / "tracemalloc.txt").exists()
+    prof.close()
+
+
+def test_detect_video_profile(tmp_path, monkeypatch):
+    """Video detection records decode/infer/draw/encode/json and the detector breakdown."""
+    monkeypatch.setattr(api, "_build_detector", lambda model, **options: _Detector())
+    video = str(tmp_path / "in.mp4")
+    writer = cv2.VideoWriter(video, cv2.VideoWriter_fourcc(*"mp4v"), 10, (32, 32))
+    for i in range(5):
+        writer.write(np.full((32, 32, 3), i * 40, np.uint8))
+    writer.release()
+
+    snapshots = []
+    results = api.detect(video, out_dir=str(tmp_path / "out"), batch_size=2,
+                         profile=snapshots.append)
+    assert len(results) == 5
+    snap = snapshots[-1]
+    assert snap["frames"] == 5 and snap["counters"] == {"detections": 5}
+    stages = snap["stages"]
+    assert {"decode", "infer", "preprocess", "inference", "postprocess", "draw", "encode",
+            "json"} <= set(stages)
+    assert stages["infer"]["calls"] == 3 and stages["json"]["calls"] == 1
+    assert stages["inference"]["total_ms"] == 6.0
@@ -0,0 +1,76 @@
+# tests/test_registry.py
+import pytest
+
+from rvm.core.registry import ModelRegistry
+
+
+class _FakeModel:
+    def __init__(self, name, nbytes=0):
+        self.name = name
+        self.warmups = 0
+        self.model = _FakeModule(nbytes)
+
+    def warmup(self):
+        self.warmups += 1
+
+
+class _FakeModule:
+    def __init__(self, nbytes):
+        self._nbytes = nbytes
+
+    def parameters(self):
+        return [_FakeParam(self._nbytes)]
+
+
+class _FakeParam:
+    def __init__(self, nbytes):
+        self._nbytes = nbytes
+
+    def numel(self):
+        return self._nbytes
+
+    def element_size(self):
+        return 1
+
+
+def test_registry_reuses_and_warms_once():
+    """A key is built and warmed up once, then served from the cache."""
+    registry = ModelRegistry()
+    built = []
+
+    def factory():
+        built.append(1)
+        return _FakeModel("a")
+
+    first = registry.get(("torch", "a.pt", None, 640), factory, warmup=True)
+    second = registry.get(("torch", "a.pt", None, 640), factory, warmup=True)
+
+    assert first is second
+    assert len(built) == 1
+    assert first.warmups == 1
+
+
+def test_registry_lru_eviction_by_count():
+    """The least recently used entry is evicted when max_models is exceeded."""
+    registry = ModelRegistry(max_models=2)
+    registry.get("a", lambda: _FakeModel("a"))
+    registry.get("b", lambda: _FakeModel("b"))
+    registry.get("a", lambda: _FakeModel("a"))  # touch a
+    registry.get("c", lambda: _FakeModel("c"))
+
+    assert registry.keys() == ["a", "c"]
+
+
+def test_registry_memory_cap():
+    """Entries are evicted until the estimated memory fits under max_bytes."""
+    registry = ModelRegistry(max_bytes=100)
+    registry.get("a", lambda: _FakeModel("a", nbytes=60))
+    registry.get("b", lambda: _FakeModel("b", nbytes=60))
+
+    assert registry.keys() == ["b"]
+    assert registry.total_bytes == 60
+
+
+def test_registry_rejects_bad_cap():
+    with pytest.raises(ValueError):
+        ModelRegistry(max_models=0)
@@ -0,0 +1,49 @@
+# tests/test_rle.py
+import numpy as np
+import pytest
+
+from rvm.core import rle
+from rvm.core.types import Mask
+
+
+def _masks():
+    masks = np.zeros((3, 40, 60), dtype=np.uint8)
+    masks[0, 5:20, 10:30] = 1
+    masks[1, 0, 0] = 1
+    masks[1, 30:, 50:] = 1
+    return masks
+
+
+def test_rle_round_trip_area_bbox():
+    masks = _masks()
+    rles = rle.encode_batch(masks)
+    np.testing.assert_array_equal(rle.decode_batch(rles), masks)
+    assert rle.area(rles[0]) == 15 * 20
+    assert rle.bbox(rles[0]) == [10, 5, 20, 15]
+    assert rle.bbox(rles[1]) == [0, 0, 60, 40]
+    assert rle.bbox(rles[2]) == [0, 0, 0, 0]
+    # Decoding a region returns the matching crop
+    np.testing.assert_array_equal(rle.decode(rles[1], [50, 30, 10, 10]), masks[1, 30:, 50:])
+
+
+def test_rle_empty_stack():
+    """A frame without masks encodes to no RLEs instead of failing."""
+    assert rle.encode_batch(np.zeros((0, 40, 60), dtype=bool)) == []
+
+
+def test_rle_matches_pycocotools():
+    mask_utils = pytest.importorskip("pycocotools.mask")
+    masks = (np.random.default_rng(0).random((4, 33, 47)) > 0.6).astype(np.uint8)
+    ref = mask_utils.encode(np.asfortranarray(masks.transpose(1, 2, 0)))
+    ours = rle.encode_batch(masks)
+    assert [r["counts"] for r in ours] == [r["counts"].decode() for r in ref]
+    assert [rle.area(r) for r in ours] == mask_utils.area(ref).tolist()
+
+
+def test_mask_polygon_on_demand():
+    m = Mask(segmentation=[], confidence=0.9, rle=rle.encode(_masks()[0]))
+    assert m.area == 300
+    assert m.bbox == [10, 5, 20, 15]
+    xs, ys = zip(*m.polygon)
+    assert (min(xs), min(ys), max(xs), max(ys)) == (10, 5, 29, 19)
+    assert "rle" in m.to_dict() and "rle" not in Mask([[0, 0]], 1.0).to_dict()
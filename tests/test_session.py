@@ -0,0 +1,39 @@
+# tests/test_session.py
+import numpy as np
+
+from rvm.core.types import Detections
+from rvm.segment.session import SegmentationSession
+
+
+def _session():
+    masks = np.zeros((3, 60, 80), dtype=bool)
+    masks[0, 10:50, 10:70] = True   # large region
+    masks[1, 20:30, 20:30] = True   # small object inside it
+    masks[2, 40:58, 60:78] = True   # separate object
+    return SegmentationSession(masks)
+
+
+def test_point_prompts_pick_smallest_containing_mask():
+    session = _session()
+    idx = session.point_indices([[25, 25], [15, 45], [70, 55], [0, 0], [500, 500]])
+    assert idx.tolist() == [1, 0, 2, -1, -1]
+
+
+def test_group_prompt_with_background_point():
+    session = _session()
+    assert session.group_index([[25, 25]]) == 1
+    assert session.group_index([[15, 15], [25, 25]]) == 0
+    # A background point rules out every mask containing it
+    assert session.group_index([[25, 25], [15, 15]], [1, 0]) == 1
+    assert session.group_index([[15, 15], [25, 25]], [1, 0]) == -1
+    assert session.group_index([[25, 25], [70, 55]]) == -1
+
+
+def test_box_prompts_from_detections():
+    session = _session()
+    dets = Detections([[19, 19, 31, 31], [60, 40, 78, 58], [0, 0, 5, 5]], [0.9, 0.8, 0.7], [3, 4, 5])
+    assert session.box_indices(dets).tolist() == [1, 2, -1]
+
+    masks = session.in_boxes(dets, mask_format="rle")
+    assert [m.class_id for m in masks] == [3, 4, 5]
+    assert masks[0].area == 100 and masks[2].rle is None
@@ -0,0 +1,64 @@
+# tests/test_slicing.py
+import numpy as np
+
+from rvm.core.types import Detections
+from rvm.detect.slicing import SlicedDetector, fuse_boxes, tile_windows
+
+
+class _BrightSpotDetector:
+    """Fake detector: one box around the bright pixels of each frame, if any."""
+
+    def __init__(self):
+        self.calls = []
+
+    def detect_batch(self, frames, batch_size=8):
+        self.calls.append([f.shape[:2] for f in frames])
+        out = []
+        for frame in frames:
+            ys, xs = np.nonzero(frame[..., 0] > 128)
+            if len(xs) == 0:
+                out.append(Detections.empty())
+            else:
+                out.append(Detections([[xs.min(), ys.min(), xs.max() + 1, ys.max() + 1]], [0.9], [0]))
+        return out
+
+
+def test_tile_windows_cover_image():
+    windows = tile_windows(1000, 1500, tile_size=640, overlap=0.25)
+    covered = np.zeros((1000, 1500), dtype=bool)
+    for x1, y1, x2, y2 in windows:
+        assert x2 - x1 == 640 and y2 - y1 == 640
+        covered[y1:y2, x1:x2] = True
+    assert covered.all()
+    assert tile_windows(300, 200, tile_size=640) == [(0, 0, 200, 300)]
+
+
+def test_sliced_detector_maps_tiles_back_to_image():
+    image = np.zeros((1000, 1000, 3), dtype=np.uint8)
+    image[900:920, 100:130] = 255  # small object in the bottom-left tile only
+    inner = _BrightSpotDetector()
+
+    dets = SlicedDetector(inner, tile_size=512, overlap=0.2, full_pass=False).detect(image)
+
+    assert dets.xyxy.tolist() == [[100, 900, 130, 920]]
+    assert len(inner.calls) == 1  # all tiles in one batched call
+    assert len(inner.calls[0]) == 9  # 3 x 3 tiles
+
+
+def test_sliced_detector_full_pass_and_nms():
+    image = np.zeros((1000, 1000, 3), dtype=np.uint8)
+    image[100:130, 100:130] = 255
+    inner = _BrightSpotDetector()
+
+    dets = SlicedDetector(inner, tile_size=512, overlap=0.2, full_pass=True).detect(image)
+
+    assert inner.calls[0][-1] == (1000, 1000)
+    assert len(dets) == 1
+
+
+def test_fuse_boxes_rejoins_split_object():
+    """Two halves of an object cut by a tile border merge into one enclosing box."""
+    dets = Detections([[0, 0, 50, 40], [45, 0, 100, 40], [0, 0, 20, 20]], [0.8, 0.6, 0.7], [1, 1, 2])
+    fused = fuse_boxes(dets, ios_threshold=0.05)
+    assert sorted(map(tuple, fused.xyxy.tolist())) == [(0, 0, 20, 20), (0, 0, 100, 40)]
+    assert sorted(fused.scores.tolist()) == [np.float32(0.7), np.float32(0.8)]
@@ -0,0 +1,41 @@
+# tests/test_sources.py
+import pytest
+
+from rvm.io.sources import is_image_collection, resolve_images
+
+
+def _touch(path):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(b"")
+    return str(path)
+
+
+def test_is_image_collection(tmp_path):
+    assert is_image_collection(str(tmp_path))
+    assert is_image_collection(str(tmp_path / "*.jpg"))
+    assert is_image_collection("list.txt")
+    assert is_image_collection(["a.jpg", "b.jpg"])
+    assert not is_image_collection("0")
+    assert not is_image_collection("video.mp4")
+    assert not is_image_collection(str(tmp_path / "single.jpg"))
+
+
+def test_resolve_images_directory_and_glob(tmp_path):
+    a = _touch(tmp_path / "a.jpg")
+    b = _touch(tmp_path / "sub" / "b.PNG")
+    _touch(tmp_path / "notes.md")
+
+    assert resolve_images(str(tmp_path)) == sorted([a, b])
+    assert resolve_images(str(tmp_path), recursive=False) == [a]
+    assert resolve_images(str(tmp_path / "*.jpg")) == [a]
+
+
+def test_resolve_images_file_list(tmp_path):
+    listing = tmp_path / "images.txt"
+    listing.write_text("x.jpg\n# comment\n\ny.jpg\nx.jpg\n")
+    assert resolve_images(str(listing)) == ["x.jpg", "y.jpg"]
+
+
+def test_resolve_images_rejects_single_file(tmp_path):
+    with pytest.raises(ValueError):
+        resolve_images(str(tmp_path / "single.jpg"))
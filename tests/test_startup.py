@@ -0,0 +1,52 @@
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parents[1]
+
+# Backends that must only be imported when a task actually uses them.
+HEAVY = ("torch", "ultralytics", "onnxruntime", "matplotlib", "pycocotools", "pyzbar")
+
+# Generous enough for a loaded CI machine; a torch import alone takes longer.
+BUDGET_S = 2.0
+
+_PROBE = """
+import contextlib, io, json, sys, time
+sys.argv = ["prog", "--help"]
+start = time.perf_counter()
+import {module} as mod
+if {call}:
+    with contextlib.redirect_stdout(io.StringIO()):
+        try:
+            mod.main()
+        except SystemExit:
+            pass
+print(json.dumps({{"seconds": time.perf_counter() - start,
+                   "heavy": [m for m in {heavy!r} if m in sys.modules]}}))
+"""
+
+
+def _probe(module, call):
+    code = _PROBE.format(module=module, call=call, heavy=HEAVY)
+    out = subprocess.run([sys.executable, "-c", code], cwd=ROOT, capture_output=True,
+                         text=True, check=True).stdout
+    return json.loads(out.strip().splitlines()[-1])
+
+
+@pytest.mark.parametrize("module, call", [
+    ("rvm.api", False),
+    ("rvm.cli.detect", True),
+    ("rvm.cli.segment", True),
+    ("rvm.cli.markers", True),
+    ("rvm.cli.eval_coco", True),
+    ("rvm.cli.bench", True),
+])
+def test_startup_is_light(module, call):
+    """Importing the api and printing CLI help loads no model or plotting backend."""
+    _probe(module, call)  # warm the bytecode cache
+    result = _probe(module, call)
+    assert result["heavy"] == []
+    assert result["seconds"] < BUDGET_S
@@ -0,0 +1,67 @@
+# tests/test_tracker.py
+import numpy as np
+
+from rvm.core.types import Detections
+from rvm.track.tracker import IoUTracker, TrackingDetector, greedy_match
+
+
+def _moving(frame, n=2):
+    """Two objects moving right by 5 px per frame."""
+    xyxy = np.array([[10, 10, 50, 50], [200, 100, 260, 180]], dtype=np.float32)[:n]
+    xyxy[:, [0, 2]] += 5 * frame
+    return Detections(xyxy, [0.9, 0.8][:n], [0, 1][:n])
+
+
+def test_greedy_match_prefers_best_pairs():
+    iou = np.array([[0.9, 0.5], [0.8, 0.1]])
+    rows, cols = greedy_match(iou, 0.3)
+    assert sorted(zip(rows.tolist(), cols.tolist())) == [(0, 0)]
+
+
+def test_tracker_keeps_ids_stable():
+    """Moving objects keep their track ID across frames."""
+    tracker = IoUTracker()
+    first = tracker.update(_moving(0))
+    ids = first.track_ids.tolist()
+    assert len(set(ids)) == 2
+    for frame in range(1, 10):
+        out = tracker.update(_moving(frame))
+        assert out.track_ids.tolist() == ids
+
+
+def test_tracker_predicts_between_detections():
+    """predict() extrapolates the motion learned from previous updates."""
+    tracker = IoUTracker()
+    for frame in range(6):
+        tracker.update(_moving(frame))
+    predicted = tracker.predict()
+    assert len(predicted) == 2
+    np.testing.assert_allclose(predicted.xyxy, _moving(6).xyxy, atol=2.0)
+
+
+def test_tracker_drops_stale_tracks():
+    tracker = IoUTracker(max_age=2)
+    tracker.update(_moving(0))
+    for _ in range(3):
+        tracker.update(Detections.empty())
+    assert len(tracker) == 0
+
+
+class _CountingDetector:
+    def __init__(self):
+        self.frames = 0
+
+    def detect_batch(self, frames, batch_size=8):
+        start = self.frames
+        self.frames += len(frames)
+        return [_moving(start + i) for i in range(len(frames))]
+
+
+def test_tracking_detector_runs_on_keyframes():
+    """Only every N-th frame reaches the detector; every frame gets tracked boxes."""
+    detector = _CountingDetector()
+    tracking = TrackingDetector(detector, detect_every=3)
+    out = tracking.detect_batch([np.zeros((8, 8, 3), np.uint8)] * 7, batch_size=4)
+    assert len(out) == 7
+    assert tracking.detector_calls == detector.frames == 3
+    assert all(d.track_ids is not None and len(d) == 2 for d in out)
@@ -0,0 +1,53 @@
+# tests/test_types.py
+import numpy as np
+
+from rvm.core.types import Box, Detections
+
+
+def test_detections_roundtrip_boxes():
+    """Detections built from boxes iterate back as the same boxes."""
+    boxes = [
+        Box(x1=10, y1=20, x2=30, y2=40, confidence=0.5, class_id=1),
+        Box(x1=0, y1=0, x2=5, y2=5, confidence=0.25, class_id=3),
+    ]
+    dets = Detections.from_boxes(boxes)
+
+    assert len(dets) == 2
+    assert list(dets) == boxes
+    assert dets[1] == boxes[1]
+    assert dets.to_dicts() == [b.to_dict() for b in boxes]
+
+
+def test_detections_slicing_and_concatenate():
+    """Slices and boolean masks return Detections; concatenation keeps order."""
+    dets = Detections(
+        np.array([[0, 0, 10, 10], [5, 5, 20, 20], [1, 2, 3, 4]], dtype=np.float32),
+        np.array([0.9, 0.1, 0.6]),
+        np.array([0, 1, 2]),
+    )
+
+    high = dets[dets.scores > 0.5]
+    assert isinstance(high, Detections)
+    assert high.class_ids.tolist() == [0, 2]
+
+    merged = Detections.concatenate([dets[:1], Detections.empty(), dets[2:]])
+    assert merged.class_ids.tolist() == [0, 2]
+    assert Detections.concatenate([]).to_dicts() == []
+
+
+def test_detections_to_dicts_truncates_coordinates():
+    """Coordinates are truncated to ints like the per-box conversion was."""
+    dets = Detections([[1.7, 2.2, 3.9, 4.5]], [0.5], [7])
+    assert dets.to_dicts() == [
+        {"x1": 1, "y1": 2, "x2": 3, "y2": 4, "confidence": 0.5, "class_id": 7}
+    ]
+
+
+def test_detections_track_ids_round_trip():
+    """Track IDs survive slicing and appear in dicts only when present."""
+    dets = Detections([[0, 0, 10, 10], [5, 5, 20, 20]], [0.9, 0.4], [0, 1], track_ids=[7, 8])
+    assert dets[1].track_id == 8
+    assert dets[dets.scores > 0.5].track_ids.tolist() == [7]
+    assert [d["track_id"] for d in dets.to_dicts()] == [7, 8]
+    assert Detections.from_boxes(dets).track_ids.tolist() == [7, 8]
+    assert "track_id" not in Detections([[0, 0, 1, 1]], [0.5], [0]).to_dicts()[0]
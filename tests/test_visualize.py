@@ -2,7 +2,7 @@
 import numpy as np
 import cv2
 
-from rvm.core.visualize import draw_boxes, draw_masks, draw_markers
+from rvm.core.visualize import annotate, draw_boxes, draw_masks, draw_markers, _get_color_for_id
 from rvm.core.types import Box, Mask, Marker
 
 
@@ -44,3 +44,63 @@ def test_draw_markers():
 
     assert out.shape == img.shape
     assert np.any(out != img)
+
+
+def test_annotate_single_buffer():
+    """annotate() renders everything onto one copy, or onto the input when inplace."""
+    img = np.zeros((100, 100, 3), dtype=np.uint8)
+    boxes = [Box(x1=60, y1=60, x2=90, y2=90, confidence=0.9, class_id=1)]
+    masks = [Mask(segmentation=[[10, 10], [40, 10], [40, 40], [10, 40]], confidence=0.8)]
+    markers = [Marker(id=3, corners=[(50, 5), (70, 5), (70, 25), (50, 25)])]
+
+    out = annotate(img, boxes=boxes, masks=masks, markers=markers)
+    assert not np.any(img)
+    # Mask fill is blended inside the polygon only
+    assert np.any(out[25, 25] != 0)
+    assert not np.any(out[50:55, 0:5])
+
+    same = annotate(img, boxes=boxes, inplace=True)
+    assert same is img and np.any(img)
+
+
+def test_palette_colors_are_stable():
+    assert _get_color_for_id(7) == _get_color_for_id(7 + 1024)
+    assert all(0 <= c <= 255 for c in _get_color_for_id(123))
+
+
+def test_detect_video_draws_boxes(tmp_path, monkeypatch):
+    """Video detection draws each frame's boxes into the output video (batched and pipelined)."""
+    from rvm import api
+    from rvm.core.types import Detections
+
+    class _Detector:
+        def detect_batch(self, frames, batch_size=1):
+            return [Detections(np.array([[4, 4, 28, 28]]), [0.9], [0]) for _ in frames]
+
+    monkeypatch.setattr(api, "_build_detector", lambda model, **options: _Detector())
+    video = str(tmp_path / "in.mp4")
+    writer = cv2.VideoWriter(video, cv2.VideoWriter_fourcc(*"mp4v"), 10, (32, 32))
+    for _ in range(5):
+        writer.write(np.zeros((32, 32, 3), np.uint8))
+    writer.release()
+
+    for pipelined in (False, True):
+        out_dir = tmp_path / f"out{int(pipelined)}"
+        results = api.detect(video, out_dir=str(out_dir), batch_size=2, pipelined=pipelined)
+        assert [r["frame"] for r in results] == [0, 1, 2, 3, 4]
+        cap = cv2.VideoCapture(str(out_dir / "detect_result.mp4"))
+        ok, frame = cap.read()
+        cap.release()
+        assert ok and frame.max() > 0
+
+
+def test_draw_masks_rle():
+    """RLE masks are blended inside their region only."""
+    from rvm.core.rle import encode
+
+    img = np.zeros((100, 100, 3), dtype=np.uint8)
+    bitmap = np.zeros((100, 100), dtype=np.uint8)
+    bitmap[20:40, 30:60] = 1
+    out = draw_masks(img, [Mask(segmentation=[], confidence=0.7, rle=encode(bitmap))])
+    assert np.any(out[30, 45] != 0)
+    assert not np.any(out[70:, 70:])
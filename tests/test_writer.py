@@ -0,0 +1,51 @@
+# tests/test_writer.py
+import gzip
+
+import pytest
+
+from rvm.io.writer import JsonlWriter, read_jsonl
+
+
+@pytest.mark.parametrize("name", ["frames.jsonl", "frames.jsonl.gz"])
+def test_jsonl_roundtrip(tmp_path, name):
+    """Records written by JsonlWriter read back in order, with or without gzip."""
+    path = tmp_path / name
+    records = [{"frame": i, "detections": [{"x1": i, "class_id": 0}]} for i in range(5)]
+    with JsonlWriter(path) as sink:
+        for record in records:
+            sink.write(record)
+
+    assert sink.records == 5
+    assert list(read_jsonl(path)) == records
+
+
+def test_jsonl_is_compact(tmp_path):
+    """One line per record, without indentation or spaces."""
+    path = tmp_path / "frames.jsonl"
+    with JsonlWriter(path) as sink:
+        sink.write({"frame": 0, "detections": []})
+
+    assert path.read_text() == '{"frame":0,"detections":[]}\n'
+
+
+def test_jsonl_flush_makes_records_visible(tmp_path):
+    """Records are on disk after a size-triggered flush, before close()."""
+    path = tmp_path / "frames.jsonl.gz"
+    sink = JsonlWriter(path, flush_bytes=1, flush_interval=3600)
+    sink.write({"frame": 0})
+    sink.write({"frame": 1})
+
+    # The gzip stream is not finished yet, but is readable up to the last sync flush.
+    assert [r["frame"] for r in read_jsonl(path)] == [0, 1]
+    sink.close()
+
+
+def test_read_jsonl_skips_truncated_tail(tmp_path):
+    """A partially written last line (e.g. after a crash) is ignored."""
+    path = tmp_path / "frames.jsonl"
+    path.write_text('{"frame":0}\n{"frame":1}\n{"fra')
+    assert list(read_jsonl(path)) == [{"frame": 0}, {"frame": 1}]
+
+    path.write_text('{"frame":0}\n{"fra\n{"frame":2}\n')
+    with pytest.raises(ValueError):
+        list(read_jsonl(path))
@@ -0,0 +1,86 @@
+# tests/test_yolo.py
+import threading
+import time
+
+import numpy as np
+import pytest
+import torch
+
+from rvm.detect.yolo import YOLODetector
+
+
+class _Result:
+    def __init__(self, frame):
+        # One box per frame whose confidence encodes the frame's fill value.
+        value = float(frame[0, 0, 0])
+        self.boxes = type("Boxes", (), {"data": torch.tensor([[0, 0, 1, 1, value / 100, 0]])})()
+        self.speed = {"preprocess": 1.0, "inference": 2.0, "postprocess": 1.0}
+
+
+class _Predictor:
+    """Stands in for an ultralytics YOLO model and records the batch sizes it sees."""
+
+    names = {0: "thing"}
+
+    def __init__(self):
+        self.calls = []
+
+    def __call__(self, frames, **kwargs):
+        self.calls.append(len(frames))
+        return [_Result(f) for f in frames]
+
+
+def _detector():
+    detector = YOLODetector.__new__(YOLODetector)
+    detector.backend, detector.device, detector.imgsz = "torch", None, 640
+    detector.conf, detector.iou = 0.25, 0.7
+    detector._lock, detector._local = threading.Lock(), threading.local()
+    detector.model = _Predictor()
+    return detector
+
+
+def _frames(n):
+    return [np.full((4, 4, 3), i, np.uint8) for i in range(n)]
+
+
+def test_detect_batch_chunks_frames():
+    """Frames go to the model batch_size at a time, the last chunk may be shorter."""
+    detector = _detector()
+    detections = detector.detect_batch(_frames(7), batch_size=3)
+    assert detector.model.calls == [3, 3, 1]
+    assert [round(float(d.scores[0]) * 100) for d in detections] == list(range(7))
+    assert detector.last_timings["inference"] == pytest.approx(7 * 0.002)
+
+
+def test_detect_batch_rejects_bad_size():
+    with pytest.raises(ValueError):
+        _detector().detect_batch(_frames(2), batch_size=0)
+
+
+def test_shared_detector_is_thread_safe():
+    """Concurrent callers of one detector never overlap in the model and keep their own timings."""
+    detector = _detector()
+    predictor = detector.model
+    active, overlaps = [0], []
+
+    def call(frames, **kwargs):
+        active[0] += 1
+        overlaps.append(active[0])
+        time.sleep(0.005)
+        active[0] -= 1
+        return _Predictor.__call__(predictor, frames)
+
+    detector.model = call
+    timings = {}
+
+    def run(n):
+        detector.detect_batch(_frames(n), batch_size=1)
+        timings[n] = detector.last_timings["inference"]
+
+    threads = [threading.Thread(target=run, args=(n,)) for n in (1, 2, 3, 4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert max(overlaps) == 1
+    assert timings == pytest.approx({n: n * 0.002 for n in (1, 2, 3, 4)})